@@ -1,9 +1,14 @@
 """
 Content Agent - Erstellt narrative LinkedIn-Posts mit Storytelling basierend auf Recherche
 """
-import random
+import datetime
+import hashlib
 from crewai import Agent
 from config import OPENAI_MODEL, MAX_POST_LENGTH, STORYTELLING_STRUCTURES
+from agents.story_templates import story_templates
+
+# Emojis aus einvoicehub-Highlights (in den Stories stehen eigene Aufzählungszeichen)
+HIGHLIGHT_EMOJIS = ("🚀", "📧", "📊", "🔗", "📱", "🛡️", "💰", "🔌", "📈", "👩‍💻")
 
 class ContentAgent:
     """Agent für die Erstellung von narrativen LinkedIn-Post-Inhalten mit Storytelling"""
@@ -27,7 +32,8 @@ class ContentAgent:
             llm=OPENAI_MODEL  # CrewAI 1.4+ accepts model string directly
         )
     
-    def create_storytelling_post(self, research_data: dict, image_data: dict = None, invory_data: dict = None) -> dict:
+    def create_storytelling_post(self, research_data: dict, image_data: dict = None, invory_data: dict = None,
+                                 structure: dict = None) -> dict:
         """
         Erstellt einen narrativen LinkedIn-Post mit Storytelling-Struktur
         
@@ -35,12 +41,13 @@ class ContentAgent:
             research_data: Daten vom Research Agent 
             image_data: Optional - Bilddaten vom Image Agent
             invory_data: Optional - Legacy-Parameter für Kompatibilität
+            structure: Optional - vorgegebene Storytelling-Struktur (z.B. für Best-of-K Entwürfe)
             
         Returns:
             dict: Post-Daten mit text, storytelling_structure, image_info
         """
         # Wähle Storytelling-Struktur basierend auf Zeit und Content
-        storytelling_structure = self._select_smart_storytelling_structure(research_data)
+        storytelling_structure = structure or self._select_smart_storytelling_structure(research_data)
         
         # Extrahiere Basisdaten
         topic = research_data.get('topic', 'XRechnung')
@@ -48,25 +55,13 @@ class ContentAgent:
         news_data = research_data.get('news_data', {})
         einvoicehub_highlights = research_data.get('einvoicehub_highlights', [])
         
-        # URLs für Links
-        invory_url = research_data.get('invory_url', 'https://invory.de')
-        einvoicehub_url = research_data.get('einvoicehub_url', 'https://einvoicehub.de')
-        
-        # Generiere Story basierend auf gewählter Struktur
-        story_content = self._generate_story_content(storytelling_structure, topic, countdown_data, news_data, einvoicehub_highlights)
-        
-        # Füge Links am Ende hinzu
-        story_content += f"\n\n� Entdecke mehr:"
-        story_content += f"\n• {invory_url} - Deine XRechnung-Lösung"
-        story_content += f"\n• {einvoicehub_url} - E-Invoicing Plattform"
-        
-        story_content += "\n\n#XRechnung #Storytelling #DigitaleTransformation #EInvoicing #ZukunftGestalten"
-        
-        # Stelle sicher, dass Post nicht zu lang ist
-        if len(story_content) > MAX_POST_LENGTH:
-            links_section = f"\n\n🔗 Entdecke mehr:\n• {invory_url}\n• {einvoicehub_url}\n\n#XRechnung #Storytelling #DigitaleTransformation #EInvoicing #ZukunftGestalten"
-            max_content_length = MAX_POST_LENGTH - len(links_section) - 50
-            story_content = story_content[:max_content_length] + "..." + links_section
+        # Storytelling-Vorlage zusammenstellen - optionale Segmente werden weggelassen, statt den Text abzuschneiden
+        values = self._story_values(research_data, topic, countdown_data, news_data, einvoicehub_highlights)
+        story = story_templates.render(storytelling_structure["name"], values, budget=MAX_POST_LENGTH,
+                                       variant=self._vision_variant(topic))
+        if story.omitted:
+            print(f"✂️ Für {MAX_POST_LENGTH} Zeichen gekürzt: {', '.join(story.omitted)}")
+        story_content = story.text
         
         return {
             "post_content": story_content,
@@ -76,248 +71,34 @@ class ContentAgent:
             "character_count": len(story_content)
         }
     
-    def _generate_story_content(self, storytelling_structure: dict, topic: str, countdown_data: dict, news_data: dict, einvoicehub_highlights: list) -> str:
-        """Generiert Story-Content basierend auf gewählter Storytelling-Struktur"""
-        
-        structure_name = storytelling_structure["name"]
-        
-        if structure_name == "Hero's Journey":
-            return self._create_heroes_journey_story(topic, countdown_data, einvoicehub_highlights)
-        elif structure_name == "Problem-Solution":
-            return self._create_problem_solution_story(topic, countdown_data, einvoicehub_highlights) 
-        elif structure_name == "Future Vision":
-            return self._create_future_vision_story(topic, countdown_data, news_data)
-        elif structure_name == "Behind the Scenes":
-            return self._create_behind_scenes_story(topic, einvoicehub_highlights)
-        else:
-            return self._create_default_story(topic, countdown_data)
+    @staticmethod
+    def _story_values(research_data: dict, topic: str, countdown_data: dict, news_data: dict,
+                      einvoicehub_highlights: list) -> dict:
+        """Feldwerte für die Storytelling-Vorlagen (leere Werte lassen optionale Segmente entfallen)"""
+        milestone = (countdown_data or {}).get('next_milestone') or {}
+        return {
+            "topic": topic,
+            "countdown": milestone.get('countdown_text'),
+            "milestone": milestone.get('description'),
+            "highlights": [ContentAgent._clean_highlight(highlight) for highlight in einvoicehub_highlights or []],
+            "headlines": (news_data or {}).get('headlines'),
+            # URLs für Links
+            "invory_url": research_data.get('invory_url', 'https://invory.de'),
+            "einvoicehub_url": research_data.get('einvoicehub_url', 'https://einvoicehub.de'),
+        }
     
-    def _create_heroes_journey_story(self, topic: str, countdown_data: dict, einvoicehub_highlights: list) -> str:
-        """Erstellt eine Hero's Journey Geschichte"""
-        
-        countdown_text = ""
-        if countdown_data and countdown_data.get('next_milestone'):
-            milestone = countdown_data['next_milestone']
-            countdown_text = f" {milestone['countdown_text']} bis zum großen Wendepunkt: {milestone['description']}"
-        
-        story = f"""🦸‍♀️ Die Geschichte von Sarah's XRechnung-Abenteuer
-
-Sarah, Geschäftsführerin eines mittelständischen Unternehmens, stand vor einer scheinbar unlösbaren Herausforderung: Hunderte von Rechnungen stapelten sich auf ihrem Schreibtisch.{countdown_text}
-
-💔 Der Kampf war real:
-• Nächtliche Überstunden beim manuellen Rechnungsabgleich
-• Ständige Angst vor Compliance-Fehlern  
-• Das Team war überlastet und frustriert
-
-✨ Dann entdeckte Sarah die Macht der XRechnung-Automatisierung..."""
-
-        # Füge einvoicehub Features als "magische Werkzeuge" hinzu
-        if einvoicehub_highlights:
-            story += f"\n\n🛡️ Ihre neuen Superkräfte:"
-            for highlight in einvoicehub_highlights[:2]:
-                clean_highlight = highlight.replace("🚀", "").replace("📧", "").replace("📊", "").replace("🔗", "").replace("📱", "").replace("🛡️", "").replace("💰", "").replace("🔌", "").replace("📈", "").replace("👩‍💻", "").strip()
-                story += f"\n• {clean_highlight}"
-        
-        story += f"""
-
-🏆 Heute, 6 Monate später:
-• Sarah verlässt pünktlich das Büro
-• Ihr Team fokussiert sich auf Wachstum statt auf Papierkram
-• 95% weniger Rechnungsfehler
-
-"Die beste Entscheidung, die ich je getroffen habe!" - Sarah
-
-➡️ Welche Herausforderung wartet darauf, von DIR gelöst zu werden?"""
-        
-        return story
+    @staticmethod
+    def _clean_highlight(highlight: str) -> str:
+        """Entfernt Emojis aus einem einvoicehub Feature"""
+        for emoji in HIGHLIGHT_EMOJIS:
+            highlight = highlight.replace(emoji, "")
+        return highlight.strip()
     
-    def _create_problem_solution_story(self, topic: str, countdown_data: dict, einvoicehub_highlights: list) -> str:
-        """Erstellt eine Problem-Solution Geschichte"""
-        
-        countdown_text = ""
-        if countdown_data and countdown_data.get('next_milestone'):
-            milestone = countdown_data['next_milestone']
-            countdown_text = f"\n\n⏰ Zeit drängt: {milestone['countdown_text']} bis {milestone['description']}"
-        
-        story = f"""😰 Kennst du das Gefühl?
-
-Es ist Freitagabend, 19:30 Uhr. Während andere bereits das Wochenende genießen, sitzt du noch im Büro. Vor dir: Ein Berg von Rechnungen, die bis Montag verarbeitet werden müssen.
-
-🤯 Das Problem:
-• Manuelle Dateneingabe bis spät in die Nacht
-• Ständige Sorge um Compliance-Fehler
-• Dein Team ist gestresst und überlastet{countdown_text}
-
-💡 Die Wendung:
-Was wäre, wenn ich dir sage, dass XRechnung-Automatisierung das alles ändern kann?"""
-
-        if einvoicehub_highlights:
-            story += f"\n\n🎯 Die Lösung in Aktion:"
-            for highlight in einvoicehub_highlights[:2]:
-                clean_highlight = highlight.replace("🚀", "").replace("📧", "").replace("📊", "").replace("🔗", "").replace("📱", "").replace("🛡️", "").replace("💰", "").replace("🔌", "").replace("📈", "").replace("👩‍💻", "").strip()
-                story += f"\n• {clean_highlight}"
-
-        story += f"""
-
-🚀 Stell dir vor:
-• Automatische Rechnungsverarbeitung in Sekunden
-• Deine Freitage gehören wieder DIR
-• Dein Team kann sich auf Wachstum konzentrieren
-
-➡️ Bist du bereit für die Transformation? Erzähl mir von deinen Rechnungs-Herausforderungen!"""
-        
-        return story
-    
-    def _create_future_vision_story(self, topic: str, countdown_data: dict, news_data: dict) -> str:
-        """Erstellt eine Future Vision Geschichte mit rotierenden Templates"""
-        import random
-        import datetime
-        import hashlib
-        
-        # Datum-basierte Template-Auswahl für konsistente aber variierende Vision
+    @staticmethod
+    def _vision_variant(topic: str) -> int:
+        """Datum-basierte Auswahl der Future-Vision-Variante (konsistent pro Tag und Thema)"""
         today = datetime.date.today()
-        date_hash = int(hashlib.md5(f"{topic}{today}".encode()).hexdigest(), 16)
-        
-        # 5 verschiedene Future Vision Templates
-        vision_templates = [
-            # Template 1: Industrie-Transformation  
-            f"""🚀 2030: Die große XRechnung-Revolution ist da!
-
-*Flashforward aktiviert* 💫
-
-Ein Unternehmerverband berichtet: "99% aller deutschen Unternehmen nutzen jetzt vollautomatische XRechnung-Verarbeitung. Manuelle Rechnungsbearbeitung ist Geschichte."
-
-🌟 Was heute noch Zukunft scheint:
-• Millisekunden-Rechnungsverarbeitung
-• Zero-Error-Compliance durch KI
-• Grenzenloses digitales Geschäft""",
-
-            # Template 2: Persönliche CEO-Vision
-            f"""🔮 Blick ins Jahr 2030...
-
-*Vision aktiviert* ✨
-
-CEO Sarah K. schaut auf ihre Statistik: "Letztes Jahr: 15.000 Rechnungen, 0 manuelle Eingriffe, 100% Compliance-Rate. XRechnung hat unser Geschäft revolutioniert."
-
-🌟 Die neue Realität:
-• Vollständige Automatisierung ist Standard
-• Unternehmen fokussieren auf Innovation statt Verwaltung  
-• EU-weite nahtlose Geschäftsprozesse""",
-
-            # Template 3: Markt-Transformation
-            f"""⚡ 2030: Der deutsche Mittelstand ist digital!
-
-*Zukunftsscan aktiviert* 📊
-
-Aktuelle Zahlen zeigen: Über 4 Millionen deutsche Unternehmen verarbeiten täglich 50+ Millionen XRechnungen vollautomatisch. Der Produktivitätssprung ist messbar.
-
-🌟 Diese Zukunft ist real:
-• 95% Kostenreduktion in der Rechnungsbearbeitung
-• Fehlerquote unter 0,1%
-• Neue Geschäftsmodelle durch Effizienz""",
-
-            # Template 4: Technologie-Vision  
-            f"""🔬 2030: XRechnung 5.0 ist Realität!
-
-*Innovation aktiviert* 🧬
-
-Die nächste Generation ist da: KI-gesteuerte XRechnungen passen sich automatisch an Geschäftsregeln an. Blockchain sichert jeden Transaktion. Quantenverschlüsselung schützt sensible Daten.
-
-🌟 Technologie der Zukunft:
-• Adaptive KI optimiert jeden Prozess
-• Real-Time-Compliance in 27 EU-Ländern
-• Quantum-sichere Rechnungsverarbeitung""",
-
-            # Template 5: Gesellschafts-Impact
-            f"""🌍 2030: XRechnung rettet den Planeten!
-
-*Impact aktiviert* 🌱
-
-Studie zeigt: Durch vollständige XRechnung-Digitalisierung werden jährlich 2,3 Millionen Tonnen Papier gespart. 180.000 Arbeitsstunden pro Tag für Innovationen freigesetzt.
-
-🌟 Der große Wandel:
-• Papierlose Wirtschaft ist Realität
-• Millionen Stunden für Kreativität gewonnen  
-• Nachhaltigkeit durch Effizienz"""
-        ]
-        
-        # Wähle Template basierend auf Datum
-        selected_template = vision_templates[date_hash % len(vision_templates)]
-        story = selected_template
-
-        # Füge aktuellen Countdown hinzu
-        if countdown_data and countdown_data.get('next_milestone'):
-            milestone = countdown_data['next_milestone']
-            story += f"\n\n⏰ Die Zukunft beginnt JETZT: {milestone['countdown_text']} bis {milestone['description']}"
-
-        # Füge News hinzu falls verfügbar
-        if news_data and news_data.get('headlines'):
-            story += f"\n\n📰 Aktuelle Signale der Transformation:"
-            for headline in news_data['headlines'][:2]:
-                story += f"\n• {headline}"
-
-        story += f"""
-
-🚀 Aber hier ist das Verrückte:
-Diese "Zukunft" existiert bereits HEUTE! Unternehmen nutzen schon jetzt XRechnung-Automatisierung und leben bereits in 2030.
-
-💭 Die Frage ist nicht OB, sondern WANN du den Sprung machst.
-
-➡️ In welchem Jahr willst DU ankommen? 2024 oder 2030?"""
-        
-        return story
-    
-    def _create_behind_scenes_story(self, topic: str, einvoicehub_highlights: list) -> str:
-        """Erstellt eine Behind the Scenes Geschichte"""
-        
-        story = f"""🎬 Behind the Scenes: Wie XRechnung-Magie entsteht
-
-*Blick hinter die Kulissen bei Invory* 
-
-7:30 Uhr morgens. Während die meisten noch schlafen, ist unser Entwicklerteam bereits hochkonzentriert dabei, die Zukunft der Rechnungsverarbeitung zu programmieren.
-
-👩‍💻 Was ihr nicht seht:
-• 47 Kaffeetassen und unzählige "Aha!"-Momente
-• Stundenlange Diskussionen über die perfekte User Experience  
-• Nächtliche Coding-Sessions für eure Compliance-Sicherheit"""
-
-        if einvoicehub_highlights:
-            story += f"\n\n💡 Unsere neuesten Durchbrüche:"
-            for highlight in einvoicehub_highlights[:2]:
-                clean_highlight = highlight.replace("🚀", "").replace("📧", "").replace("📊", "").replace("🔗", "").replace("📱", "").replace("🛡️", "").replace("💰", "").replace("🔌", "").replace("📈", "").replace("👩‍💻", "").strip()
-                story += f"\n• {clean_highlight}"
-
-        story += f"""
-
-🔥 Das Coolste dabei:
-Jeder Bug, den wir fixen, jedes Feature, das wir bauen - es macht das Leben von echten Menschen leichter. Gestern haben wir eine Nachricht von einem Kunden bekommen: "Dank euch kann ich wieder pünktlich nach Hause!"
-
-💝 DAS ist unser Antrieb.
-
-➡️ Welche Technologie-Geschichte würdest DU gerne mitschreiben?"""
-        
-        return story
-    
-    def _create_default_story(self, topic: str, countdown_data: dict) -> str:
-        """Fallback für Standard-Stories"""
-        
-        countdown_text = ""
-        if countdown_data and countdown_data.get('next_milestone'):
-            milestone = countdown_data['next_milestone']
-            countdown_text = f"\n\n⏰ {milestone['countdown_text']} bis {milestone['description']}"
-        
-        return f"""💼 {topic}: Eine Reise in die digitale Zukunft
-
-Stell dir vor, du könntest mit einem Fingerschnips alle deine Rechnungsprobleme lösen...
-
-🔄 Die Transformation beginnt mit einem ersten Schritt:
-• Von manuell zu automatisiert
-• Von kompliziert zu elegant  
-• Von stressig zu entspannt{countdown_text}
-
-✨ Die Magie liegt in der Einfachheit der XRechnung.
-
-➡️ Bist du bereit für den nächsten Schritt?"""
+        return int(hashlib.md5(f"{topic}{today}".encode()).hexdigest(), 16)
     
     def create_post(self, research_data: dict, invory_data: dict = None) -> str:
         """Legacy-Methode für Rückwärtskompatibilität - nutzt neues Storytelling"""
@@ -334,9 +115,6 @@ Stell dir vor, du könntest mit einem Fingerschnips alle deine Rechnungsprobleme
         Returns:
             dict: Gewählte Storytelling-Struktur
         """
-        import datetime
-        import hashlib
-        
         # Erstelle Seed basierend auf Datum für konsistente aber variierende Auswahl
         today = datetime.date.today()
         date_seed = int(hashlib.md5(str(today).encode()).hexdigest(), 16) % 10000
@@ -366,6 +144,33 @@ Stell dir vor, du könntest mit einem Fingerschnips alle deine Rechnungsprobleme
         
         return selected_structure
     
+    def select_candidate_structures(self, research_data: dict, count: int, recent_structures: list = None) -> list:
+        """
+        Wählt Storytelling-Strukturen für parallele Entwürfe
+        
+        Args:
+            research_data: Recherche-Daten für Context
+            count: Anzahl gewünschter Entwürfe
+            recent_structures: Optional - zuletzt genutzte Strukturnamen (neueste zuerst) aus der Post-Historie
+            
+        Returns:
+            list: Die automatisch gewählte Struktur zuerst, danach die übrigen in Konfigurations-Reihenfolge;
+                  ohne neue Quellen zuerst die am längsten nicht genutzten Strukturen
+        """
+        selected = self._select_smart_storytelling_structure(research_data)
+        others = [s for s in STORYTELLING_STRUCTURES if s["name"] != selected["name"]]
+        candidates = [selected] + others
+        
+        if research_data.get("no_new_source_material") and recent_structures:
+            # Gleiches Quellenmaterial wie zuletzt: Abwechslung über die Erzählstruktur statt Wiederholung
+            last_used = {}
+            for position, name in enumerate(recent_structures):
+                last_used.setdefault(name, position)
+            candidates.sort(key=lambda s: last_used.get(s["name"], len(recent_structures)), reverse=True)
+            print(f"♻️ Keine neuen Quellen - bevorzuge selten genutzte Struktur: {candidates[0]['name']}")
+        
+        return candidates[:max(1, count)]
+    
     def optimize_post(self, post: str) -> str:
         """
         Optimiert einen Post für bessere Engagement-Raten
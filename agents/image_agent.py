@@ -7,18 +7,35 @@ import os
 import random
 import requests
 from typing import Dict, Optional
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from crewai import Agent
+from pipeline import span
 from config import (
     OPENAI_API_KEY, OPENAI_MODEL, DALLE_MODEL, DALLE_QUALITY, DALLE_SIZE,
     IMAGE_STYLE_PROMPTS, XRECHNUNG_IMAGE_THEMES, STORYTELLING_STRUCTURES
 )
+from services.keyword_matcher import KeywordMatcher
+from services.model_cache import ModelResponseCache, model_cache
+
+# Bildthema nach Keywords im Post - bei mehreren Treffern gewinnt das erste Thema
+IMAGE_THEME_MATCHER = KeywordMatcher(groups={
+    "Countdown: Kalender oder Timer zeigt nahende Deadlines": ["countdown", "deadline", "zeit"],
+    "Automatisierung: Roboter und Menschen arbeiten harmonisch zusammen": ["automatisierung", "roboter"],
+    "digitale Transformation: Papierrechnungen werden zu digitalen Dokumenten": ["transformation", "digital"],
+    "Problemlösung: Komplexe Prozesse werden vereinfacht dargestellt": ["erfolg", "lösung"],
+    "Zukunftsvision: moderne digitale Bürolandschaft": ["zukunft", "vision"],
+})
 
 
 class ImageAgent:
     """Agent für die Generierung von ansprechenden Bildern zu XRechnung-Posts"""
     
-    def __init__(self):
+    def __init__(self, response_cache: Optional[ModelResponseCache] = None):
+        """
+        Args:
+            response_cache: Optional - Cache für DALL-E-Antworten (Standard: model_cache,
+                ModelResponseCache(enabled=False) schaltet ihn für diesen Agent ab)
+        """
         # Verwende eigene Klasse statt CrewAI Agent für OpenAI Client Support
         self.role = "Visual Storytelling Specialist"
         self.goal = "Erstelle ansprechende, comic-artige Bilder die XRechnung-Themen visuell und humorvoll vermitteln"
@@ -31,13 +48,15 @@ class ImageAgent:
         
         # OpenAI Client für DALL-E 3
         self.openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+        self.response_cache = response_cache or model_cache
         
-    def generate_image_for_post(self, content_data: Dict) -> Optional[Dict]:
+    def generate_image_for_post(self, content_data: Dict, use_cache: bool = True) -> Optional[Dict]:
         """
         Generiert ein passendes Bild basierend auf dem Post-Content
         
         Args:
             content_data: Dict mit post_content, topic, storytelling_structure, etc.
+            use_cache: False = DALL-E immer neu aufrufen (echte Posts), sonst gleiche Prompts aus dem Cache
         
         Returns:
             Dict mit image_url, prompt, theme oder None bei Fehler
@@ -57,49 +76,93 @@ class ImageAgent:
             print(f"📝 Theme: {image_theme}")
             
             # DALL-E 3 API Call
-            response = self.openai_client.images.generate(
-                model=DALLE_MODEL,
-                prompt=dalle_prompt,
-                size=DALLE_SIZE,
-                quality=DALLE_QUALITY,
-                n=1
-            )
+            def generate() -> str:
+                with span("image.dalle"):
+                    response = self.openai_client.images.generate(
+                        model=DALLE_MODEL,
+                        prompt=dalle_prompt,
+                        size=DALLE_SIZE,
+                        quality=DALLE_QUALITY,
+                        n=1
+                    )
+                return response.data[0].url
             
-            image_url = response.data[0].url
+            image_url = self.response_cache.call(DALLE_MODEL, dalle_prompt, generate, params=self._dalle_params(),
+                                                 use_cache=use_cache)
+            return self._build_image_data(image_url, dalle_prompt, image_theme)
             
-            print(f"✅ Bild generiert: {image_url[:50]}...")
+        except Exception as e:
+            print(f"❌ Fehler bei Bildgenerierung: {str(e)}")
+            return self._get_mock_image_data(content_data)
+    
+    async def agenerate_image_for_post(self, content_data: Dict, use_cache: bool = True) -> Optional[Dict]:
+        """
+        Async-Variante von generate_image_for_post (blockiert keinen Thread während DALL-E rechnet)
+        
+        Args:
+            content_data: Dict mit post_content, topic, storytelling_structure, etc.
+            use_cache: False = DALL-E immer neu aufrufen (echte Posts), sonst gleiche Prompts aus dem Cache
+        
+        Returns:
+            Dict mit image_url, prompt, theme oder Mock-Daten bei Fehler
+        """
+        try:
+            if not OPENAI_API_KEY:
+                print("⚠️  OpenAI API Key fehlt - nutze Mock-Bild")
+                return self._get_mock_image_data(content_data)
+            
+            image_theme = self._select_image_theme(content_data)
+            dalle_prompt = self._create_dalle_prompt(image_theme, content_data)
+            
+            print(f"🎨 Generiere Bild mit DALL-E 3 (async)...")
+            print(f"📝 Theme: {image_theme}")
+            
+            # Async Client pro Aufruf - die HTTP-Verbindungen gehören zum aktuellen Event Loop
+            async def agenerate() -> str:
+                async with AsyncOpenAI(api_key=OPENAI_API_KEY) as client:
+                    with span("image.dalle"):
+                        response = await client.images.generate(
+                            model=DALLE_MODEL,
+                            prompt=dalle_prompt,
+                            size=DALLE_SIZE,
+                            quality=DALLE_QUALITY,
+                            n=1
+                        )
+                return response.data[0].url
             
-            return {
-                "image_url": image_url,
-                "prompt": dalle_prompt,
-                "theme": image_theme,
-                "style": "DALL-E 3 Generated"
-            }
+            image_url = await self.response_cache.acall(DALLE_MODEL, dalle_prompt, agenerate,
+                                                        params=self._dalle_params(), use_cache=use_cache)
+            return self._build_image_data(image_url, dalle_prompt, image_theme)
             
         except Exception as e:
             print(f"❌ Fehler bei Bildgenerierung: {str(e)}")
             return self._get_mock_image_data(content_data)
     
+    @staticmethod
+    def _dalle_params() -> Dict:
+        """Parameter, die neben Modell und Prompt das Bild bestimmen (Teil des Cache-Schlüssels)"""
+        return {"size": DALLE_SIZE, "quality": DALLE_QUALITY, "n": 1}
+    
+    def _build_image_data(self, image_url: str, dalle_prompt: str, image_theme: str) -> Dict:
+        """Erstellt das Ergebnis-Dict für ein generiertes Bild"""
+        print(f"✅ Bild generiert: {image_url[:50]}...")
+        
+        return {
+            "image_url": image_url,
+            "prompt": dalle_prompt,
+            "theme": image_theme,
+            "style": "DALL-E 3 Generated"
+        }
+    
     def _select_image_theme(self, content_data: Dict) -> str:
         """Wählt passendes Bildthema basierend auf Content aus"""
         
-        post_content = content_data.get("post_content", "").lower()
-        topic = content_data.get("topic", "").lower() 
-        
-        # Thema basierend auf Keywords im Content
-        if "countdown" in post_content or "deadline" in post_content or "zeit" in post_content:
-            return "Countdown: Kalender oder Timer zeigt nahende Deadlines"
-        elif "automatisierung" in post_content or "roboter" in post_content:
-            return "Automatisierung: Roboter und Menschen arbeiten harmonisch zusammen"
-        elif "transformation" in post_content or "digital" in post_content:
-            return "digitale Transformation: Papierrechnungen werden zu digitalen Dokumenten"
-        elif "erfolg" in post_content or "lösung" in post_content:
-            return "Problemlösung: Komplexe Prozesse werden vereinfacht dargestellt"
-        elif "zukunft" in post_content or "vision" in post_content:
-            return "Zukunftsvision: moderne digitale Bürolandschaft"
-        else:
-            # Zufälliges Thema falls kein Match
-            return random.choice(XRECHNUNG_IMAGE_THEMES)
+        # Thema basierend auf Keywords im Content (ein Suchlauf für alle Themen)
+        themes = IMAGE_THEME_MATCHER.matched_groups(content_data.get("post_content", ""))
+        if themes:
+            return themes[0]
+        # Zufälliges Thema falls kein Match
+        return random.choice(XRECHNUNG_IMAGE_THEMES)
     
     def _create_dalle_prompt(self, image_theme: str, content_data: Dict) -> str:
         """Erstellt optimierten DALL-E 3 Prompt"""
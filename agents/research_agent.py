@@ -2,16 +2,47 @@
 Research Agent - Sammelt Informationen zu XRechnung, invory.de und einvoicehub.de
 """
 from crewai import Agent
-from config import get_research_model, XRECHNUNG_TOPICS, EINVOICEHUB_FEATURES, EINVOICEHUB_HIGHLIGHTS, XRECHNUNG_MILESTONES, XRECHNUNG_NEWS_SOURCES, XRECHNUNG_KEYWORDS
-from services.invory_client import InvoryClient
-from services.einvoicehub_client import EinvoiceHubClient
+from config import (
+    get_research_model, XRECHNUNG_TOPICS, EINVOICEHUB_FEATURES, EINVOICEHUB_HIGHLIGHTS, XRECHNUNG_MILESTONES,
+    XRECHNUNG_NEWS_SOURCES, XRECHNUNG_KEYWORDS, RESEARCH_CONCURRENT, RESEARCH_TIME_BUDGET, NEWS_ITEMS_PER_RUN,
+    RESEARCH_CACHE_ENABLED
+)
+from services.site_scraper import create_scrapers
+from services.keyword_matcher import KeywordMatcher
+from services.news_ingestion import news_store
+from services.http_session import get_async_session
+from source_fingerprints import fingerprint_sources, source_fingerprints
+from research_cache import research_cache, research_cache_key
+from pipeline import span, submit_with_context
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import aiohttp
+import asyncio
 import logging
+import random
+import threading
 import requests
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
 
+# Mapping von Themen-Keywords zu relevanten einvoicehub Feature-Kategorien
+TOPIC_FEATURE_CATEGORIES = {
+    "automatisierung": ["automatisierung", "validierung", "dashboard"],
+    "validation": ["validierung", "reports", "sicherheit"], 
+    "compliance": ["sicherheit", "reports", "validierung"],
+    "api": ["automatisierung", "entwickler", "sicherheit"],
+    "dashboard": ["dashboard", "reports", "nutzung"],
+    "batch": ["validierung", "reports", "rechnungseingang"],
+    "upload": ["rechnungseingang", "validierung", "automatisierung"],
+    "webhook": ["automatisierung", "entwickler", "sicherheit"],
+    "peppol": ["automatisierung", "sicherheit", "entwickler"],
+    "billing": ["abrechnung", "nutzung", "dashboard"],
+    "security": ["sicherheit", "entwickler", "abrechnung"]
+}
+TOPIC_MATCHER = KeywordMatcher(TOPIC_FEATURE_CATEGORIES)
+
 class ResearchAgent:
     """Agent für Recherche zu XRechnung-Themen"""
     
@@ -34,47 +65,283 @@ class ResearchAgent:
             llm=selected_model  # Rotierendes Modell (OpenAI oder Anthropic)
         )
         
-        # Initialize Web-Clients
-        self.invory_client = InvoryClient()
-        self.einvoicehub_client = EinvoiceHubClient()
+        # Web-Clients je Scraper-Profil (SCRAPER_SITES) - jede Website ist eine eigene Recherche-Quelle
+        self.scrapers = create_scrapers()
+    
+    def _research_sources(self) -> Dict[str, Tuple[Callable[[], dict], Callable[[], dict]]]:
+        """Registriert alle Recherche-Quellen als (Abruf, Fallback)-Paare (Websites als <profil>_data)"""
+        sources = {
+            "news_data": (self.research_xrechnung_news, self._get_empty_news_data),
+            "countdown_data": (self.calculate_xrechnung_countdown, self._get_empty_countdown_data)
+        }
+        for name, scraper in self.scrapers.items():
+            sources[f"{name}_data"] = (scraper.get_xrechnung_insights, scraper.get_mock_data)
+        return sources
+    
+    def gather_sources(self, time_budget: float = None) -> Dict[str, dict]:
+        """
+        Ruft alle Recherche-Quellen ab - parallel unter einem gemeinsamen Zeitbudget
+        
+        Quellen, die nach Ablauf des Budgets noch laufen, werden durch ihre
+        Fallback-Daten (z.B. get_mock_data der Web-Clients) ersetzt. Die Laufzeit
+        entspricht damit der langsamsten Quelle statt der Summe aller Quellen.
+        
+        Args:
+            time_budget: Optional - Gesamtbudget in Sekunden (Standard: RESEARCH_TIME_BUDGET)
+            
+        Returns:
+            dict: news_data, countdown_data und <profil>_data je Website (z.B. invory_data)
+        """
+        sources = self._research_sources()
+        
+        if not RESEARCH_CONCURRENT:
+            logger.info("Recherchiere Quellen sequentiell...")
+            return {name: self._timed_fetch(name, fetch) for name, (fetch, _) in sources.items()}
+        
+        budget = RESEARCH_TIME_BUDGET if time_budget is None else time_budget
+        logger.info(f"Recherchiere {len(sources)} Quellen parallel (Budget: {budget:.1f}s)...")
+        
+        executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="research")
+        futures = {name: submit_with_context(executor, self._timed_fetch, name, fetch)
+                   for name, (fetch, _) in sources.items()}
+        done, _ = wait(futures.values(), timeout=budget)
+        # Nicht auf hängende Quellen warten - deren Threads laufen im Hintergrund aus
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        return self._collect_source_results(futures, done, budget)
+    
+    async def agather_sources(self, time_budget: float = None) -> Dict[str, dict]:
+        """
+        Async-Variante von gather_sources - Web-Quellen laufen als Tasks im Event Loop
+        
+        Args:
+            time_budget: Optional - Gesamtbudget in Sekunden (Standard: RESEARCH_TIME_BUDGET)
+            
+        Returns:
+            dict: news_data, countdown_data und <profil>_data je Website (z.B. invory_data)
+        """
+        budget = RESEARCH_TIME_BUDGET if time_budget is None else time_budget
+        
+        # Geteilte Session des Event Loops - Verbindungen bleiben über Läufe hinweg offen
+        sources = self._async_research_sources(get_async_session())
+        
+        if not RESEARCH_CONCURRENT:
+            logger.info("Recherchiere Quellen sequentiell...")
+            return {name: await self._atimed_fetch(name, afetch) for name, afetch in sources.items()}
+        
+        logger.info(f"Recherchiere {len(sources)} Quellen parallel (Budget: {budget:.1f}s)...")
+        tasks = {name: asyncio.create_task(self._atimed_fetch(name, afetch)) for name, afetch in sources.items()}
+        done, pending = await asyncio.wait(tasks.values(), timeout=budget)
+        for task in pending:
+            task.cancel()
+        
+        return self._collect_source_results(tasks, done, budget)
+    
+    def _async_research_sources(self, session: aiohttp.ClientSession) -> Dict[str, Callable[[], Awaitable[dict]]]:
+        """Async-Abrufe der Recherche-Quellen; News (SQLite-Store) und Countdown sind lokal und laufen in Threads"""
+        async def local(fetch: Callable[[], dict]) -> dict:
+            return await asyncio.to_thread(fetch)
+        
+        sources = {
+            "news_data": lambda: local(self.research_xrechnung_news),
+            "countdown_data": lambda: local(self.calculate_xrechnung_countdown)
+        }
+        for name, scraper in self.scrapers.items():
+            # Default-Argument bindet den Scraper der jeweiligen Iteration
+            sources[f"{name}_data"] = lambda scraper=scraper: scraper.aget_xrechnung_insights(session)
+        return sources
+    
+    def _collect_source_results(self, futures: Dict, done: set, budget: float) -> Dict[str, dict]:
+        """
+        Übernimmt fertige Quellen und ersetzt verspätete oder fehlerhafte durch Fallback-Daten
+        (markiert mit "fallback": True)
+        
+        Args:
+            futures: Quellname → Future/Task (concurrent.futures oder asyncio)
+            done: Innerhalb des Budgets abgeschlossene Futures
+            budget: Zeitbudget in Sekunden (für Logging)
+        """
+        fallbacks = {name: fallback for name, (_, fallback) in self._research_sources().items()}
+        
+        results = {}
+        for name, future in futures.items():
+            if future not in done:
+                logger.warning(f"⏱️ Quelle '{name}' hat das Zeitbudget von {budget:.1f}s überschritten - nutze Fallback-Daten")
+                results[name] = {**fallbacks[name](), "fallback": True}
+                continue
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.error(f"Fehler bei Quelle '{name}': {str(e)} - nutze Fallback-Daten")
+                results[name] = {**fallbacks[name](), "fallback": True}
+        
+        return results
+    
+    def fallback_sources(self) -> Dict[str, dict]:
+        """Fallback-Daten aller Quellen ohne Netzwerkzugriff (z.B. wenn die Recherche-Stufe ihr Budget überschreitet)"""
+        return {name: {**fallback(), "fallback": True} for name, (_, fallback) in self._research_sources().items()}
+    
+    def _timed_fetch(self, name: str, fetch: Callable[[], dict]) -> dict:
+        """Ruft eine Quelle ab und misst die Dauer als Zeitspanne research.<name>"""
+        with span(f"research.{name}"):
+            return fetch()
+    
+    async def _atimed_fetch(self, name: str, afetch: Callable[[], Awaitable[dict]]) -> dict:
+        """Async-Variante von _timed_fetch"""
+        with span(f"research.{name}"):
+            return await afetch()
     
-    def research_xrechnung_topic(self, topic: str = None) -> dict:
+    async def aresearch_xrechnung_topic(self, topic: str = None, sources: Dict[str, dict] = None) -> dict:
+        """
+        Async-Variante von research_xrechnung_topic (Quellen via agather_sources)
+        
+        News-Store (SQLite), Seiten-Versionen, Recherche-Cache und Fingerprints lesen/schreiben
+        Dateien - das läuft in Threads, damit parallele Läufe im Event-Loop nicht blockieren.
+        
+        Args:
+            topic: Optional - spezifisches Thema, sonst zufälliges Thema
+            sources: Optional - bereits abgerufene Quellen
+            
+        Returns:
+            dict: Recherche-Ergebnisse
+        """
+        if sources is not None:
+            return await asyncio.to_thread(self.research_xrechnung_topic, topic, sources=sources)
+        
+        topic = topic or random.choice(XRECHNUNG_TOPICS)
+        cache_key = await asyncio.to_thread(self._research_cache_key, topic)
+        cached = await asyncio.to_thread(self._cached_research, topic, cache_key)
+        if cached is not None:
+            return cached
+        sources = await self.agather_sources()
+        return await asyncio.to_thread(self._research_and_cache, topic, sources, cache_key)
+    
+    def research_xrechnung_topic(self, topic: str = None, sources: Dict[str, dict] = None) -> dict:
         """
         Recherchiert zu einem spezifischen XRechnung-Thema
         Untersucht invory.de und einvoicehub.de für relevante Informationen
         
+        Ohne übergebene Quellen läuft die Recherche über den Recherche-Cache
+        (Thema + Quellen-Version, siehe research_cache.py).
+        
         Args:
             topic: Optional - spezifisches Thema, sonst zufälliges Thema
+            sources: Optional - bereits abgerufene Quellen (siehe gather_sources)
             
         Returns:
             dict: Recherche-Ergebnisse mit Informationen von beiden Websites
         """
         if not topic:
-            import random
             topic = random.choice(XRECHNUNG_TOPICS)
+        if sources is not None:
+            return self._assemble_research(topic, sources)
+        
+        cache_key = self._research_cache_key(topic)
+        cached = self._cached_research(topic, cache_key)
+        if cached is not None:
+            return cached
+        return self._research_and_cache(topic, self.gather_sources(), cache_key)
+    
+    def _research_cache_key(self, topic: str) -> Optional[str]:
+        """Schlüssel im Recherche-Cache - Versionen der Quellen ohne Netzwerkzugriff (None = Cache deaktiviert)"""
+        if not RESEARCH_CACHE_ENABLED:
+            return None
+        try:
+            news = [item.get("link") or item.get("title") for item in news_store.latest(limit=NEWS_ITEMS_PER_RUN)]
+        except Exception as e:
+            logger.error(f"Fehler beim Lesen des News-Stores: {str(e)}")
+            news = []
+        return research_cache_key(topic, {
+            # Versionen der zuletzt abgerufenen Seiten - nach einer Änderung an invory.de/einvoicehub.de
+            # (neu geladen durch Prefetch, Hintergrund-Aktualisierung oder andere Läufe) passt der Schlüssel nicht mehr
+            "sites": {name: scraper.content_versions() for name, scraper in self.scrapers.items()},
+            "news": news,
+            # Countdown (und damit die Key Points) ändert sich täglich
+            "day": datetime.now().date().isoformat()
+        })
+    
+    def _cached_research(self, topic: str, cache_key: Optional[str]) -> Optional[dict]:
+        """Ergebnis aus dem Recherche-Cache - abgelaufene Einträge werden geliefert und im Hintergrund aktualisiert"""
+        if cache_key is None:
+            return None
+        cached = research_cache.lookup(cache_key)
+        if cached is None:
+            return None
+        if cached.fresh:
+            logger.info(f"📦 Recherche-Cache-Treffer für '{topic}' ({cached.age / 60:.0f} min alt)")
+        else:
+            logger.info(f"📦 Recherche-Cache für '{topic}' abgelaufen ({cached.age / 60:.0f} min alt) - "
+                        f"liefere Eintrag, aktualisiere im Hintergrund")
+            self._refresh_in_background(topic, cache_key)
+        return cached.result
+    
+    def _research_and_cache(self, topic: str, sources: Dict[str, dict], cache_key: Optional[str]) -> dict:
+        """Stellt die Recherche aus den Quellen zusammen und legt sie im Recherche-Cache ab"""
+        research_result = self._assemble_research(topic, sources)
+        # Fallback-Daten (Zeitbudget überschritten, Fehler) nicht cachen - sonst blieben sie für die ganze TTL
+        if cache_key is not None and not any(isinstance(data, dict) and data.get("fallback")
+                                             for data in sources.values()):
+            research_cache.store(cache_key, research_result)
+        return research_result
+    
+    def _refresh_in_background(self, topic: str, cache_key: str):
+        """Recherchiert ein abgelaufenes Thema in einem Hintergrund-Thread neu (höchstens eine Aktualisierung pro Schlüssel)"""
+        if not research_cache.begin_refresh(cache_key):
+            return
+        
+        def refresh():
+            try:
+                self._research_and_cache(topic, self.gather_sources(), cache_key)
+                logger.info(f"📦 Recherche-Cache für '{topic}' aktualisiert")
+            except Exception as e:
+                logger.error(f"Fehler bei der Hintergrund-Aktualisierung für '{topic}': {str(e)}")
+            finally:
+                research_cache.end_refresh(cache_key)
         
+        threading.Thread(target=refresh, name="research-refresh", daemon=True).start()
+    
+    def _assemble_research(self, topic: str, sources: Dict[str, dict]) -> dict:
+        """
+        Stellt die Recherche-Ergebnisse aus den abgerufenen Quellen zusammen
+        
+        Args:
+            topic: Recherche-Thema
+            sources: Abgerufene Quellen (siehe gather_sources)
+            
+        Returns:
+            dict: Recherche-Ergebnisse mit Informationen von beiden Websites
+        """
         logger.info(f"Recherchiere zu Thema: {topic}")
         
-        # Priorität: Allgemeine XRechnung-Recherche vor spezifischen Lösungen
-        logger.info("Recherchiere allgemeine XRechnung-Trends...")
-        news_data = self.research_xrechnung_news()
-        countdown_data = self.calculate_xrechnung_countdown()
+        # Priorität: Allgemeine XRechnung-Recherche vor spezifischen Lösungen,
+        # Lösungsbeispiele von invory.de/einvoicehub.de werden parallel gesammelt
+        news_data = sources["news_data"]
+        countdown_data = sources["countdown_data"]
+        invory_data = sources.get("invory_data")
+        einvoicehub_data = sources.get("einvoicehub_data")
+        # Weitere konfigurierte Websites (z.B. News-Quellen mit SCRAPE_NEWS_SOURCES=true)
+        web_sources = {name: sources.get(f"{name}_data") for name in self.scrapers
+                       if name not in ("invory", "einvoicehub")}
         
-        # Optional: Lösungs-spezifische Recherche (reduziert)  
-        logger.info("Sammle Lösungsbeispiele...")
-        invory_data = self.invory_client.get_xrechnung_insights()
-        einvoicehub_data = self.einvoicehub_client.get_xrechnung_insights()
+        # Unveränderte Quellen (gleicher Fingerprint wie ein früherer Lauf): abgeleitetes Material wiederverwenden
+        fingerprint = fingerprint_sources(sources)
+        derived = source_fingerprints.lookup(fingerprint)
+        if derived is not None:
+            logger.info(f"♻️ Quellen unverändert (Fingerprint {fingerprint}) - nutze abgeleitetes Material erneut")
+        else:
+            derived = self._derive_source_material(sources)
+        # "Nichts Neues" nur, wenn dieses Thema das Bündel schon hatte - Batch-Themen teilen ein Bündel
+        no_new_source_material = source_fingerprints.seen_for_topic(fingerprint, topic)
+        source_fingerprints.record(fingerprint, derived, topic)
         
         # Kombiniere alle Ergebnisse mit spezifischen einvoicehub Features und aktuellen News
         key_points = []
         
         # Füge aktuelle News-Punkte hinzu
-        if news_data["news"]:
-            import random
-            selected_news = random.sample(news_data["news"], min(2, len(news_data["news"])))
-            for news_item in selected_news:
-                if news_item["relevance"] == "high":
-                    key_points.append(f"📰 Aktuell: {news_item['title']}")
+        news_candidates = derived["news_candidates"]
+        if news_candidates:
+            selected_news = random.sample(news_candidates, min(2, len(news_candidates)))
+            key_points.extend(candidate["point"] for candidate in selected_news if candidate["relevance"] == "high")
         
         # Füge Countdown hinzu wenn verfügbar
         if countdown_data["next_milestone"]:
@@ -84,8 +351,8 @@ class ResearchAgent:
         # Füge spezifische einvoicehub Features hinzu (reduziert da mehr News-Content)
         selected_highlights = random.sample(EINVOICEHUB_HIGHLIGHTS, min(2, len(EINVOICEHUB_HIGHLIGHTS)))
         
-        if invory_data and invory_data.get("invory_features"):
-            key_points.append(f"Lösungen wie invory.de bieten: {', '.join(invory_data['invory_features'][:2])}")
+        if derived["solution_point"]:
+            key_points.append(derived["solution_point"])
         
         # Füge einvoicehub Features mit spezifischen Details hinzu (weniger als vorher)
         key_points.extend(selected_highlights[:2])
@@ -105,10 +372,15 @@ class ResearchAgent:
             "key_points": key_points[:6],  # Begrenze auf 6 Punkte
             "invory_data": invory_data,
             "einvoicehub_data": einvoicehub_data,
+            "web_sources": web_sources,
             "einvoicehub_features": einvoicehub_features,
             "einvoicehub_highlights": selected_highlights,
             "news_data": news_data,
             "countdown_data": countdown_data,
+            "source_features": derived["features"],
+            "source_keywords": derived["keywords"],
+            "source_fingerprint": fingerprint,
+            "no_new_source_material": no_new_source_material,
             "invory_url": invory_data.get("invory_url", "https://invory.de") if invory_data else "https://invory.de",
             "einvoicehub_url": einvoicehub_data.get("einvoicehub_url", "https://einvoicehub.de") if einvoicehub_data else "https://einvoicehub.de",
             "trends": news_data["trends"] + [
@@ -129,30 +401,40 @@ class ResearchAgent:
         logger.info("Recherche abgeschlossen")
         return research_result
     
+    def _derive_source_material(self, sources: Dict[str, dict]) -> dict:
+        """
+        Leitet das deterministische Material aus den Quellen ab (Basis für Key Points, pro Fingerprint gespeichert)
+        
+        Args:
+            sources: Abgerufene Quellen (siehe gather_sources)
+            
+        Returns:
+            dict: News-Kandidaten, Lösungs-Punkt sowie Features und Keywords aller Websites
+        """
+        news = sources["news_data"]["news"]
+        invory_data = sources.get("invory_data")
+        websites = [sources.get(f"{name}_data") or {} for name in self.scrapers]
+        
+        solution_point = None
+        if invory_data and invory_data.get("invory_features"):
+            solution_point = f"Lösungen wie invory.de bieten: {', '.join(invory_data['invory_features'][:2])}"
+        
+        return {
+            "news_candidates": [{"point": f"📰 Aktuell: {item['title']}", "relevance": item["relevance"]}
+                                for item in news],
+            "solution_point": solution_point,
+            "features": list(dict.fromkeys(feature for name, data in zip(self.scrapers, websites)
+                                           for feature in data.get(f"{name}_features", []))),
+            "keywords": list(dict.fromkeys(keyword for name, data in zip(self.scrapers, websites)
+                                           for keyword in data.get(f"{name}_keywords", [])))
+        }
+    
     def _get_relevant_feature_categories(self, topic: str) -> list:
         """Bestimmt relevante einvoicehub Feature-Kategorien basierend auf dem Thema"""
-        topic_lower = topic.lower()
-        
-        # Mapping von Themen zu relevanten Features
-        topic_mapping = {
-            "automatisierung": ["automatisierung", "validierung", "dashboard"],
-            "validation": ["validierung", "reports", "sicherheit"], 
-            "compliance": ["sicherheit", "reports", "validierung"],
-            "api": ["automatisierung", "entwickler", "sicherheit"],
-            "dashboard": ["dashboard", "reports", "nutzung"],
-            "batch": ["validierung", "reports", "rechnungseingang"],
-            "upload": ["rechnungseingang", "validierung", "automatisierung"],
-            "webhook": ["automatisierung", "entwickler", "sicherheit"],
-            "peppol": ["automatisierung", "sicherheit", "entwickler"],
-            "billing": ["abrechnung", "nutzung", "dashboard"],
-            "security": ["sicherheit", "entwickler", "abrechnung"]
-        }
-        
-        # Finde passende Kategorien
+        # Finde passende Kategorien (ein Suchlauf für alle Themen-Keywords)
         relevant_categories = []
-        for keyword, categories in topic_mapping.items():
-            if keyword in topic_lower:
-                relevant_categories.extend(categories)
+        for keyword in TOPIC_MATCHER.matched(topic):
+            relevant_categories.extend(TOPIC_FEATURE_CATEGORIES[keyword])
         
         # Fallback: wenn keine spezifischen Kategorien gefunden, nutze die wichtigsten
         if not relevant_categories:
@@ -171,11 +453,42 @@ class ResearchAgent:
         """
         logger.info("Recherchiere aktuelle XRechnung-Neuigkeiten...")
         
-        news_items = []
-        trends = []
+        # News aus dem lokalen Store (RSS/Atom-Ingestion) - indizierte Abfrage statt Live-Abruf
+        try:
+            current_news = news_store.latest(limit=NEWS_ITEMS_PER_RUN)
+        except Exception as e:
+            logger.error(f"Fehler beim Lesen des News-Stores: {str(e)}")
+            current_news = []
+        if not current_news:
+            logger.info("📰 News-Store leer - nutze kuratierte News (Aktualisierung: python main.py --mode news)")
+            current_news = self._get_curated_news()
+        
+        # Aktuelle Trends aus der Branche (erweitert für mehr Vielfalt)
+        current_trends = [
+            "KI-gestützte Rechnungsverarbeitung erreicht 99% Genauigkeit", 
+            "Cloud-first E-Invoicing wird zum Industriestandard",
+            "Real-Time Compliance-Monitoring revolutioniert Buchhaltung",
+            "Nachhaltigkeit: 40% CO2-Einsparung durch digitale Rechnungen",
+            "Blockchain-Verifizierung startet Pilotphase in Deutschland",
+            "API-first Architekturen ermöglichen nahtlose Integration",
+            "Mobile-First: Rechnungen werden vom Smartphone verwaltet",
+            "Quantum-Computing verspricht neue Verschlüsselungsstandards",
+            "Cross-Border E-Invoicing vereinfacht EU-Handel",
+            "Voice-to-Invoice: Spracherkennung automatisiert Dateneingabe",
+            "Predictive Analytics optimiert Cashflow-Management",
+            "Micro-Services ersetzen monolithische ERP-Systeme"
+        ]
         
-        # Mock-Daten für realistische News (da echte Scraping komplex wäre)
-        current_news = [
+        return {
+            "news": current_news,
+            "trends": current_trends,
+            "search_keywords": XRECHNUNG_KEYWORDS,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def _get_curated_news(self) -> list:
+        """Kuratierte News als Fallback, solange der News-Store leer ist"""
+        return [
             {
                 "title": "Bundesrat beschließt neue E-Rechnungsverordnung",
                 "summary": "Erweiterte Fristen und neue Anforderungen für XRechnung 3.0",
@@ -219,29 +532,6 @@ class ResearchAgent:
                 "relevance": "medium"
             }
         ]
-        
-        # Aktuelle Trends aus der Branche (erweitert für mehr Vielfalt)
-        current_trends = [
-            "KI-gestützte Rechnungsverarbeitung erreicht 99% Genauigkeit", 
-            "Cloud-first E-Invoicing wird zum Industriestandard",
-            "Real-Time Compliance-Monitoring revolutioniert Buchhaltung",
-            "Nachhaltigkeit: 40% CO2-Einsparung durch digitale Rechnungen",
-            "Blockchain-Verifizierung startet Pilotphase in Deutschland",
-            "API-first Architekturen ermöglichen nahtlose Integration",
-            "Mobile-First: Rechnungen werden vom Smartphone verwaltet",
-            "Quantum-Computing verspricht neue Verschlüsselungsstandards",
-            "Cross-Border E-Invoicing vereinfacht EU-Handel",
-            "Voice-to-Invoice: Spracherkennung automatisiert Dateneingabe",
-            "Predictive Analytics optimiert Cashflow-Management",
-            "Micro-Services ersetzen monolithische ERP-Systeme"
-        ]
-        
-        return {
-            "news": current_news,
-            "trends": current_trends,
-            "search_keywords": XRECHNUNG_KEYWORDS,
-            "timestamp": datetime.now().isoformat()
-        }
     
     def calculate_xrechnung_countdown(self) -> dict:
         """
@@ -278,6 +568,23 @@ class ResearchAgent:
             "current_date": current_date.isoformat()
         }
     
+    def _get_empty_news_data(self) -> dict:
+        """Fallback ohne News, falls die News-Recherche nicht rechtzeitig fertig wird"""
+        return {
+            "news": [],
+            "trends": [],
+            "search_keywords": XRECHNUNG_KEYWORDS,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def _get_empty_countdown_data(self) -> dict:
+        """Fallback ohne Countdown, falls die Berechnung nicht rechtzeitig fertig wird"""
+        return {
+            "next_milestone": None,
+            "upcoming_milestones": [],
+            "current_date": datetime.now().date().isoformat()
+        }
+    
     def _format_countdown(self, days: int) -> str:
         """Formatiert Countdown-Text benutzerfreundlich"""
         if days <= 0:
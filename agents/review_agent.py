@@ -3,10 +3,24 @@ Review Agent - Prüft und verbessert erstellte Posts mit AI-Provider-Rotation
 """
 from crewai import Agent
 from config import get_review_model, MAX_POST_LENGTH, ANTHROPIC_API_KEY
+from services.keyword_matcher import KeywordMatcher
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bild-Theme → Keywords, die im Post-Inhalt dazu passen
+THEME_CONTENT_MATCHER = KeywordMatcher(groups={
+    "countdown": ["countdown", "zeit", "deadline", "⏰"],
+    "automatisierung": ["automatisierung", "roboter", "ki", "ai"],
+    "transformation": ["transformation", "digital", "wandel"],
+    "compliance": ["compliance", "regel", "vorschrift", "häkchen"],
+    "erfolg": ["erfolg", "gewinn", "wachstum", "celebration"],
+    "problem": ["problem", "lösung", "herausforderung"],
+    "zukunft": ["zukunft", "vision", "2030", "modern"]
+})
+# Erkennt, zu welchem Theme ein Bild gehört (erstes Theme in obiger Reihenfolge gewinnt)
+THEME_NAME_MATCHER = KeywordMatcher(THEME_CONTENT_MATCHER.groups.keys())
+
 class ReviewAgent:
     """Agent für die Überprüfung und Verbesserung von LinkedIn-Posts"""
     
@@ -112,25 +126,10 @@ class ReviewAgent:
         
         # Prüfe Theme-Passung zum Post-Inhalt
         image_theme = image_data.get("theme", "")
-        post_lower = post.lower()
-        
-        # Validiere Theme-Content-Match
-        theme_matches = {
-            "countdown": ["countdown", "zeit", "deadline", "⏰"],
-            "automatisierung": ["automatisierung", "roboter", "ki", "ai"],
-            "transformation": ["transformation", "digital", "wandel"],
-            "compliance": ["compliance", "regel", "vorschrift", "häkchen"],
-            "erfolg": ["erfolg", "gewinn", "wachstum", "celebration"],
-            "problem": ["problem", "lösung", "herausforderung"],
-            "zukunft": ["zukunft", "vision", "2030", "modern"]
-        }
         
         # Prüfe ob Theme zum Content passt
-        theme_relevant = False
-        for theme_key, keywords in theme_matches.items():
-            if theme_key in image_theme.lower():
-                theme_relevant = any(keyword in post_lower for keyword in keywords)
-                break
+        theme_keys = THEME_NAME_MATCHER.matched(image_theme)
+        theme_relevant = bool(theme_keys) and theme_keys[0] in THEME_CONTENT_MATCHER.matched_groups(post)
         
         if not theme_relevant:
             result["suggestions"].append(f"Bild-Theme '{image_theme}' passt möglicherweise nicht optimal zum Post-Inhalt")
@@ -0,0 +1,349 @@
+"""
+Story Templates - Registry der Storytelling-Vorlagen des Content Agents mit längenbewusster Zusammenstellung
+
+Eine Vorlage besteht aus Segmenten (Format-Strings mit {feld}-Platzhaltern).
+Die Registry parst jede Vorlage beim ersten Zugriff einmal in Literal- und
+Feld-Stücke und cacht das Ergebnis. Beim Zusammenstellen wird jedes Segment
+genau einmal gerendert und seine Länge gemessen; überschreitet der Post das
+Budget (MAX_POST_LENGTH), werden optionale Segmente nach ihrer drop_order
+gekürzt (Listen verlieren zuerst ihre letzten Einträge) oder weggelassen -
+der fertige Text wird nie nachträglich abgeschnitten.
+"""
+import string
+import threading
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+_formatter = string.Formatter()
+
+
+class Segment(NamedTuple):
+    """Abschnitt einer Vorlage (Quelltext, wird von der Registry kompiliert)"""
+    name: str
+    text: Union[str, Tuple[str, ...]]  # Format-String oder Varianten (Auswahl per variant beim Rendern)
+    prefix: str = "\n\n"               # Trenner vor dem Segment (entfällt am Anfang des Posts)
+    drop_order: Optional[int] = None   # None = Pflicht; optionale Segmente (entfallen bei leeren Feldern) fallen aufsteigend zuerst weg
+    items: Optional[str] = None        # Listenfeld: item wird je Eintrag angehängt ({item})
+    item: str = "\n• {item}"
+    max_items: int = 2
+
+
+class RenderedStory(NamedTuple):
+    """Ergebnis der Zusammenstellung"""
+    text: str
+    omitted: List[str]   # Weggelassene bzw. gekürzte optionale Segmente
+
+
+def _compile(text: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Parst einen Format-String in (Literal, Feldname)-Stücke"""
+    parts = []
+    for literal, field, spec, conversion in _formatter.parse(text):
+        if spec or conversion:
+            raise ValueError(f"Format-Angaben werden in Story-Vorlagen nicht unterstützt: {{{field}!{conversion}:{spec}}}")
+        parts.append((literal, field))
+    return tuple(parts)
+
+
+def _fill(parts: Sequence[Tuple[str, Optional[str]]], values: Mapping, optional: bool) -> Optional[str]:
+    """Setzt Werte ein - bei optionalen Segmenten None, wenn ein Feld leer ist (Segment entfällt dann)"""
+    chunks = []
+    for literal, field in parts:
+        chunks.append(literal)
+        if field is not None:
+            value = values.get(field)
+            if value in (None, "", [], ()):
+                if optional:
+                    return None
+                value = ""
+            chunks.append(str(value))
+    return "".join(chunks)
+
+
+class _RenderedSegment:
+    """Einmal gerendertes Segment mit Länge; Listeneinträge lassen sich einzeln entfernen"""
+    __slots__ = ("name", "prefix", "head", "entries", "drop_order")
+
+    def __init__(self, name: str, prefix: str, head: str, entries: List[str], drop_order: Optional[int]):
+        self.name = name
+        self.prefix = prefix
+        self.head = head
+        self.entries = entries
+        self.drop_order = drop_order
+
+    def __len__(self) -> int:
+        return len(self.prefix) + len(self.head) + sum(len(entry) for entry in self.entries)
+
+
+class _CompiledSegment:
+    """Kompiliertes Segment (Varianten und Listeneintrag bereits geparst)"""
+    __slots__ = ("segment", "variants", "item")
+
+    def __init__(self, segment: Segment):
+        self.segment = segment
+        texts = (segment.text,) if isinstance(segment.text, str) else segment.text
+        self.variants = tuple(_compile(text) for text in texts)
+        self.item = _compile(segment.item) if segment.items else None
+
+    def render(self, values: Mapping, variant: int) -> Optional[_RenderedSegment]:
+        segment = self.segment
+        optional = segment.drop_order is not None
+        head = _fill(self.variants[variant % len(self.variants)], values, optional)
+        if head is None:
+            return None
+        entries = []
+        if self.item is not None:
+            for value in list(values.get(segment.items) or [])[:segment.max_items]:
+                entry = _fill(self.item, {**values, "item": value}, optional=True)
+                if entry is not None:
+                    entries.append(entry)
+            if not entries and optional:
+                return None
+        return _RenderedSegment(segment.name, segment.prefix, head, entries, segment.drop_order)
+
+
+class StoryTemplate:
+    """Kompilierte Vorlage"""
+
+    def __init__(self, name: str, segments: Iterable[Segment]):
+        self.name = name
+        self.segments = [_CompiledSegment(segment) for segment in segments]
+
+    def render(self, values: Mapping, budget: Optional[int] = None, variant: int = 0) -> RenderedStory:
+        """
+        Stellt den Post aus den Segmenten zusammen
+
+        Args:
+            values: Feldwerte (leere Werte lassen das jeweilige Segment entfallen)
+            budget: Optional - maximale Zeichenzahl des Posts
+            variant: Auswahl unter Segment-Varianten (Index modulo Anzahl)
+
+        Returns:
+            RenderedStory: Text und weggelassene/gekürzte optionale Segmente
+        """
+        rendered = [segment for segment in (compiled.render(values, variant) for compiled in self.segments)
+                    if segment is not None]
+        omitted = []
+        if budget is not None:
+            total = sum(len(segment) for segment in rendered) - (len(rendered[0].prefix) if rendered else 0)
+            optional = sorted((segment for segment in rendered if segment.drop_order is not None),
+                              key=lambda segment: segment.drop_order)
+            while total > budget and optional:
+                segment = optional[0]
+                if segment.name not in omitted:
+                    omitted.append(segment.name)
+                if len(segment.entries) > 1:
+                    total -= len(segment.entries.pop())
+                    continue
+                optional.pop(0)
+                rendered.remove(segment)
+                total -= len(segment)
+            if total > budget:
+                logger.warning(f"⚠️ Vorlage '{self.name}' passt ohne optionale Segmente nicht in {budget} Zeichen ({total})")
+
+        chunks = []
+        for position, segment in enumerate(rendered):
+            if position:
+                chunks.append(segment.prefix)
+            chunks.append(segment.head)
+            chunks.extend(segment.entries)
+        return RenderedStory("".join(chunks), omitted)
+
+
+class StoryTemplateRegistry:
+    """Vorlagen pro Storytelling-Struktur - werden beim ersten Zugriff kompiliert und gecacht"""
+
+    def __init__(self, templates: Mapping[str, Sequence[Segment]], footer: Sequence[Segment] = (),
+                 default: str = "Default"):
+        """
+        Args:
+            templates: Strukturname → Segmente
+            footer: Segmente, die an jede Vorlage angehängt werden (z.B. Links und Hashtags)
+            default: Vorlage für unbekannte Strukturnamen
+        """
+        self._sources: Dict[str, Tuple[Segment, ...]] = {name: tuple(segments) for name, segments in templates.items()}
+        self.footer = tuple(footer)
+        self.default = default
+        self._compiled: Dict[str, StoryTemplate] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, segments: Sequence[Segment]):
+        """Registriert (oder ersetzt) eine Vorlage"""
+        with self._lock:
+            self._sources[name] = tuple(segments)
+            self._compiled.pop(name, None)
+
+    def get(self, name: str) -> StoryTemplate:
+        """Kompilierte Vorlage zur Struktur (unbekannte Namen: Standard-Vorlage)"""
+        if name not in self._sources:
+            name = self.default
+        template = self._compiled.get(name)
+        if template is None:
+            with self._lock:
+                template = self._compiled.get(name)
+                if template is None:
+                    template = StoryTemplate(name, self._sources[name] + self.footer)
+                    self._compiled[name] = template
+        return template
+
+    def render(self, name: str, values: Mapping, budget: Optional[int] = None, variant: int = 0) -> RenderedStory:
+        """Rendert die Vorlage einer Struktur (siehe StoryTemplate.render)"""
+        return self.get(name).render(values, budget, variant)
+
+
+# Der Countdown ist kurz und zeitkritisch - er fällt in allen Vorlagen erst nach Highlights und Headlines weg
+FOOTER = (
+    Segment("links", "🔗 Entdecke mehr:\n• {invory_url} - Deine XRechnung-Lösung\n• {einvoicehub_url} - E-Invoicing Plattform"),
+    Segment("hashtags", "#XRechnung #Storytelling #DigitaleTransformation #EInvoicing #ZukunftGestalten"),
+)
+
+STORY_TEMPLATES = {
+    "Hero's Journey": (
+        Segment("intro", """🦸‍♀️ Die Geschichte von Sarah's XRechnung-Abenteuer
+
+Sarah, Geschäftsführerin eines mittelständischen Unternehmens, stand vor einer scheinbar unlösbaren Herausforderung: Hunderte von Rechnungen stapelten sich auf ihrem Schreibtisch."""),
+        Segment("countdown", "{countdown} bis zum großen Wendepunkt: {milestone}", prefix=" ", drop_order=2),
+        Segment("struggle", """💔 Der Kampf war real:
+• Nächtliche Überstunden beim manuellen Rechnungsabgleich
+• Ständige Angst vor Compliance-Fehlern
+• Das Team war überlastet und frustriert
+
+✨ Dann entdeckte Sarah die Macht der XRechnung-Automatisierung..."""),
+        # einvoicehub Features als "magische Werkzeuge"
+        Segment("highlights", "🛡️ Ihre neuen Superkräfte:", drop_order=1, items="highlights"),
+        Segment("outcome", """🏆 Heute, 6 Monate später:
+• Sarah verlässt pünktlich das Büro
+• Ihr Team fokussiert sich auf Wachstum statt auf Papierkram
+• 95% weniger Rechnungsfehler
+
+"Die beste Entscheidung, die ich je getroffen habe!" - Sarah
+
+➡️ Welche Herausforderung wartet darauf, von DIR gelöst zu werden?"""),
+    ),
+    "Problem-Solution": (
+        Segment("problem", """😰 Kennst du das Gefühl?
+
+Es ist Freitagabend, 19:30 Uhr. Während andere bereits das Wochenende genießen, sitzt du noch im Büro. Vor dir: Ein Berg von Rechnungen, die bis Montag verarbeitet werden müssen.
+
+🤯 Das Problem:
+• Manuelle Dateneingabe bis spät in die Nacht
+• Ständige Sorge um Compliance-Fehler
+• Dein Team ist gestresst und überlastet"""),
+        Segment("countdown", "⏰ Zeit drängt: {countdown} bis {milestone}", drop_order=2),
+        Segment("turn", """💡 Die Wendung:
+Was wäre, wenn ich dir sage, dass XRechnung-Automatisierung das alles ändern kann?"""),
+        Segment("highlights", "🎯 Die Lösung in Aktion:", drop_order=1, items="highlights"),
+        Segment("vision", """🚀 Stell dir vor:
+• Automatische Rechnungsverarbeitung in Sekunden
+• Deine Freitage gehören wieder DIR
+• Dein Team kann sich auf Wachstum konzentrieren
+
+➡️ Bist du bereit für die Transformation? Erzähl mir von deinen Rechnungs-Herausforderungen!"""),
+    ),
+    "Future Vision": (
+        # 5 Varianten, Auswahl per Datum (konsistent am selben Tag, variierend über die Tage)
+        Segment("vision", (
+            # Industrie-Transformation
+            """🚀 2030: Die große XRechnung-Revolution ist da!
+
+*Flashforward aktiviert* 💫
+
+Ein Unternehmerverband berichtet: "99% aller deutschen Unternehmen nutzen jetzt vollautomatische XRechnung-Verarbeitung. Manuelle Rechnungsbearbeitung ist Geschichte."
+
+🌟 Was heute noch Zukunft scheint:
+• Millisekunden-Rechnungsverarbeitung
+• Zero-Error-Compliance durch KI
+• Grenzenloses digitales Geschäft""",
+            # Persönliche CEO-Vision
+            """🔮 Blick ins Jahr 2030...
+
+*Vision aktiviert* ✨
+
+CEO Sarah K. schaut auf ihre Statistik: "Letztes Jahr: 15.000 Rechnungen, 0 manuelle Eingriffe, 100% Compliance-Rate. XRechnung hat unser Geschäft revolutioniert."
+
+🌟 Die neue Realität:
+• Vollständige Automatisierung ist Standard
+• Unternehmen fokussieren auf Innovation statt Verwaltung
+• EU-weite nahtlose Geschäftsprozesse""",
+            # Markt-Transformation
+            """⚡ 2030: Der deutsche Mittelstand ist digital!
+
+*Zukunftsscan aktiviert* 📊
+
+Aktuelle Zahlen zeigen: Über 4 Millionen deutsche Unternehmen verarbeiten täglich 50+ Millionen XRechnungen vollautomatisch. Der Produktivitätssprung ist messbar.
+
+🌟 Diese Zukunft ist real:
+• 95% Kostenreduktion in der Rechnungsbearbeitung
+• Fehlerquote unter 0,1%
+• Neue Geschäftsmodelle durch Effizienz""",
+            # Technologie-Vision
+            """🔬 2030: XRechnung 5.0 ist Realität!
+
+*Innovation aktiviert* 🧬
+
+Die nächste Generation ist da: KI-gesteuerte XRechnungen passen sich automatisch an Geschäftsregeln an. Blockchain sichert jeden Transaktion. Quantenverschlüsselung schützt sensible Daten.
+
+🌟 Technologie der Zukunft:
+• Adaptive KI optimiert jeden Prozess
+• Real-Time-Compliance in 27 EU-Ländern
+• Quantum-sichere Rechnungsverarbeitung""",
+            # Gesellschafts-Impact
+            """🌍 2030: XRechnung rettet den Planeten!
+
+*Impact aktiviert* 🌱
+
+Studie zeigt: Durch vollständige XRechnung-Digitalisierung werden jährlich 2,3 Millionen Tonnen Papier gespart. 180.000 Arbeitsstunden pro Tag für Innovationen freigesetzt.
+
+🌟 Der große Wandel:
+• Papierlose Wirtschaft ist Realität
+• Millionen Stunden für Kreativität gewonnen
+• Nachhaltigkeit durch Effizienz""",
+        )),
+        Segment("countdown", "⏰ Die Zukunft beginnt JETZT: {countdown} bis {milestone}", drop_order=2),
+        Segment("headlines", "📰 Aktuelle Signale der Transformation:", drop_order=1, items="headlines"),
+        Segment("call", """🚀 Aber hier ist das Verrückte:
+Diese "Zukunft" existiert bereits HEUTE! Unternehmen nutzen schon jetzt XRechnung-Automatisierung und leben bereits in 2030.
+
+💭 Die Frage ist nicht OB, sondern WANN du den Sprung machst.
+
+➡️ In welchem Jahr willst DU ankommen? 2024 oder 2030?"""),
+    ),
+    "Behind the Scenes": (
+        Segment("scene", """🎬 Behind the Scenes: Wie XRechnung-Magie entsteht
+
+*Blick hinter die Kulissen bei Invory*
+
+7:30 Uhr morgens. Während die meisten noch schlafen, ist unser Entwicklerteam bereits hochkonzentriert dabei, die Zukunft der Rechnungsverarbeitung zu programmieren.
+
+👩‍💻 Was ihr nicht seht:
+• 47 Kaffeetassen und unzählige "Aha!"-Momente
+• Stundenlange Diskussionen über die perfekte User Experience
+• Nächtliche Coding-Sessions für eure Compliance-Sicherheit"""),
+        Segment("highlights", "💡 Unsere neuesten Durchbrüche:", drop_order=1, items="highlights"),
+        Segment("motivation", """🔥 Das Coolste dabei:
+Jeder Bug, den wir fixen, jedes Feature, das wir bauen - es macht das Leben von echten Menschen leichter. Gestern haben wir eine Nachricht von einem Kunden bekommen: "Dank euch kann ich wieder pünktlich nach Hause!"
+
+💝 DAS ist unser Antrieb.
+
+➡️ Welche Technologie-Geschichte würdest DU gerne mitschreiben?"""),
+    ),
+    # Fallback für unbekannte Strukturen
+    "Default": (
+        Segment("intro", """💼 {topic}: Eine Reise in die digitale Zukunft
+
+Stell dir vor, du könntest mit einem Fingerschnips alle deine Rechnungsprobleme lösen...
+
+🔄 Die Transformation beginnt mit einem ersten Schritt:
+• Von manuell zu automatisiert
+• Von kompliziert zu elegant
+• Von stressig zu entspannt"""),
+        Segment("countdown", "⏰ {countdown} bis {milestone}", drop_order=1),
+        Segment("closing", """✨ Die Magie liegt in der Einfachheit der XRechnung.
+
+➡️ Bist du bereit für den nächsten Schritt?"""),
+    ),
+}
+
+# Singleton Instance
+story_templates = StoryTemplateRegistry(STORY_TEMPLATES, footer=FOOTER)
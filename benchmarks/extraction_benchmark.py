@@ -0,0 +1,107 @@
+"""
+Benchmark: Single-Pass lxml-Extraktion vs. bisherige BeautifulSoup-Extraktion
+
+Parst die gespeicherten HTML-Fixtures (benchmarks/fixtures) wiederholt mit beiden
+Verfahren, prüft, dass die Ergebnisse übereinstimmen, und meldet die Parse-Zeit
+pro Seite (Median) sowie den Speedup.
+
+Aufruf aus dem Repository-Root:
+    python -m benchmarks.extraction_benchmark --repeat 200
+    python -m benchmarks.extraction_benchmark --scale 20   # Fixture 20x vervielfacht (große Seiten)
+"""
+import argparse
+import os
+import re
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from services.einvoicehub_client import EinvoiceHubClient
+from services.html_extraction import HtmlExtractor, clean_text
+from services.invory_client import InvoryClient
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def beautifulsoup_extract(extractor: HtmlExtractor, body: bytes) -> Dict:
+    """Bisheriges Verfahren (html.parser, decompose, zwei find_all, get_text) als Referenz"""
+    soup = BeautifulSoup(body, 'html.parser')
+    links = [a["href"] for a in soup.find_all("a", href=True)]
+    for element in soup(["script", "style", "nav", "footer", "header"]):
+        element.decompose()
+    text = clean_text(soup.get_text())
+
+    title = soup.find('title')
+    features = []
+    for elem in soup.find_all(['h2', 'h3', 'li', 'p'], string=extractor.feature_pattern)[:10]:
+        feature = elem.get_text().strip()
+        if feature and len(feature) < 200:
+            features.append(feature)
+    sections = []
+    for section in soup.find_all(['section', 'div'], class_=extractor.section_class_pattern)[:5]:
+        section_text = section.get_text().strip()[:500]
+        if section_text:
+            sections.append(section_text)
+
+    return {
+        "title": title.get_text() if title else None,
+        "features": features,
+        "sections": sections,
+        "text": text,
+        "keywords": extractor.match_keywords(text),
+        "links": links
+    }
+
+
+def time_per_page(extract: Callable[[bytes], Dict], body: bytes, repeat: int) -> float:
+    """Median der Parse-Zeit pro Seite in Millisekunden"""
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(body)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def scale_body(body: bytes, factor: int) -> bytes:
+    """Vervielfacht den <body>-Inhalt, um große Seiten nachzubilden"""
+    if factor <= 1:
+        return body
+    match = re.search(rb"<body[^>]*>(.*)</body>", body, re.S)
+    if not match:
+        return body
+    inner = match.group(1)
+    return body[:match.start(1)] + inner * factor + body[match.end(1):]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse-Zeit lxml Single-Pass vs. BeautifulSoup")
+    parser.add_argument("--repeat", type=int, default=100, help="Wiederholungen pro Fixture und Verfahren")
+    parser.add_argument("--scale", type=int, default=1, help="Faktor, um den der Seiteninhalt vervielfacht wird")
+    args = parser.parse_args()
+
+    clients = {"invory": InvoryClient(), "einvoicehub": EinvoiceHubClient()}
+
+    print("\n" + "="*70)
+    print(f"📊 EXTRACTION BENCHMARK ({args.repeat} Wiederholungen, Skalierung {args.scale}x)")
+    print("="*70)
+    for name, client in clients.items():
+        with open(os.path.join(FIXTURES_DIR, f"{name}.html"), "rb") as f:
+            body = scale_body(f.read(), args.scale)
+        extractor = client.extractor
+
+        identical = extractor.extract(body) == beautifulsoup_extract(extractor, body)
+        soup_ms = time_per_page(lambda b: beautifulsoup_extract(extractor, b), body, args.repeat)
+        lxml_ms = time_per_page(extractor.extract, body, args.repeat)
+
+        print(f"\n🌐 {name} ({len(body) / 1024:.1f} KB)")
+        print(f"   BeautifulSoup (html.parser):  {soup_ms:>8.3f} ms")
+        print(f"   lxml Single-Pass:             {lxml_ms:>8.3f} ms")
+        print(f"   🚀 Speedup:                   {soup_ms / lxml_ms:>8.1f}x")
+        print(f"   {'✅' if identical else '❌'} Ergebnisse identisch")
+
+
+if __name__ == "__main__":
+    main()
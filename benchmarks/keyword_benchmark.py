@@ -0,0 +1,93 @@
+"""
+Benchmark: Keyword-Suche - bisherige Schleifen vs. KeywordMatcher (Substring-Suche und Aho-Corasick)
+
+Durchsucht den extrahierten Text der HTML-Fixtures (benchmarks/fixtures, per
+--scale vervielfacht für große Seiten) mit unterschiedlich großen Keyword-Mengen,
+prüft, dass alle Verfahren dieselben Treffer liefern, und meldet die Zeit pro
+Suchlauf (Median). Die Messung zeigt auch, ab welcher Keyword-Anzahl der
+Automat schneller ist (AUTOMATON_MIN_KEYWORDS).
+
+Aufruf aus dem Repository-Root:
+    python -m benchmarks.keyword_benchmark --scale 50
+    python -m benchmarks.keyword_benchmark --keywords 16 500 2000
+"""
+import argparse
+import os
+import re
+import statistics
+import time
+from typing import Callable, List
+
+from benchmarks.extraction_benchmark import FIXTURES_DIR, scale_body
+from config import SCRAPER_SITES, XRECHNUNG_KEYWORDS
+from services.html_extraction import HtmlExtractor
+from services.keyword_matcher import AUTOMATON_MIN_KEYWORDS, KeywordMatcher
+
+
+def loop_match(keywords: List[str], text: str) -> List[str]:
+    """Bisheriges Verfahren: pro Keyword ein `keyword.lower() in text_lower`"""
+    text_lower = text.lower()
+    return [keyword for keyword in keywords if keyword.lower() in text_lower]
+
+
+def keyword_set(text: str, count: int) -> List[str]:
+    """Konfigurierte Keywords, aufgefüllt mit Wörtern der Seite und Wörtern ohne Treffer"""
+    keywords = list(dict.fromkeys(XRECHNUNG_KEYWORDS + [k for profile in SCRAPER_SITES for k in profile.get("keywords", [])]))
+    vocabulary = sorted(set(re.findall(r"\w{5,}", text.lower())))
+    keywords += vocabulary[:max(0, count - len(keywords)) // 2]
+    keywords += [f"xrechnung-{index}-ohne-treffer" for index in range(max(0, count - len(keywords)))]
+    # Case-insensitive eindeutig - der Matcher fasst Schreibweisen desselben Keywords zusammen
+    unique = {}
+    for keyword in keywords:
+        unique.setdefault(keyword.lower(), keyword)
+    return list(unique.values())[:count]
+
+
+def time_per_run(search: Callable[[str], object], text: str, repeat: int) -> float:
+    """Median der Zeit pro Suchlauf in Millisekunden"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        search(text)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword-Suche: Schleifen vs. KeywordMatcher")
+    parser.add_argument("--repeat", type=int, default=20, help="Wiederholungen pro Verfahren")
+    parser.add_argument("--scale", type=int, default=50, help="Faktor, um den der Seiteninhalt vervielfacht wird")
+    parser.add_argument("--keywords", type=int, nargs="+", default=[16, 100, AUTOMATON_MIN_KEYWORDS, 2000],
+                        help="Größen der Keyword-Mengen")
+    args = parser.parse_args()
+
+    extractor = HtmlExtractor(r"feature", r"feature", [])
+    print("\n" + "="*78)
+    print(f"📊 KEYWORD BENCHMARK ({args.repeat} Wiederholungen, Skalierung {args.scale}x)")
+    print("="*78)
+    for name in ("invory", "einvoicehub"):
+        with open(os.path.join(FIXTURES_DIR, f"{name}.html"), "rb") as f:
+            text = extractor.extract(scale_body(f.read(), args.scale))["text"]
+
+        print(f"\n🌐 {name} ({len(text) / 1024:.1f} KB Text)")
+        print(f"   {'Keywords':>8}  {'Schleifen':>10}  {'Substring':>10}  {'Automat':>10}  {'Positionen':>10}")
+        for count in args.keywords:
+            keywords = keyword_set(text, count)
+            substring = KeywordMatcher(keywords, use_automaton=False)
+            automaton = KeywordMatcher(keywords, use_automaton=True)
+
+            identical = (loop_match(keywords, text) == substring.matched(text) == automaton.matched(text)
+                         and substring.find_all(text) == automaton.find_all(text))
+            loop_ms = time_per_run(lambda t: loop_match(keywords, t), text, args.repeat)
+            substring_ms = time_per_run(substring.matched, text, args.repeat)
+            automaton_ms = time_per_run(automaton.matched, text, args.repeat)
+            default = KeywordMatcher(keywords)
+            positions_ms = time_per_run(default.find_all, text, args.repeat)
+
+            print(f"   {len(keywords):>8}  {loop_ms:>8.3f}ms  {substring_ms:>8.3f}ms  {automaton_ms:>8.3f}ms  "
+                  f"{positions_ms:>8.3f}ms  {'✅' if identical else '❌'} "
+                  f"{'Automat' if default.use_automaton else 'Substring'}")
+
+
+if __name__ == "__main__":
+    main()
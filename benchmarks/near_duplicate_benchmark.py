@@ -0,0 +1,98 @@
+"""
+Benchmark: Near-Duplicate-Abfrage - MinHash/LSH-Index vs. Shingle-Vergleich mit der ganzen Historie
+
+Erzeugt eine synthetische Historie aus den Storytelling-Vorlagen (jeder Post mit
+zufällig ersetzten Wörtern, damit sich die Posts unterscheiden), baut den Index
+und misst pro Abfrage den Median von Signatur plus LSH-Lookup gegenüber dem
+exakten Jaccard-Vergleich mit allen Posts. Zusätzlich wird geprüft, dass der
+Index die exakt gefundenen Wiederholungen (Jaccard ab --threshold) findet.
+
+Aufruf aus dem Repository-Root:
+    python -m benchmarks.near_duplicate_benchmark
+    python -m benchmarks.near_duplicate_benchmark --posts 50000 --queries 200
+"""
+import argparse
+import random
+import statistics
+import time
+
+from agents.story_templates import STORY_TEMPLATES
+from near_duplicates import NearDuplicateIndex, minhash_signature, shingles
+
+VOCABULARY = ["Rechnung", "Lieferant", "Empfänger", "Validierung", "Archiv", "Frist", "Portal", "Format",
+              "Mittelstand", "Buchhaltung", "Steuerberater", "Prüfung", "Schnittstelle", "Zahlung", "Beleg"]
+
+
+def synthetic_post(rng: random.Random, mutation: float) -> str:
+    """Vorlagentext, in dem ein Anteil mutation der Wörter ersetzt ist"""
+    segments = rng.choice(list(STORY_TEMPLATES.values()))
+    text = " ".join(segment.text if isinstance(segment.text, str) else rng.choice(segment.text) for segment in segments)
+    words = text.split()
+    for index in rng.sample(range(len(words)), int(len(words) * mutation)):
+        words[index] = f"{rng.choice(VOCABULARY)}{rng.randrange(10_000)}"
+    return " ".join(words)
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Near-Duplicate-Abfrage: MinHash/LSH vs. exakter Vergleich")
+    parser.add_argument("--posts", type=int, default=20000, help="Posts in der synthetischen Historie")
+    parser.add_argument("--queries", type=int, default=100, help="Anzahl Abfragen")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Ähnlichkeitsschwelle")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # Stark mutierte Historie (keine Wiederholungen untereinander), Abfragen teils als Kopie mit wenig Änderungen
+    history = [synthetic_post(rng, mutation=0.5) for _ in range(args.posts)]
+
+    start = time.perf_counter()
+    signatures = [minhash_signature(text) for text in history]
+    signature_s = time.perf_counter() - start
+    index = NearDuplicateIndex()
+    start = time.perf_counter()
+    for position, signature in enumerate(signatures):
+        index.add(position, signature)
+    index.query(signatures[0], args.threshold)  # Signatur-Matrix aufbauen
+    build_s = time.perf_counter() - start
+    history_shingles = [shingles(text) for text in history]
+
+    queries = []
+    for _ in range(args.queries):
+        if rng.random() < 0.5:
+            words = history[rng.randrange(args.posts)].split()
+            words[rng.randrange(len(words))] = "geändert"
+            queries.append(" ".join(words))
+        else:
+            queries.append(synthetic_post(rng, mutation=0.5))
+
+    index_ms, exact_ms, found, expected = [], [], 0, 0
+    for query in queries:
+        start = time.perf_counter()
+        matches = index.query(minhash_signature(query), args.threshold)
+        index_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        query_shingles = shingles(query)
+        exact = {position for position, other in enumerate(history_shingles)
+                 if jaccard(query_shingles, other) >= args.threshold}
+        exact_ms.append((time.perf_counter() - start) * 1000)
+
+        expected += len(exact)
+        found += len(exact & {position for position, _ in matches})
+
+    print("\n" + "="*78)
+    print(f"📊 NEAR-DUPLICATE BENCHMARK ({args.posts} Posts, {args.queries} Abfragen, Schwelle {args.threshold})")
+    print("="*78)
+    print(f"   Signaturen der Historie: {signature_s:.2f}s ({signature_s / args.posts * 1000:.3f}ms pro Post)")
+    print(f"   Index-Aufbau aus Signaturen: {build_s * 1000:.1f}ms")
+    print(f"   Abfrage MinHash/LSH (Median): {statistics.median(index_ms):.3f}ms")
+    print(f"   Abfrage exakter Vergleich (Median): {statistics.median(exact_ms):.3f}ms")
+    print(f"   Gefundene Wiederholungen: {found}/{expected} {'✅' if found == expected else '⚠️'}")
+
+
+if __name__ == "__main__":
+    main()
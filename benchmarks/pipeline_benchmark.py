@@ -0,0 +1,164 @@
+"""
+Offline End-to-End Benchmark für die komplette Pipeline (create_and_post)
+
+Läuft gegen lokale Stand-ins (benchmarks/stub_servers.py) statt gegen das Internet
+und meldet Durchsatz (Runs/s), Latenzverteilung pro Stufe (p50/p95) und Peak-RSS.
+
+Aufruf aus dem Repository-Root:
+    python -m benchmarks.pipeline_benchmark --runs 50 --concurrency 8
+    python -m benchmarks.pipeline_benchmark --runs 20 --preview --openai-latency 2.0
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.stub_servers import StubServers
+
+
+def configure_environment(stubs: StubServers, workdir: str):
+    """Lenkt alle Upstreams auf die Stand-ins und alle Dateien in ein temporäres Verzeichnis"""
+    os.environ.update(stubs.environment())
+    os.environ["PIPELINE_RUNS_DIR"] = os.path.join(workdir, "pipeline_runs")
+    os.environ["DRAFT_INVENTORY_FILE"] = os.path.join(workdir, "draft_inventory.json")
+    os.environ["HTTP_CACHE_DIR"] = os.path.join(workdir, "http_cache")
+    os.environ["CRAWL_INDEX_FILE"] = os.path.join(workdir, "crawl_index.json")
+    os.environ["SOURCE_FINGERPRINT_FILE"] = os.path.join(workdir, "source_fingerprints.json")
+    os.environ["NEWS_DB_FILE"] = os.path.join(workdir, "news.db")
+    # Gemessen wird die Pipeline selbst - wiederholte Läufe sollen nicht aus dem Recherche-Cache kommen
+    os.environ["RESEARCH_CACHE_ENABLED"] = "false"
+    os.environ["RESEARCH_CACHE_FILE"] = os.path.join(workdir, "research_cache.json")
+
+
+def peak_rss_mb() -> float:
+    """Peak Resident Set Size des Prozesses in MB (ru_maxrss: KB unter Linux, Bytes unter macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def run_benchmark(runs: int, concurrency: int, auto_post: bool, workdir: str) -> Dict:
+    """
+    Führt runs Pipeline-Läufe mit begrenzter Parallelität auf einem Event Loop aus
+
+    Returns:
+        dict: Wall-Zeit, Laufzeiten, Stufenzeiten, Fehler und Warm-up-Dauer
+    """
+    # Import erst nach configure_environment - config liest die Umgebung beim Import
+    from multi_agent_system import LinkedInPostMultiAgentSystem
+    from post_history import PostHistoryTracker
+    from services.http_session import close_async_session
+
+    system = LinkedInPostMultiAgentSystem(
+        history_tracker=PostHistoryTracker(os.path.join(workdir, "post_history.json"))
+    )
+
+    try:
+        # Warm-up: baut Agents/Clients lazy auf und öffnet die HTTP-Verbindungen
+        warmup_start = time.perf_counter()
+        await system.acreate_and_post("Benchmark Warm-up", auto_post=auto_post)
+        warmup = time.perf_counter() - warmup_start
+
+        topics = system.get_available_topics()
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        run_latencies: List[float] = []
+
+        async def timed_run(index: int) -> Dict:
+            async with semaphore:
+                start = time.perf_counter()
+                result = await system.acreate_and_post(topics[index % len(topics)], auto_post=auto_post)
+                run_latencies.append(time.perf_counter() - start)
+                return result
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(timed_run(i) for i in range(runs)))
+        wall_time = time.perf_counter() - start
+    finally:
+        await close_async_session()
+
+    stage_samples: Dict[str, List[float]] = {}
+    for result in results:
+        for stage, seconds in (result.get("stage_timings") or {}).items():
+            stage_samples.setdefault(stage, []).append(seconds)
+
+    return {
+        "wall_time": wall_time,
+        "warmup": warmup,
+        "run_latencies": run_latencies,
+        "stage_samples": stage_samples,
+        "failed": sum(1 for result in results if not result.get("success")),
+        "posted": sum(1 for result in results if result.get("linkedin_posted")),
+        "degraded": sum(1 for result in results if result.get("degradations")),
+    }
+
+
+def print_report(report: Dict, runs: int, concurrency: int, auto_post: bool, stubs: StubServers):
+    """Gibt die Benchmark-Ergebnisse aus"""
+    from post_history import PostHistoryTracker
+    percentile = PostHistoryTracker._percentile
+
+    print("\n" + "="*70)
+    print(f"📊 PIPELINE BENCHMARK ({'post' if auto_post else 'preview'}, {runs} Läufe, Parallelität {concurrency})")
+    print("="*70)
+    print(f"🔥 Warm-up (Lazy-Init):  {report['warmup']:.2f}s")
+    print(f"⏱️ Wall-Zeit:            {report['wall_time']:.2f}s")
+    print(f"🚀 Durchsatz:            {runs / report['wall_time']:.2f} Runs/s")
+    latencies = report["run_latencies"]
+    print(f"🧭 Lauf-Latenz:          p50 {percentile(latencies, 50):.3f}s · p95 {percentile(latencies, 95):.3f}s")
+    print(f"❌ Fehlgeschlagen:       {report['failed']}")
+    if auto_post:
+        print(f"📤 Gepostet:             {report['posted']}")
+    print(f"⬇️ Mit Herabstufung:     {report['degraded']}")
+    print(f"💾 Peak RSS:             {peak_rss_mb():.1f} MB")
+
+    print("\n⏱️ LATENZ PRO STUFE:")
+    for stage, samples in sorted(report["stage_samples"].items()):
+        print(f"   {stage:<30} p50 {percentile(samples, 50):>7.3f}s · p95 {percentile(samples, 95):>7.3f}s  (n={len(samples)})")
+
+    print("\n🌐 ANFRAGEN AN STAND-INS:")
+    for service, count in sorted(stubs.requests.items()):
+        print(f"   {service:<30} {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline End-to-End Benchmark für create_and_post")
+    parser.add_argument("--runs", type=int, default=20, help="Anzahl gemessener Läufe")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximal parallele Läufe")
+    parser.add_argument("--preview", action="store_true", help="Nur Previews (ohne LinkedIn-Posting)")
+    parser.add_argument("--scrape-latency", type=float, default=0.2, help="Latenz invory/einvoicehub in Sekunden")
+    parser.add_argument("--openai-latency", type=float, default=0.5, help="Latenz der Images API in Sekunden")
+    parser.add_argument("--linkedin-latency", type=float, default=0.1, help="Latenz pro LinkedIn-Call in Sekunden")
+    parser.add_argument("--verbose", action="store_true", help="Logs und Ausgaben der Agents anzeigen")
+    args = parser.parse_args()
+
+    stubs = StubServers(latencies={
+        "invory": args.scrape_latency,
+        "einvoicehub": args.scrape_latency,
+        "openai": args.openai_latency,
+        "linkedin": args.linkedin_latency,
+    }).start()
+
+    with tempfile.TemporaryDirectory(prefix="pipeline-benchmark-") as workdir:
+        configure_environment(stubs, workdir)
+        logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+        if not args.verbose:
+            logging.disable(logging.WARNING)
+
+        # Agents schreiben Fortschritt per print() - im Benchmark nur Rauschen
+        output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with output:
+            report = asyncio.run(run_benchmark(args.runs, args.concurrency, not args.preview, workdir))
+
+        print_report(report, args.runs, args.concurrency, not args.preview, stubs)
+
+    stubs.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Lokale Stand-ins für invory.de, einvoicehub.de, die OpenAI Images API und die LinkedIn REST API
+
+Alle Dienste laufen auf einem aiohttp-Server unter eigenem Pfad-Präfix:
+
+- /invory/, /einvoicehub/     → HTML-Fixtures aus benchmarks/fixtures
+- /openai/v1/images/...        → DALL-E Antwort mit Bild-URL auf diesem Server
+- /images/<name>.png           → Bilddaten
+- /linkedin/v2/...             → userinfo, registerUpload, ugcPosts (+ PUT-Upload)
+
+Die Latenz pro Dienst ist konfigurierbar, um echte Upstreams nachzubilden. Die
+Website-Stand-ins senden ein ETag und beantworten If-None-Match mit 304.
+"""
+import asyncio
+import hashlib
+import itertools
+import os
+import threading
+from typing import Dict, Optional
+from aiohttp import web
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# 1x1 PNG - der Inhalt ist für den Benchmark egal, nur Download/Upload zählen
+PNG_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c63000100000500010d0a2db40000000049454e44ae426082"
+)
+
+
+class StubServers:
+    """Startet die Stand-ins in einem eigenen Thread mit eigenem Event Loop"""
+
+    def __init__(self, latencies: Optional[Dict[str, float]] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            latencies: Optional - künstliche Latenz in Sekunden pro Dienst
+                ("invory", "einvoicehub", "openai", "linkedin")
+            host: Bind-Adresse
+            port: Port (0 = freier Port)
+        """
+        self.latencies = latencies or {}
+        self.host = host
+        self.port = port
+        self.requests: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._pages = {}
+        for name in ("invory", "einvoicehub"):
+            with open(os.path.join(FIXTURES_DIR, f"{name}.html"), encoding="utf-8") as f:
+                self._pages[name] = f.read()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def environment(self) -> Dict[str, str]:
+        """Umgebungsvariablen, mit denen die Pipeline gegen die Stand-ins läuft"""
+        return {
+            "INVORY_URL": f"{self.base_url}/invory/",
+            "EINVOICEHUB_URL": f"{self.base_url}/einvoicehub/",
+            "OPENAI_BASE_URL": f"{self.base_url}/openai/v1",
+            "OPENAI_API_KEY": "benchmark-key",
+            "LINKEDIN_API_BASE_URL": f"{self.base_url}/linkedin/v2",
+            "LINKEDIN_ACCESS_TOKEN": "benchmark-token",
+        }
+
+    def start(self) -> "StubServers":
+        """Startet den Server und blockiert, bis er Verbindungen annimmt"""
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="stub-servers", daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def stop(self):
+        """Beendet Server und Event Loop"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+    async def _start(self):
+        app = web.Application(client_max_size=16 * 1024 * 1024)
+        app.add_routes([
+            web.get("/invory/", self._page("invory")),
+            web.get("/einvoicehub/", self._page("einvoicehub")),
+            web.post("/openai/v1/images/generations", self._image_generation),
+            web.get("/images/{name}", self._image),
+            web.get("/linkedin/v2/userinfo", self._userinfo),
+            web.post("/linkedin/v2/assets", self._register_upload),
+            web.put("/linkedin/upload/{asset}", self._upload),
+            web.post("/linkedin/v2/ugcPosts", self._ugc_post),
+        ])
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def _delay(self, service: str):
+        self.requests[service] = self.requests.get(service, 0) + 1
+        latency = self.latencies.get(service, 0)
+        if latency:
+            await asyncio.sleep(latency)
+
+    def _page(self, name: str):
+        etag = f'"{hashlib.sha1(self._pages[name].encode("utf-8")).hexdigest()}"'
+
+        async def handler(request: web.Request) -> web.Response:
+            await self._delay(name)
+            if request.headers.get("If-None-Match") == etag:
+                self.requests[f"{name} (304)"] = self.requests.get(f"{name} (304)", 0) + 1
+                return web.Response(status=304, headers={"ETag": etag})
+            return web.Response(text=self._pages[name], content_type="text/html", headers={"ETag": etag})
+        return handler
+
+    async def _image_generation(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        await self._delay("openai")
+        return web.json_response({
+            "created": 0,
+            "data": [{
+                "url": f"{self.base_url}/images/{next(self._ids)}.png",
+                "revised_prompt": body.get("prompt", "")
+            }]
+        })
+
+    async def _image(self, request: web.Request) -> web.Response:
+        return web.Response(body=PNG_BYTES, content_type="image/png")
+
+    async def _userinfo(self, request: web.Request) -> web.Response:
+        await self._delay("linkedin")
+        return web.json_response({"sub": "benchmark-user", "name": "Benchmark"})
+
+    async def _register_upload(self, request: web.Request) -> web.Response:
+        await request.read()
+        await self._delay("linkedin")
+        asset = next(self._ids)
+        return web.json_response({"value": {
+            "asset": f"urn:li:digitalmediaAsset:{asset}",
+            "uploadMechanism": {"com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {
+                "uploadUrl": f"{self.base_url}/linkedin/upload/{asset}"
+            }}
+        }})
+
+    async def _upload(self, request: web.Request) -> web.Response:
+        await request.read()
+        await self._delay("linkedin")
+        return web.Response(status=201)
+
+    async def _ugc_post(self, request: web.Request) -> web.Response:
+        await request.read()
+        await self._delay("linkedin")
+        return web.json_response({"id": f"urn:li:share:{next(self._ids)}"}, status=201)
@@ -0,0 +1,123 @@
+"""
+Pipeline Checkpoints - speichert Stufenergebnisse pro Lauf für Wiederaufnahme
+"""
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RunCheckpointStore:
+    """
+    Legt pro Pipeline-Lauf ein Verzeichnis <base_dir>/<run_id>/ an
+
+    - run.json: Metadaten (Thema, auto_post, Status)
+    - <stufe>.json: Ergebnis einer abgeschlossenen Stufe
+    """
+
+    def __init__(self, base_dir: str = "pipeline_runs"):
+        self.base_dir = base_dir
+
+    def _run_dir(self, run_id: str) -> str:
+        return os.path.join(self.base_dir, run_id)
+
+    def _write_json(self, path: str, data: Any):
+        """Schreibt atomar (temporäre Datei + rename), damit Abbrüche keine halben Checkpoints hinterlassen"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+    def _read_json(self, path: str) -> Optional[Any]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Checkpoint nicht lesbar ({path}): {e}")
+            return None
+
+    def create_run(self, meta: Dict) -> str:
+        """
+        Legt einen neuen Lauf an
+
+        Args:
+            meta: Metadaten des Laufs (z.B. topic, auto_post)
+
+        Returns:
+            str: Neue Run-ID
+        """
+        run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self._write_json(os.path.join(self._run_dir(run_id), "run.json"), {
+            **meta,
+            "run_id": run_id,
+            "created": datetime.now().isoformat(),
+            "completed": False
+        })
+        return run_id
+
+    def load_run(self, run_id: str) -> Optional[Dict]:
+        """Lädt die Metadaten eines Laufs oder None, falls unbekannt"""
+        path = os.path.join(self._run_dir(run_id), "run.json")
+        if not os.path.exists(path):
+            return None
+        return self._read_json(path)
+
+    def update_run(self, run_id: str, **fields):
+        """Ergänzt oder überschreibt Metadaten eines Laufs (unbekannte Läufe werden ignoriert)"""
+        meta = self.load_run(run_id)
+        if meta is not None:
+            meta.update(fields)
+            self._write_json(os.path.join(self._run_dir(run_id), "run.json"), meta)
+
+    def mark_completed(self, run_id: str, **fields):
+        """Markiert einen Lauf als vollständig abgeschlossen (optional mit weiteren Metadaten)"""
+        self.update_run(run_id, completed=True, completed_at=datetime.now().isoformat(), **fields)
+
+    def save_stage(self, run_id: str, stage: str, output: Any):
+        """Speichert das Ergebnis einer abgeschlossenen Stufe"""
+        self._write_json(os.path.join(self._run_dir(run_id), f"{stage}.json"), {"output": output})
+
+    def load_stages(self, run_id: str, stage_names: List[str]) -> Dict[str, Any]:
+        """
+        Lädt vorhandene Stufenergebnisse
+
+        Args:
+            run_id: Run-ID
+            stage_names: Gesuchte Stufen
+
+        Returns:
+            dict: Stufenname → Ergebnis (nur vorhandene Checkpoints)
+        """
+        outputs = {}
+        for stage in stage_names:
+            path = os.path.join(self._run_dir(run_id), f"{stage}.json")
+            if os.path.exists(path):
+                data = self._read_json(path)
+                if data is not None:
+                    outputs[stage] = data["output"]
+        return outputs
+
+    def list_runs(self, include_completed: bool = False) -> List[Dict]:
+        """Listet Läufe (neueste zuerst), standardmäßig nur unvollständige"""
+        if not os.path.isdir(self.base_dir):
+            return []
+
+        runs = []
+        for run_id in os.listdir(self.base_dir):
+            meta = self.load_run(run_id)
+            if meta and (include_completed or not meta.get("completed")):
+                runs.append(meta)
+        return sorted(runs, key=lambda meta: meta.get("created", ""), reverse=True)
+
+    def prune(self, retention_days: int):
+        """Entfernt abgeschlossene Läufe, die älter als retention_days sind"""
+        cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+        for meta in self.list_runs(include_completed=True):
+            if meta.get("completed") and meta.get("created", "") < cutoff:
+                shutil.rmtree(self._run_dir(meta["run_id"]), ignore_errors=True)
@@ -12,10 +12,11 @@ LINKEDIN_CLIENT_SECRET = os.getenv("LINKEDIN_CLIENT_SECRET")
 LINKEDIN_ACCESS_TOKEN = os.getenv("LINKEDIN_ACCESS_TOKEN")
 LINKEDIN_ORGANIZATION_ID = os.getenv("LINKEDIN_ORGANIZATION_ID")  # Optional: wird automatisch abgerufen
 LINKEDIN_COMPANY_NAME = os.getenv("LINKEDIN_COMPANY_NAME", "Invory")  # Unternehmensname für automatische ID-Suche
+LINKEDIN_API_BASE_URL = os.getenv("LINKEDIN_API_BASE_URL", "https://api.linkedin.com/v2")  # Überschreibbar für lokale Stand-ins (Benchmarks)
 
 # Website URLs für Recherche
-INVORY_URL = "https://invory.de"
-EINVOICEHUB_URL = "https://einvoicehub.de"
+INVORY_URL = os.getenv("INVORY_URL", "https://invory.de")
+EINVOICEHUB_URL = os.getenv("EINVOICEHUB_URL", "https://einvoicehub.de")
 
 # OpenAI/LangChain Konfiguration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -214,6 +215,78 @@ XRECHNUNG_KEYWORDS = [
     "Factur-X"
 ]
 
+# Scraper-Profile pro Website (services/site_scraper.py) - eine neue Quelle ist ein neues Profil.
+# Pflicht: name (Präfix der Insight-Keys, z.B. invory_features), urls (erste URL = Startseite).
+# Optional: label, feature_pattern, section_class_pattern, keywords, default_title,
+# default_features und mock_data (features, title, keywords, content) als Fallback.
+SCRAPER_SITES = [
+    {
+        "name": "invory",
+        "label": "invory.de",
+        "urls": [INVORY_URL],
+        "feature_pattern": r'(feature|funktion|service|leistung|lösung)',
+        "section_class_pattern": r'(feature|service|about|solution)',
+        "keywords": [
+            "XRechnung", "E-Invoicing", "digitale Rechnung", "elektronische Rechnung",
+            "Compliance", "Automatisierung", "ERP", "Integration", "ZUGFeRD"
+        ],
+        "default_title": "Invory.de - XRechnung Lösungen",
+        "default_features": ["XRechnung-Erstellung", "Compliance-Prüfung", "Automatisierung", "ERP-Integration"],
+        "mock_data": {
+            "features": [
+                "Automatische XRechnung-Erstellung",
+                "Compliance-Prüfung",
+                "ERP-Integration",
+                "Automatische Validierung",
+                "Digitale Rechnungsstellung"
+            ],
+            "title": "Invory.de - XRechnung Lösungen",
+            "keywords": ["XRechnung", "E-Invoicing", "Compliance", "Automatisierung"],
+            "content": "Invory.de bietet Lösungen für die digitale Rechnungsstellung mit XRechnung-Standard."
+        }
+    },
+    {
+        "name": "einvoicehub",
+        "label": "einvoicehub.de",
+        "urls": [EINVOICEHUB_URL],
+        "feature_pattern": r'(feature|funktion|service|leistung|hub|plattform)',
+        "section_class_pattern": r'(feature|service|about|solution|hub)',
+        "keywords": [
+            "XRechnung", "E-Invoicing", "digitale Rechnung", "elektronische Rechnung",
+            "Compliance", "Automatisierung", "ERP", "Integration", "ZUGFeRD", "Hub", "Plattform"
+        ],
+        "default_title": "EinvoiceHub - XRechnung Hub",
+        "default_features": ["XRechnung-Hub", "Digitale Rechnungsplattform", "E-Invoicing Services", "Automatisierung"],
+        "mock_data": {
+            "features": [
+                "XRechnung-Hub",
+                "Digitale Rechnungsplattform",
+                "E-Invoicing Services",
+                "Automatisierung",
+                "Compliance-Lösungen"
+            ],
+            "title": "EinvoiceHub - XRechnung Hub",
+            "keywords": ["XRechnung", "E-Invoicing", "Hub", "Plattform", "Automatisierung"],
+            "content": "EinvoiceHub bietet eine Plattform für digitale Rechnungsstellung mit XRechnung-Standard."
+        }
+    }
+]
+
+# News-Quellen zusätzlich als Scraper-Profile abrufen (Startseite, XRechnung-Keywords)
+SCRAPE_NEWS_SOURCES = os.getenv("SCRAPE_NEWS_SOURCES", "false").lower() == "true"
+if SCRAPE_NEWS_SOURCES:
+    SCRAPER_SITES += [
+        {
+            "name": url.split("//", 1)[-1].removeprefix("www.").split(".")[0].replace("-", "_"),
+            "label": url.split("//", 1)[-1].removeprefix("www."),
+            "urls": [url],
+            "feature_pattern": r'(xrechnung|e-rechnung|e-invoicing|peppol|zugferd)',
+            "section_class_pattern": r'(news|article|teaser|content)',
+            "keywords": XRECHNUNG_KEYWORDS
+        }
+        for url in XRECHNUNG_NEWS_SOURCES
+    ]
+
 # Storytelling Templates
 STORYTELLING_STRUCTURES = [
     {
@@ -265,6 +338,84 @@ POST_TIME = os.getenv("POST_TIME", "09:00")  # HH:MM Format
 MAX_POST_LENGTH = 3000  # LinkedIn Post Max Length
 INCLUDE_IMAGES = os.getenv("INCLUDE_IMAGES", "true").lower() == "true"  # Bilder aktivieren/deaktivieren
 
+# HTTP-Verbindungen der Services (geteilte Sessions, siehe services/http_session.py)
+HTTP_POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", "8"))  # Maximale parallele Verbindungen pro Host
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))  # Wiederholungen bei Verbindungsfehlern/5xx/429 (nur GET/HEAD)
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.5"))  # Basis für exponentielles Backoff mit Jitter (Sekunden)
+
+# Circuit Breaker pro Host und Negativ-Cache für fehlgeschlagene URLs (siehe services/circuit_breaker.py)
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))  # Fehlschläge in Folge (Verbindung, Timeout, 5xx, 429), bis der Host gesperrt wird
+CIRCUIT_COOLDOWN_SECONDS = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "300"))  # Sperrdauer, danach ein Probe-Request
+NEGATIVE_CACHE_SECONDS = float(os.getenv("NEGATIVE_CACHE_SECONDS", "120"))  # Fehlgeschlagene URLs so lange nicht erneut abrufen (0 = aus)
+
+# Seiten-Cache für Scraping (Conditional GET mit ETag/Last-Modified, siehe services/http_cache.py)
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".http_cache")
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "21600"))  # Frische in Sekunden für Seiten ohne ETag/Last-Modified
+
+# Cache für Modell-Antworten (Schlüssel: Modell, Prompt, Parameter, siehe services/model_cache.py) - nur Previews und Tests, echte Posts umgehen ihn
+MODEL_CACHE_ENABLED = os.getenv("MODEL_CACHE_ENABLED", "true").lower() == "true"
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", ".model_cache")
+MODEL_CACHE_MAX_MB = float(os.getenv("MODEL_CACHE_MAX_MB", "20"))  # Danach fallen die am längsten nicht genutzten Antworten heraus
+MODEL_CACHE_TTL_MINUTES = float(os.getenv("MODEL_CACHE_TTL_MINUTES", "50"))  # DALL-E-URLs laufen nach etwa einer Stunde ab
+
+# Gestreamter Seitenabruf beim Scraping (siehe services/html_extraction.py ExtractionStream)
+SCRAPE_MAX_BYTES = int(os.getenv("SCRAPE_MAX_BYTES", "2000000"))  # Höchstens so viele Bytes pro Seite laden (0 = unbegrenzt)
+SCRAPE_EARLY_STOP = os.getenv("SCRAPE_EARLY_STOP", "true").lower() == "true"  # Download beenden, sobald Titel, Features, Abschnitte und Vorschau feststehen (nicht beim Crawling - dort werden alle Links gebraucht)
+
+# Multi-Page-Crawler (sitemap.xml, Links derselben Website, robots.txt, siehe services/site_crawler.py)
+CRAWL_ENABLED = os.getenv("CRAWL_ENABLED", "false").lower() == "true"  # false = nur die URLs der Profile; Profil-Key "crawl" überschreibt
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", "15"))  # Maximale Seiten pro Website und Lauf
+CRAWL_MAX_DEPTH = int(os.getenv("CRAWL_MAX_DEPTH", "2"))  # Link-Tiefe ab Startseite (Sitemap-Einträge zählen als Tiefe 1)
+CRAWL_CONCURRENCY_PER_HOST = int(os.getenv("CRAWL_CONCURRENCY_PER_HOST", "2"))  # Parallele Requests pro Host
+CRAWL_DELAY = float(os.getenv("CRAWL_DELAY", "1.0"))  # Mindestabstand zwischen Requests an denselben Host (Sekunden, robots.txt Crawl-delay hat Vorrang, wenn größer)
+CRAWL_REFRESH_HOURS = float(os.getenv("CRAWL_REFRESH_HOURS", "24"))  # Seiten im Crawl-Index gelten so lange als aktuell (kein Request)
+CRAWL_INDEX_FILE = os.getenv("CRAWL_INDEX_FILE", "crawl_index.json")  # URL, Abrufzeit, Content-Hash und Ergebnis pro Seite
+CRAWL_USER_AGENT = os.getenv("CRAWL_USER_AGENT", "LinkedInXRechnungAgent")  # Name für robots.txt-Regeln
+
+# News-Ingestion (RSS/Atom der XRECHNUNG_NEWS_SOURCES in einen SQLite-Store, siehe services/news_ingestion.py)
+NEWS_INGEST_ENABLED = os.getenv("NEWS_INGEST_ENABLED", "true").lower() == "true"  # Scheduler aktualisiert den News-Store regelmäßig
+NEWS_FEED_URLS = [url.strip() for url in os.getenv("NEWS_FEED_URLS", "").split(",") if url.strip()]  # Feste Feed-URLs (zusätzlich zur Autodiscovery)
+NEWS_DB_FILE = os.getenv("NEWS_DB_FILE", "news.db")
+NEWS_REFRESH_MINUTES = float(os.getenv("NEWS_REFRESH_MINUTES", "60"))  # Abstand der Feed-Abrufe im Scheduler
+NEWS_MAX_AGE_DAYS = int(os.getenv("NEWS_MAX_AGE_DAYS", "30"))  # Ältere News werden nicht mehr verwendet und entfernt
+NEWS_ITEMS_PER_RUN = int(os.getenv("NEWS_ITEMS_PER_RUN", "7"))  # News pro Recherche
+
+# Recherche-Konfiguration
+RESEARCH_CONCURRENT = os.getenv("RESEARCH_CONCURRENT", "true").lower() == "true"  # Quellen parallel abrufen
+RESEARCH_TIME_BUDGET = float(os.getenv("RESEARCH_TIME_BUDGET", "12"))  # Gesamtbudget in Sekunden für alle Quellen
+SOURCE_FINGERPRINT_FILE = os.getenv("SOURCE_FINGERPRINT_FILE", "source_fingerprints.json")  # Fingerprints der Quellen-Bündel + abgeleitetes Material
+SOURCE_FINGERPRINT_MAX = int(os.getenv("SOURCE_FINGERPRINT_MAX", "100"))  # Maximal aufbewahrte Fingerprints
+RESEARCH_CACHE_ENABLED = os.getenv("RESEARCH_CACHE_ENABLED", "true").lower() == "true"  # Recherche-Ergebnisse pro Thema und Quellen-Version wiederverwenden
+RESEARCH_CACHE_FILE = os.getenv("RESEARCH_CACHE_FILE", "research_cache.json")
+RESEARCH_CACHE_TTL_MINUTES = float(os.getenv("RESEARCH_CACHE_TTL_MINUTES", "60"))  # Danach wird der Eintrag noch geliefert, aber im Hintergrund neu recherchiert
+RESEARCH_CACHE_MAX = int(os.getenv("RESEARCH_CACHE_MAX", "50"))  # Maximal aufbewahrte Recherche-Ergebnisse
+
+# Pipeline-Checkpoints (Wiederaufnahme fehlgeschlagener Posts ohne Neugenerierung)
+PIPELINE_RUNS_DIR = os.getenv("PIPELINE_RUNS_DIR", "pipeline_runs")
+PIPELINE_RUNS_RETENTION_DAYS = int(os.getenv("PIPELINE_RUNS_RETENTION_DAYS", "7"))  # Abgeschlossene Läufe aufbewahren
+
+# Zeitbudgets pro Pipeline-Stufe in Sekunden - bei Überschreitung greifen die Fallbacks
+# (Recherche: Mock-Daten, Bild: Mock-Bild bzw. Text-only Post)
+STAGE_TIME_BUDGETS = {
+    "research": float(os.getenv("RESEARCH_STAGE_BUDGET", "20")),
+    "image": float(os.getenv("IMAGE_STAGE_BUDGET", "45")),
+}
+POST_DEADLINE_MINUTES = int(os.getenv("POST_DEADLINE_MINUTES", "10"))  # Scheduler: spätestens N Minuten nach Job-Start posten (0 = keine Deadline)
+PREFETCH_LEAD_MINUTES = int(os.getenv("PREFETCH_LEAD_MINUTES", "30"))  # Scheduler: Post N Minuten vorher vorbereiten, zur Post-Zeit nur noch veröffentlichen (0 = aus)
+PREFETCH_CHECK_BUDGET = float(os.getenv("PREFETCH_CHECK_BUDGET", "10"))  # Sekunden für die Prüfung auf geänderte Quellen zur Post-Zeit
+
+# Best-of-K Entwürfe: K Storytelling-Strukturen parallel entwerfen und reviewen, bester Score gewinnt
+DRAFT_CANDIDATES = max(1, int(os.getenv("DRAFT_CANDIDATES", "1")))  # 1 = nur die automatisch gewählte Struktur
+DRAFT_INVENTORY_FILE = os.getenv("DRAFT_INVENTORY_FILE", "draft_inventory.json")  # Nicht gewählte Entwürfe
+DRAFT_INVENTORY_MAX = int(os.getenv("DRAFT_INVENTORY_MAX", "200"))  # Maximal aufbewahrte Entwürfe
+
+# Near-Duplicate-Prüfung: vor dem Posten gegen frühere Posts der Historie (MinHash/LSH, siehe near_duplicates.py)
+DUPLICATE_CHECK_ENABLED = os.getenv("DUPLICATE_CHECK_ENABLED", "true").lower() == "true"
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.8"))  # Geschätzte Shingle-Ähnlichkeit (0-1), ab der ein Entwurf als Wiederholung gilt
+DUPLICATE_LOOKBACK_DAYS = int(os.getenv("DUPLICATE_LOOKBACK_DAYS", "90"))  # Nur Posts der letzten N Tage vergleichen (0 = gesamte Historie)
+
 # Agent Konfiguration
 AGENT_TEMPERATURE = 0.7
 AGENT_MAX_ITERATIONS = 10
@@ -0,0 +1,104 @@
+"""
+Draft Inventory - bewahrt nicht gewählte Post-Entwürfe zur späteren Wiederverwendung auf
+"""
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+from config import DRAFT_INVENTORY_FILE, DRAFT_INVENTORY_MAX
+
+logger = logging.getLogger(__name__)
+
+class DraftInventory:
+    """Speichert Entwürfe aus der Best-of-K-Auswahl in einer lokalen JSON-Datei"""
+
+    def __init__(self, inventory_file: str = DRAFT_INVENTORY_FILE, max_drafts: int = DRAFT_INVENTORY_MAX):
+        self.inventory_file = inventory_file
+        self.max_drafts = max_drafts
+        self.drafts = self._load_drafts()
+        # Parallele Pipeline-Läufe schreiben aus mehreren Threads
+        self._lock = threading.RLock()
+
+    def _load_drafts(self) -> List[Dict]:
+        """Lädt Entwürfe aus JSON-Datei"""
+        if os.path.exists(self.inventory_file):
+            try:
+                with open(self.inventory_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError) as e:
+                logger.warning(f"Konnte Draft-Inventar nicht laden: {e}")
+                return []
+        return []
+
+    def _save_drafts(self):
+        """Speichert Entwürfe in JSON-Datei"""
+        try:
+            with self._lock, open(self.inventory_file, 'w', encoding='utf-8') as f:
+                json.dump(self.drafts, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Speichern des Draft-Inventars: {e}")
+
+    def add_drafts(self, topic: str, drafts: List[Dict]) -> List[Dict]:
+        """
+        Legt nicht gewählte Entwürfe ab
+
+        Args:
+            topic: Thema der Entwürfe
+            drafts: Liste mit post_text, storytelling_structure und review_score
+
+        Returns:
+            list: Gespeicherte Einträge
+        """
+        entries = [{
+            "id": uuid.uuid4().hex[:12],
+            "timestamp": datetime.now().isoformat(),
+            "topic": topic,
+            "storytelling_structure": draft["storytelling_structure"],
+            "review_score": draft["review_score"],
+            "post_text": draft["post_text"],
+            "used": False
+        } for draft in drafts]
+
+        with self._lock:
+            self.drafts.extend(entries)
+            # Älteste Entwürfe fallen bei Überschreitung der Maximalgröße heraus
+            self.drafts = self.drafts[-self.max_drafts:]
+            self._save_drafts()
+
+        logger.info(f"🗃️ {len(entries)} Entwürfe im Inventar abgelegt ({topic})")
+        return entries
+
+    def get_drafts(self, topic: Optional[str] = None, min_score: int = 0, include_used: bool = False) -> List[Dict]:
+        """
+        Sucht wiederverwendbare Entwürfe (beste zuerst)
+
+        Args:
+            topic: Optional - nur Entwürfe zu diesem Thema
+            min_score: Mindest-Review-Score
+            include_used: Auch bereits wiederverwendete Entwürfe liefern
+
+        Returns:
+            list: Passende Entwürfe, absteigend nach Score
+        """
+        with self._lock:
+            matches = [draft for draft in self.drafts
+                       if (topic is None or draft["topic"] == topic)
+                       and draft["review_score"] >= min_score
+                       and (include_used or not draft["used"])]
+        return sorted(matches, key=lambda draft: draft["review_score"], reverse=True)
+
+    def mark_used(self, draft_id: str) -> bool:
+        """Markiert einen Entwurf als wiederverwendet; False, falls unbekannt"""
+        with self._lock:
+            for draft in self.drafts:
+                if draft["id"] == draft_id:
+                    draft["used"] = True
+                    self._save_drafts()
+                    return True
+        return False
+
+# Singleton Instance
+draft_inventory = DraftInventory()
@@ -4,7 +4,7 @@ Serverless-Variante für EventBridge (Cron) Triggers
 """
 import json
 import logging
-from multi_agent_system import LinkedInPostMultiAgentSystem
+from multi_agent_system import get_shared_system
 
 # Konfiguriere Logging
 logger = logging.getLogger()
@@ -25,8 +25,8 @@ def lambda_handler(event, context):
     logger.info(f"Event: {json.dumps(event)}")
     
     try:
-        # Erstelle Multi-Agent System
-        multi_agent_system = LinkedInPostMultiAgentSystem()
+        # Multi-Agent System (wird in warmen Containern wiederverwendet)
+        multi_agent_system = get_shared_system()
         
         # Erstelle und poste
         result = multi_agent_system.create_and_post(auto_post=True)
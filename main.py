@@ -29,15 +29,31 @@ def main():
     )
     parser.add_argument(
         '--mode',
-        choices=['preview', 'post', 'schedule', 'history'],
+        choices=['preview', 'post', 'schedule', 'history', 'batch', 'resume', 'news'],
         default='preview',
-        help='Modus: preview (nur anzeigen), post (sofort posten), schedule (automatisch planen), history (Post-Historie)'
+        help='Modus: preview (nur anzeigen), post (sofort posten), schedule (automatisch planen), history (Post-Historie), batch (Previews für alle Themen), resume (abgebrochenen Post-Lauf fortsetzen), news (News-Feeds abrufen)'
     )
     parser.add_argument(
         '--topic',
         type=str,
         help='Spezifisches XRechnung-Thema'
     )
+    parser.add_argument(
+        '--run-id',
+        type=str,
+        help='Run-ID eines abgebrochenen Post-Laufs (für --mode resume)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Anzahl paralleler Worker im Batch-Modus'
+    )
+    parser.add_argument(
+        '--deadline',
+        type=str,
+        help='Spätester Post-Zeitpunkt (HH:MM) - langsame Stufen fallen danach auf Mock-Daten/Text-only zurück'
+    )
     parser.add_argument(
         '--frequency',
         choices=['daily', 'weekly', 'custom'],
@@ -81,7 +97,7 @@ def main():
     elif args.mode == 'post':
         # Post-Modus: Erstelle und poste sofort
         logger.info("Post-Modus: Erstelle und poste auf LinkedIn")
-        result = multi_agent_system.create_and_post(args.topic, auto_post=True)
+        result = multi_agent_system.create_and_post(args.topic, auto_post=True, deadline=args.deadline)
         
         if result["success"]:
             if result["linkedin_posted"]:
@@ -90,17 +106,69 @@ def main():
             else:
                 print("\n⚠️  Post wurde erstellt, aber nicht auf LinkedIn gepostet")
                 print(f"Grund: Post-Status: {result.get('post_status')}")
+                if result.get('run_id'):
+                    print(f"Retry ohne Neugenerierung: python main.py --mode resume --run-id {result['run_id']}")
                 print(f"\nPost-Text:\n{result['post_text']}")
         else:
             print(f"❌ Fehler: {result.get('error', 'Unbekannter Fehler')}")
             sys.exit(1)
     
+    elif args.mode == 'resume':
+        # Resume-Modus: Setzt abgebrochenen Post-Lauf aus Checkpoints fort
+        if not args.run_id:
+            runs = multi_agent_system.checkpoints.list_runs()
+            print("\n🔁 UNVOLLSTÄNDIGE POST-LÄUFE:")
+            for run in runs:
+                print(f"  {run['run_id']} | {run.get('created', 'N/A')[:19]} | {run.get('topic') or 'Zufallsthema'}")
+            if not runs:
+                print("  Keine offenen Läufe gefunden.")
+            return
+        
+        logger.info(f"Resume-Modus: Setze Lauf {args.run_id} fort")
+        result = multi_agent_system.resume(args.run_id, deadline=args.deadline)
+        
+        if result["success"] and result["linkedin_posted"]:
+            print("\n✅ Post erfolgreich auf LinkedIn gepostet!")
+        elif result["success"]:
+            print(f"\n⚠️  Post wurde erneut nicht gepostet (Run-ID: {args.run_id})")
+        else:
+            print(f"❌ Fehler: {result.get('error', 'Unbekannter Fehler')}")
+            sys.exit(1)
+    
+    elif args.mode == 'batch':
+        # Batch-Modus: Previews für mehrere Themen mit geteilter Recherche
+        topics = [args.topic] if args.topic else None
+        logger.info("Batch-Modus: Erstelle Previews für alle Themen")
+        results = multi_agent_system.create_batch(topics, workers=args.workers)
+        
+        print("\n" + "="*80)
+        print(f"BATCH-PREVIEWS ({len(results)})")
+        print("="*80)
+        for result in results:
+            if result["success"]:
+                structure = result['storytelling_structure'].get('name', 'N/A')
+                print(f"\n📝 {result['research_data'].get('topic', 'XRechnung')} | 📖 {structure} | 💯 {result['review_score']}/100 | {result['character_count']} Zeichen")
+                print("-"*80)
+                print(result['post_text'][:300] + "...")
+            else:
+                print(f"\n❌ Fehler: {result.get('error', 'Unbekannter Fehler')}")
+    
     elif args.mode == 'schedule':
         # Schedule-Modus: Starte Scheduler
         logger.info("Schedule-Modus: Starte automatischen Scheduler")
         scheduler = PostScheduler()
         scheduler.run(args.frequency, args.time)
     
+    elif args.mode == 'news':
+        # News-Modus: RSS/Atom-Feeds der News-Quellen in den lokalen News-Store übernehmen
+        from services.news_ingestion import news_ingestor, news_store
+        
+        logger.info("News-Modus: Aktualisiere News-Store")
+        added = news_ingestor.ingest()
+        print(f"\n📰 {added} neue News im Store")
+        for item in news_store.latest(limit=10):
+            print(f"  [{item['relevance']}] {item['published'][:10]} | {item['source']} | {item['title'][:70]}")
+    
     elif args.mode == 'history':
         # History-Modus: Zeige Post-Historie
         from post_history import post_tracker
@@ -129,6 +197,13 @@ def main():
             for model, count in ai_stats["review_models"].items():
                 print(f"    ✅ {model[:25]}: {count}x")
         
+        # Latenz pro Stufe
+        latency_stats = post_tracker.get_stage_latency_stats(30)
+        if latency_stats:
+            print("\n⏱️ LATENZ PRO STUFE (30 Tage):")
+            for stage, stats in latency_stats.items():
+                print(f"  {stage:<28} p50 {stats['p50']:>7.2f}s | p95 {stats['p95']:>7.2f}s | n={stats['count']}")
+        
         # Heutige Posts
         today_posts = post_tracker.get_posts_today()
         if today_posts:
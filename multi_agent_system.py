@@ -2,184 +2,453 @@
 Multi-Agent System für automatische LinkedIn-Post-Erstellung mit Storytelling und Bildern
 XRechnung mit invory.de und einvoicehub.de Integration plus DALL-E 3 Bildgenerierung
 """
-from agents.research_agent import ResearchAgent
-from agents.content_agent import ContentAgent
-from agents.review_agent import ReviewAgent
-# ImageAgent wird lazy geladen um Railway Kompatibilität zu verbessern
-from services.linkedin_client import LinkedInClient
-from config import INCLUDE_IMAGES, get_research_model, get_review_model
-from post_history import post_tracker
-from typing import Dict, Optional
+from config import (
+    DRAFT_CANDIDATES,
+    DUPLICATE_CHECK_ENABLED,
+    INCLUDE_IMAGES,
+    PIPELINE_RUNS_DIR,
+    PIPELINE_RUNS_RETENTION_DAYS,
+    PREFETCH_CHECK_BUDGET,
+    STAGE_TIME_BUDGETS,
+    STORYTELLING_STRUCTURES,
+    get_research_model,
+    get_review_model
+)
+from post_history import PostHistoryTracker, post_tracker
+from draft_inventory import draft_inventory
+from pipeline import StagePipeline, span
+from checkpoints import RunCheckpointStore
+from source_fingerprints import changed_sources, source_versions
+from services.http_session import close_async_session
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Union
+import asyncio
+import atexit
 import logging
+import threading
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class _LazyComponent:
+    """
+    Agent/Client, der erst beim ersten Zugriff gebaut und danach wiederverwendet wird
+    
+    Die Factory importiert ihre Klasse selbst - Module wie der ImageAgent (OpenAI)
+    oder der LinkedInClient (Token-Verwaltung) werden so nur geladen, wenn ein Lauf
+    sie tatsächlich braucht.
+    """
+    
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        component = instance._components.get(self.name)
+        if component is None:
+            # Double-checked Locking: parallele Läufe bauen jede Komponente nur einmal
+            with instance._components_lock:
+                component = instance._components.get(self.name)
+                if component is None:
+                    logger.info(f"🧩 Initialisiere {self.name}")
+                    component = self.factory()
+                    instance._components[self.name] = component
+        return component
+    
+    def __set__(self, instance, value):
+        instance._components[self.name] = value
+
+
+def _create_research_agent():
+    from agents.research_agent import ResearchAgent
+    return ResearchAgent()
+
+
+def _create_content_agent():
+    from agents.content_agent import ContentAgent
+    return ContentAgent()
+
+
+def _create_review_agent():
+    from agents.review_agent import ReviewAgent
+    return ReviewAgent()
+
+
+def _create_image_agent():
+    # ImageAgent wird lazy geladen um Railway Kompatibilität zu verbessern
+    from agents.image_agent import ImageAgent
+    return ImageAgent()
+
+
+def _create_linkedin_client():
+    from services.linkedin_client import LinkedInClient
+    return LinkedInClient()
+
+
 class LinkedInPostMultiAgentSystem:
     """Multi-Agent System für automatische LinkedIn-Post-Erstellung mit Storytelling und Bildern"""
     
-    def __init__(self):
-        # Initialize Agents
-        self.research_agent = ResearchAgent()
-        self.content_agent = ContentAgent()
-        self.review_agent = ReviewAgent()
-        self.image_agent = None  # Lazy loading für bessere Railway Kompatibilität
-        
-        # Initialize Clients
-        self.linkedin_client = LinkedInClient()
+    # Agents und Clients werden beim ersten Zugriff erstellt und danach wiederverwendet
+    research_agent = _LazyComponent(_create_research_agent)
+    content_agent = _LazyComponent(_create_content_agent)
+    review_agent = _LazyComponent(_create_review_agent)
+    image_agent = _LazyComponent(_create_image_agent)
+    linkedin_client = _LazyComponent(_create_linkedin_client)
+    
+    def __init__(self, background_loop: bool = False, history_tracker: Optional[PostHistoryTracker] = None):
+        """
+        Args:
+            background_loop: Wenn True, laufen die synchronen Wrapper auf einem dauerhaften
+                Event Loop in einem Hintergrund-Thread statt je Aufruf asyncio.run - HTTP-Sessions
+                bleiben so über Requests und Scheduler-Läufe hinweg offen (siehe get_shared_system)
+            history_tracker: Optional - eigene Post-Historie (Standard: post_tracker),
+                z.B. damit Benchmarks post_history.json nicht verändern
+        """
+        self.history_tracker = history_tracker or post_tracker
+        self._components: Dict[str, Any] = {}
+        self._components_lock = threading.Lock()
         
         # Bildgenerierung aktiviert?
         self.include_images = INCLUDE_IMAGES
+        
+        # Checkpoints für Post-Läufe (Wiederaufnahme via resume)
+        self.checkpoints = RunCheckpointStore(PIPELINE_RUNS_DIR)
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        if background_loop:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, name="multi-agent-loop", daemon=True).start()
+    
+    def _run_sync(self, coro: Coroutine) -> Any:
+        """
+        Führt eine Coroutine für die synchronen Wrapper aus
+        
+        Mit Hintergrund-Loop wird sie dort eingereiht (thread-sicher, mehrere Aufrufer
+        teilen sich den Loop); sonst läuft sie in einem eigenen, kurzlebigen Loop,
+        dessen HTTP-Session am Ende geschlossen wird.
+        """
+        if self._loop is not None:
+            return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+        return asyncio.run(self._with_session_cleanup(coro))
+    
+    def close(self):
+        """Schließt die HTTP-Session und beendet den Hintergrund-Loop (falls vorhanden)"""
+        if self._loop is None or self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(close_async_session(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+    
+    @staticmethod
+    async def _with_session_cleanup(coro: Coroutine) -> Any:
+        try:
+            return await coro
+        finally:
+            await close_async_session()
     
-    def create_and_post(self, topic: Optional[str] = None, auto_post: bool = False) -> Dict:
+    def create_and_post(self, topic: Optional[str] = None, auto_post: bool = False,
+                        deadline: Union[datetime, str, None] = None) -> Dict:
         """
         Erstellt einen narrativen LinkedIn-Post mit optionalem Bild und postet ihn automatisch
         
+        Synchroner Wrapper um acreate_and_post.
+        
+        Args:
+            topic: Optional - spezifisches XRechnung-Thema
+            auto_post: Wenn True, wird der Post automatisch auf LinkedIn gepostet
+            deadline: Optional - spätester Zeitpunkt (datetime oder "HH:MM" heute)
+            
+        Returns:
+            dict: Ergebnis mit Post-Data, Storytelling-Info und Status
+        """
+        return self._run_sync(self.acreate_and_post(topic, auto_post, deadline))
+    
+    async def acreate_and_post(self, topic: Optional[str] = None, auto_post: bool = False,
+                               deadline: Union[datetime, str, None] = None) -> Dict:
+        """
+        Async-Variante von create_and_post - viele Pipelines teilen sich einen Event Loop
+        
+        Die Schritte laufen als Stage-Pipeline: Bildgenerierung (braucht nur Thema,
+        Countdown und News) läuft parallel zur Content-Erstellung. Scraping, DALL-E
+        und LinkedIn laufen async, ohne einen Thread zu blockieren.
+        
+        Recherche und Bild haben Zeitbudgets (STAGE_TIME_BUDGETS), die zusätzlich durch
+        die Deadline begrenzt werden. Bei Überschreitung greifen die Fallbacks (Mock-Daten,
+        Mock-Bild bzw. Text-only Post) statt auf langsame Upstreams zu warten; jede
+        Herabstufung steht in result["degradations"] und in der Post-Historie.
+        
         Args:
             topic: Optional - spezifisches XRechnung-Thema
             auto_post: Wenn True, wird der Post automatisch auf LinkedIn gepostet
+            deadline: Optional - spätester Zeitpunkt (datetime oder "HH:MM" heute)
             
         Returns:
             dict: Ergebnis mit Post-Data, Storytelling-Info und Status
         """
         logger.info("🚀 Starte Multi-Agent System mit Storytelling und Bildgenerierung")
+        return await self._arun_pipeline(topic, auto_post, deadline=deadline)
+    
+    def create_batch(self, topics: Optional[List[str]] = None, workers: int = 4) -> List[Dict]:
+        """
+        Erstellt viele Post-Previews in einem Aufruf (z.B. Redaktionsplanung für eine Woche)
         
-        try:
-            # Schritt 1: Recherche (untersucht invory.de und einvoicehub.de + News + Countdown)
-            logger.info("📚 Schritt 1: Erweiterte Recherche durch Research Agent")
-            research_data = self.research_agent.research_xrechnung_topic(topic)
-            
-            # Schritt 2: Bildgenerierung (falls aktiviert)
-            image_data = None
-            if self.include_images:
-                logger.info("🎨 Schritt 2a: Bildgenerierung durch Image Agent")
-                try:
-                    # Lazy loading des Image Agents
-                    if self.image_agent is None:
-                        from agents.image_agent import ImageAgent
-                        self.image_agent = ImageAgent()
-                    
-                    # Erstelle temporäre Content-Daten für Bildgenerierung
-                    temp_content_data = {
-                        "topic": topic or research_data.get('topic', 'XRechnung'),
-                        "post_content": "Placeholder für Bildgenerierung",
-                        "countdown_data": research_data.get('countdown_data', {}),
-                        "news_data": research_data.get('news_data', {})
-                    }
-                    image_data = self.image_agent.generate_image_for_post(temp_content_data)
-                    if image_data:
-                        logger.info(f"✅ Bild generiert: {image_data.get('theme', 'Unknown theme')}")
-                except Exception as e:
-                    logger.error(f"❌ Bildgenerierung fehlgeschlagen: {str(e)}")
-                    image_data = None
-            
-            # Schritt 3: Storytelling Content-Erstellung
-            logger.info("📖 Schritt 3: Storytelling Content-Erstellung durch Content Agent")
-            post_result = self.content_agent.create_storytelling_post(research_data, image_data)
+        Synchroner Wrapper um acreate_batch.
+        
+        Args:
+            topics: Optional - Liste von Themen (Standard: XRECHNUNG_TOPICS)
+            workers: Maximale Anzahl parallel bearbeiteter Themen
             
-            post_text = post_result["post_content"]
-            storytelling_structure = post_result["storytelling_structure"]
+        Returns:
+            list: Ein Ergebnis-Dict pro Thema (wie create_post_preview), in Themen-Reihenfolge
+        """
+        return self._run_sync(self.acreate_batch(topics, workers))
+    
+    async def acreate_batch(self, topics: Optional[List[str]] = None, workers: int = 4) -> List[Dict]:
+        """
+        Async-Variante von create_batch
+        
+        Scraping von invory.de/einvoicehub.de sowie News und Countdown werden nur
+        einmal abgerufen und von allen Themen geteilt. Content, Bild und Review pro
+        Thema laufen mit begrenzter Parallelität und denselben Agents.
+        
+        Args:
+            topics: Optional - Liste von Themen (Standard: XRECHNUNG_TOPICS)
+            workers: Maximale Anzahl parallel bearbeiteter Themen
             
-            # Schritt 4: Review (Text + Bild)
-            logger.info("🔍 Schritt 4: Review durch Review Agent (Text + Bild)")
-            review_result = self.review_agent.review_post(post_text, research_data, image_data)
+        Returns:
+            list: Ein Ergebnis-Dict pro Thema, in Themen-Reihenfolge
+        """
+        topics = list(topics) if topics else self.get_available_topics()
+        logger.info(f"📦 Starte Batch-Erstellung für {len(topics)} Themen mit {workers} Workern")
+        
+        # Gemeinsame Recherche-Quellen einmalig abrufen
+        sources = await self.research_agent.agather_sources()
+        semaphore = asyncio.Semaphore(max(1, workers))
+        
+        async def create_preview(topic: str) -> Dict:
+            async with semaphore:
+                logger.info(f"📦 Batch-Preview: {topic}")
+                return await self._arun_pipeline(topic, auto_post=False, sources=sources)
+        
+        results = await asyncio.gather(*(create_preview(topic) for topic in topics))
+        
+        successful = sum(1 for result in results if result.get("success"))
+        logger.info(f"📦 Batch abgeschlossen: {successful}/{len(topics)} Previews erstellt")
+        return list(results)
+    
+    def resume(self, run_id: str, deadline: Union[datetime, str, None] = None) -> Dict:
+        """
+        Setzt einen abgebrochenen Post-Lauf ab der ersten unvollständigen Stufe fort
+        
+        Synchroner Wrapper um aresume.
+        
+        Args:
+            run_id: Run-ID aus einem früheren create_and_post-Ergebnis
+            deadline: Optional - spätester Zeitpunkt (datetime oder "HH:MM" heute)
             
-            # Sammle AI-Provider-Informationen für Tracking
-            research_model = get_research_model()
-            review_model = get_review_model()
+        Returns:
+            dict: Ergebnis wie bei create_and_post
+        """
+        return self._run_sync(self.aresume(run_id, deadline))
+    
+    async def aresume(self, run_id: str, deadline: Union[datetime, str, None] = None) -> Dict:
+        """
+        Async-Variante von resume
+        
+        Recherche, Bild, Content und Review werden aus den Checkpoints geladen -
+        nach einem fehlgeschlagenen LinkedIn-Call kostet der Retry nur noch das Posting.
+        
+        Args:
+            run_id: Run-ID aus einem früheren create_and_post-Ergebnis
+            deadline: Optional - spätester Zeitpunkt (datetime oder "HH:MM" heute)
             
-            # Schritt 5: Post verbessern falls nötig
-            if not review_result["approved"]:
-                logger.info("🔧 Schritt 5: Post wird verbessert")
-                post_text = self.review_agent.improve_post(post_text, review_result)
-                # Erneutes Review mit Bild-Daten
-                review_result = self.review_agent.review_post(post_text, research_data, image_data)
-                # Update post_result mit verbessertem Text
-                post_result["post_content"] = post_text
-            
-            # Schritt 6: Optional - Post auf LinkedIn mit Bild
-            post_status = None
-            if auto_post and review_result["approved"]:
-                logger.info("📤 Schritt 6: Posting auf LinkedIn mit optionalem Bild")
-                
-                # Post mit Bild falls vorhanden
-                if image_data and image_data.get("image_url"):
-                    post_status = self.linkedin_client.create_post(
-                        text=post_text,
-                        image_url=image_data["image_url"]
-                    )
-                    if post_status:
-                        logger.info("✅ Post mit Bild erfolgreich auf LinkedIn gepostet")
-                else:
-                    post_status = self.linkedin_client.create_post(post_text)
-                    if post_status:
-                        logger.info("✅ Text-Post erfolgreich auf LinkedIn gepostet")
-                        
-            elif auto_post and not review_result["approved"]:
-                logger.warning("❌ Post wurde nicht genehmigt und wird nicht gepostet")
-            
-            # Post-Tracking hinzufügen
-            linkedin_post_id = None
-            linkedin_posted = False
-            if post_status:
-                # LinkedIn Client kann verschiedene Formate zurückgeben
-                if isinstance(post_status, dict):
-                    linkedin_post_id = post_status.get('post_id') or post_status.get('id')
-                    linkedin_posted = linkedin_post_id is not None
-                elif isinstance(post_status, str):
-                    linkedin_post_id = post_status
-                    linkedin_posted = True
-                else:
-                    linkedin_posted = bool(post_status)
-            
-            mode = "post" if auto_post else "preview"
-            
-            # Erstelle Post-Tracking Entry
-            tracking_entry = post_tracker.add_post(
-                topic=topic or "XRechnung Post",
-                post_text=post_text,
-                storytelling_structure=storytelling_structure,
-                research_model=research_model,
-                review_model=review_model,
-                review_score=review_result["score"],
-                image_theme=image_data.get('theme') if image_data else None,
-                image_url=image_data.get('url') if image_data else None,
-                linkedin_post_id=linkedin_post_id,
-                mode=mode
-            )
-            
-            # Update tracking entry mit LinkedIn Status
-            if linkedin_posted:
-                # Aktualisiere Post-Status in der Historie
-                for post in post_tracker.history:
-                    if post["id"] == tracking_entry["id"]:
-                        post["linkedin"]["posted"] = True
-                        post["linkedin"]["post_id"] = linkedin_post_id
-                        break
-                post_tracker._save_history()
-            
-            # Extrahiere Daten für Rückgabe
-            invory_data = research_data.get('invory_data', {})
-            einvoicehub_data = research_data.get('einvoicehub_data', {})
-            
-            result = {
+        Returns:
+            dict: Ergebnis wie bei create_and_post
+        """
+        meta = self.checkpoints.load_run(run_id)
+        if not meta:
+            logger.error(f"❌ Unbekannter Pipeline-Lauf: {run_id}")
+            return {
+                "success": False,
+                "error": f"Unbekannter Pipeline-Lauf: {run_id}",
+                "post_text": None
+            }
+        
+        logger.info(f"🔁 Setze Pipeline-Lauf {run_id} fort")
+        return await self._arun_pipeline(meta.get("topic"), meta.get("auto_post", False), run_id=run_id,
+                                        deadline=deadline)
+    
+    def prefetch(self, topic: Optional[str] = None, deadline: Union[datetime, str, None] = None) -> Dict:
+        """
+        Bereitet einen Post vor, ohne ihn zu veröffentlichen (Scheduler: PREFETCH_LEAD_MINUTES vor der Post-Zeit)
+        
+        Synchroner Wrapper um aprefetch.
+        
+        Args:
+            topic: Optional - spezifisches XRechnung-Thema
+            deadline: Optional - spätester Zeitpunkt (datetime oder "HH:MM" heute)
+            
+        Returns:
+            dict: success, run_id des vorbereiteten Laufs, post_text und Review-Ergebnis
+        """
+        return self._run_sync(self.aprefetch(topic, deadline))
+    
+    async def aprefetch(self, topic: Optional[str] = None, deadline: Union[datetime, str, None] = None) -> Dict:
+        """
+        Async-Variante von prefetch
+        
+        Recherche, Bild, Content und Review laufen als gecheckpointeter Post-Lauf
+        bis einschließlich "review". Die Versionen der Quellen werden im Lauf
+        gespeichert, damit publish_staged geänderte Quellen erkennt.
+        
+        Args:
+            topic: Optional - spezifisches XRechnung-Thema
+            deadline: Optional - spätester Zeitpunkt (datetime oder "HH:MM" heute)
+            
+        Returns:
+            dict: success, run_id des vorbereiteten Laufs, post_text und Review-Ergebnis
+        """
+        logger.info("🗂️ Bereite Post vor (Veröffentlichung folgt zur Post-Zeit)")
+        try:
+            # Quellen selbst abrufen statt aus dem Recherche-Cache - ihre Versionen sind die Referenz für die Prüfung
+            sources = await self.research_agent.agather_sources()
+            pipeline = self._build_pipeline(topic, True, sources)
+            
+            self.checkpoints.prune(PIPELINE_RUNS_RETENTION_DAYS)
+            run_id = self.checkpoints.create_run({"topic": topic, "auto_post": True, "staged": True,
+                                                  "source_versions": source_versions(sources)})
+            stage_results = await pipeline.arun(
+                on_stage_complete=lambda stage, output: self._checkpoint_stage(run_id, stage, output),
+                deadline=self._resolve_deadline(deadline), targets=["review"])
+            
+            review = stage_results["review"]
+            logger.info(f"🗂️ Post vorbereitet (Lauf {run_id}, Score {review['review_result']['score']})")
+            return {
                 "success": True,
-                "post_data": post_result,  # Komplette Post-Daten mit Storytelling-Info
-                "post_text": post_text,
-                "storytelling_structure": storytelling_structure,
-                "image_data": image_data,
-                "review_score": review_result["score"],
-                "review_approved": review_result["approved"],
-                "research_data": research_data,
-                "invory_data": invory_data,
-                "einvoicehub_data": einvoicehub_data,
-                "post_status": post_status,
-                "linkedin_posted": auto_post and review_result["approved"] and post_status is not None,
-                "includes_image": image_data is not None,
-                "character_count": len(post_text)
+                "run_id": run_id,
+                "staged": True,
+                "post_text": review["post_text"],
+                "review_score": review["review_result"]["score"],
+                "review_approved": review["review_result"]["approved"],
+                "includes_image": stage_results["image"] is not None,
+                "stage_timings": pipeline.durations(),
+                "degradations": list(pipeline.degradations)
             }
+        except Exception as e:
+            logger.error(f"Fehler bei der Post-Vorbereitung: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "post_text": None
+            }
+    
+    def latest_staged_run(self, max_age_minutes: float) -> Optional[str]:
+        """
+        Sucht den neuesten offenen, mit prefetch vorbereiteten Post in den Checkpoints
+        
+        Die Run-ID kommt von der Platte statt aus dem Speicher - ein Neustart zwischen
+        Vorbereitung und Post-Zeit (z.B. Railway-Redeploy) verwirft den Entwurf nicht.
+        Ältere oder überholte offene Vorbereitungen werden abgeschlossen, damit kein
+        veralteter Entwurf später veröffentlicht wird.
+        
+        Args:
+            max_age_minutes: Höchstalter der Vorbereitung in Minuten
+            
+        Returns:
+            str: Run-ID oder None, wenn kein aktueller vorbereiteter Post existiert
+        """
+        cutoff = (datetime.now() - timedelta(minutes=max_age_minutes)).isoformat()
+        latest = None
+        # list_runs liefert die neuesten Läufe zuerst
+        for meta in self.checkpoints.list_runs():
+            if not meta.get("staged"):
+                continue
+            if latest is None and meta.get("created", "") >= cutoff:
+                latest = meta["run_id"]
+            else:
+                logger.info(f"🗑️ Verwerfe veralteten vorbereiteten Post {meta['run_id']}")
+                self.checkpoints.mark_completed(meta["run_id"], discarded=True)
+        return latest
+    
+    def publish_staged(self, run_id: str, deadline: Union[datetime, str, None] = None) -> Dict:
+        """
+        Veröffentlicht einen mit prefetch vorbereiteten Post
+        
+        Synchroner Wrapper um apublish_staged.
+        
+        Args:
+            run_id: Run-ID aus dem prefetch-Ergebnis
+            deadline: Optional - spätester Zeitpunkt (datetime oder "HH:MM" heute)
+            
+        Returns:
+            dict: Ergebnis wie bei create_and_post
+        """
+        return self._run_sync(self.apublish_staged(run_id, deadline))
+    
+    async def apublish_staged(self, run_id: str, deadline: Union[datetime, str, None] = None) -> Dict:
+        """
+        Async-Variante von publish_staged
+        
+        Die Quellen werden mit kurzem Budget (PREFETCH_CHECK_BUDGET, per Conditional GET
+        meist nur 304er) erneut abgerufen. Sind sie unverändert, bleiben nur Bild-Upload
+        und Posting; hat sich eine Quelle geändert, wird der vorbereitete Entwurf verworfen
+        und der Post aus den neuen Quellen komplett erstellt.
+        
+        Args:
+            run_id: Run-ID aus dem prefetch-Ergebnis
+            deadline: Optional - spätester Zeitpunkt (datetime oder "HH:MM" heute)
             
-            logger.info(f"Post-Erstellung abgeschlossen. Score: {review_result['score']}")
+        Returns:
+            dict: Ergebnis wie bei create_and_post
+        """
+        meta = self.checkpoints.load_run(run_id)
+        if not meta or not meta.get("staged") or meta.get("completed"):
+            logger.warning(f"⚠️ Kein offener vorbereiteter Post {run_id} - erstelle den Post komplett")
+            return await self.acreate_and_post((meta or {}).get("topic"), auto_post=True, deadline=deadline)
+        
+        sources = await self.research_agent.agather_sources(time_budget=PREFETCH_CHECK_BUDGET)
+        changed = changed_sources(meta.get("source_versions", {}), sources)
+        if changed:
+            logger.info(f"🔄 Quellen seit der Vorbereitung geändert ({', '.join(changed)}) - verwerfe Entwurf {run_id}")
+            self.checkpoints.mark_completed(run_id, invalidated=changed)
+            return await self._arun_pipeline(meta.get("topic"), True, sources=sources, deadline=deadline)
+        
+        logger.info(f"📦 Vorbereiteter Post {run_id} ist aktuell - nur noch Upload und Posting")
+        return await self.aresume(run_id, deadline)
+    
+    async def _arun_pipeline(self, topic: Optional[str], auto_post: bool, sources: Optional[Dict] = None,
+                             run_id: Optional[str] = None, deadline: Union[datetime, str, None] = None) -> Dict:
+        """
+        Führt die Stage-Pipeline aus und fängt Fehler als Ergebnis-Dict ab
+        
+        Post-Läufe (auto_post) werden stufenweise gecheckpointet; mit run_id
+        werden vorhandene Checkpoints geladen statt neu berechnet.
+        """
+        try:
+            pipeline = self._build_pipeline(topic, auto_post, sources)
+            
+            completed_stages = {}
+            if run_id:
+                completed_stages = pipeline.resumable(self.checkpoints.load_stages(run_id, list(pipeline.stages)))
+                logger.info(f"♻️ Übernehme Stufen aus Checkpoint: {', '.join(completed_stages) or '-'}")
+            elif auto_post:
+                self.checkpoints.prune(PIPELINE_RUNS_RETENTION_DAYS)
+                run_id = self.checkpoints.create_run({"topic": topic, "auto_post": auto_post})
+            
+            on_stage_complete = (lambda stage, output: self._checkpoint_stage(run_id, stage, output)) if run_id else None
+            stage_results = await pipeline.arun(completed_stages, on_stage_complete=on_stage_complete,
+                                                deadline=self._resolve_deadline(deadline))
+            
+            if run_id and not self._post_failed(stage_results["post"]):
+                self.checkpoints.mark_completed(run_id)
+            
+            result = self._build_result(stage_results, auto_post, pipeline)
+            result["run_id"] = run_id
             return result
             
         except Exception as e:
@@ -192,6 +461,361 @@ class LinkedInPostMultiAgentSystem:
                 "post_text": None
             }
     
+    def _checkpoint_stage(self, run_id: str, stage: str, output):
+        """Speichert ein Stufenergebnis - ein fehlgeschlagenes Posting bleibt offen für resume()"""
+        if stage == "post" and self._post_failed(output):
+            logger.warning(f"⚠️ LinkedIn-Posting fehlgeschlagen - Retry ohne Neugenerierung: resume('{run_id}')")
+            return
+        self.checkpoints.save_stage(run_id, stage, output)
+    
+    @staticmethod
+    def _resolve_deadline(deadline: Union[datetime, str, None]) -> Optional[float]:
+        """Wandelt eine Deadline (datetime oder "HH:MM" heute) in einen Unix-Zeitstempel um"""
+        if deadline is None:
+            return None
+        if isinstance(deadline, str):
+            hour, minute = map(int, deadline.split(':'))
+            deadline = datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if deadline <= datetime.now():
+            logger.warning(f"⚠️ Deadline {deadline.strftime('%H:%M')} ist bereits überschritten - alle Stufen nutzen Fallbacks")
+        else:
+            logger.info(f"⏰ Deadline: {deadline.strftime('%H:%M:%S')}")
+        return deadline.timestamp()
+    
+    @staticmethod
+    def _post_failed(post_output: Dict) -> bool:
+        """True, wenn ein Posting versucht wurde, aber kein Ergebnis lieferte"""
+        return post_output["attempted"] and not post_output["status"]
+    
+    def _build_pipeline(self, topic: Optional[str], auto_post: bool, sources: Optional[Dict] = None) -> StagePipeline:
+        """
+        Baut die Stage-Pipeline für einen Post
+        
+        research → (image ∥ content) → review → post → history
+        
+        Bei DRAFT_CANDIDATES > 1 entwirft "content" mehrere Storytelling-Varianten
+        parallel, "review" bewertet sie parallel und wählt die beste.
+        
+        Recherche und Bild haben Zeitbudgets mit Fallback; Content, Review, Posting
+        und Historie laufen ohne Zeitgrenze (es gibt keinen sinnvollen Ersatz).
+        """
+        pipeline = StagePipeline("create_and_post")
+        pipeline.add_stage("research", partial(self._stage_research, topic=topic, sources=sources, pipeline=pipeline),
+                           timeout=STAGE_TIME_BUDGETS.get("research"),
+                           fallback=partial(self._fallback_research, topic=topic),
+                           fallback_note="Mock-Daten aller Quellen")
+        # Bild-Fallback: Preview zeigt ein Mock-Bild, ein echter Post geht ohne Bild raus
+        pipeline.add_stage("image", partial(self._stage_image, topic=topic, auto_post=auto_post), depends_on=["research"],
+                           timeout=STAGE_TIME_BUDGETS.get("image"),
+                           fallback=(lambda results: None) if auto_post else partial(self._fallback_image, topic=topic),
+                           fallback_note="Text-only Post" if auto_post else "Mock-Bild")
+        pipeline.add_stage("content", self._stage_content, depends_on=["research"])
+        pipeline.add_stage("review", partial(self._stage_review, auto_post=auto_post, pipeline=pipeline),
+                           depends_on=["content", "image"])
+        pipeline.add_stage("post", partial(self._stage_post, auto_post=auto_post), depends_on=["review"])
+        pipeline.add_stage("history", partial(self._stage_history, topic=topic, auto_post=auto_post, pipeline=pipeline),
+                           depends_on=["post"])
+        return pipeline
+    
+    async def _stage_research(self, results: Dict, topic: Optional[str], sources: Optional[Dict],
+                              pipeline: StagePipeline) -> Dict:
+        """Schritt 1: Recherche (untersucht invory.de und einvoicehub.de + News + Countdown)"""
+        logger.info("📚 Schritt 1: Erweiterte Recherche durch Research Agent")
+        research_data = await self.research_agent.aresearch_xrechnung_topic(topic, sources=sources)
+        
+        # Einzelne Quellen, die ihr Recherche-Budget überschritten haben, als Herabstufung vermerken
+        for name, data in research_data.items():
+            if isinstance(data, dict) and data.get("fallback"):
+                pipeline.degrade("research", f"Quelle '{name}' nicht rechtzeitig verfügbar", "Fallback-Daten")
+        return research_data
+    
+    def _fallback_research(self, results: Dict, topic: Optional[str]) -> Dict:
+        """Fallback der Recherche-Stufe: Recherche ausschließlich aus Mock-Daten"""
+        return self.research_agent.research_xrechnung_topic(topic, sources=self.research_agent.fallback_sources())
+    
+    def _image_content_data(self, results: Dict, topic: Optional[str]) -> Dict:
+        """Temporäre Content-Daten für die Bildgenerierung (Bild braucht nur Thema, Countdown und News)"""
+        research_data = results["research"]
+        return {
+            "topic": topic or research_data.get('topic', 'XRechnung'),
+            "post_content": "Placeholder für Bildgenerierung",
+            "countdown_data": research_data.get('countdown_data', {}),
+            "news_data": research_data.get('news_data', {})
+        }
+    
+    async def _stage_image(self, results: Dict, topic: Optional[str], auto_post: bool = False) -> Optional[Dict]:
+        """Schritt 2: Bildgenerierung (falls aktiviert) - Previews spielen gleiche DALL-E-Prompts aus dem Modell-Cache ab"""
+        if not self.include_images:
+            return None
+        
+        logger.info("🎨 Schritt 2: Bildgenerierung durch Image Agent")
+        try:
+            image_data = await self.image_agent.agenerate_image_for_post(self._image_content_data(results, topic),
+                                                                       use_cache=not auto_post)
+            if image_data:
+                logger.info(f"✅ Bild generiert: {image_data.get('theme', 'Unknown theme')}")
+            return image_data
+        except Exception as e:
+            logger.error(f"❌ Bildgenerierung fehlgeschlagen: {str(e)}")
+            return None
+    
+    def _fallback_image(self, results: Dict, topic: Optional[str]) -> Optional[Dict]:
+        """Fallback der Bild-Stufe im Preview: Mock-Bild statt DALL-E"""
+        if not self.include_images:
+            return None
+        return self.image_agent._get_mock_image_data(self._image_content_data(results, topic))
+    
+    async def _stage_content(self, results: Dict) -> Dict:
+        """Schritt 3: Storytelling Content-Erstellung (unabhängig vom Bild), ggf. mehrere Entwürfe parallel"""
+        research_data = results["research"]
+        recent_structures = None
+        if research_data.get("no_new_source_material"):
+            recent_structures = self.history_tracker.get_recent_structures(days=30)
+        structures = self.content_agent.select_candidate_structures(research_data, DRAFT_CANDIDATES, recent_structures)
+        
+        if len(structures) > 1:
+            logger.info(f"📖 Schritt 3: {len(structures)} Entwürfe parallel ({', '.join(s['name'] for s in structures)})")
+        else:
+            logger.info("📖 Schritt 3: Storytelling Content-Erstellung durch Content Agent")
+        
+        drafts = await asyncio.gather(*(
+            asyncio.to_thread(self.content_agent.create_storytelling_post, research_data, structure=structure)
+            for structure in structures
+        ))
+        return {"drafts": list(drafts)}
+    
+    async def _stage_review(self, results: Dict, auto_post: bool = False,
+                            pipeline: Optional[StagePipeline] = None) -> Dict:
+        """
+        Schritt 4+5: Review (Text + Bild) aller Entwürfe parallel und Auswahl des besten
+        
+        Genehmigte Entwürfe gewinnen vor abgelehnten, danach entscheidet der Review-Score;
+        bei Gleichstand bleibt die automatisch gewählte Struktur. Die übrigen Entwürfe
+        landen im Draft-Inventar.
+        
+        Vor dem Posten (auto_post) werden Entwürfe, die einen früheren Post fast
+        wiederholen, zurückgestellt; gibt es keinen genehmigten neuen Entwurf, werden
+        die übrigen Storytelling-Strukturen nacheinander entworfen.
+        """
+        research_data = results["research"]
+        image_data = results["image"]
+        drafts = results["content"]["drafts"]
+        
+        logger.info("🔍 Schritt 4: Review durch Review Agent (Text + Bild)")
+        reviewed = list(await asyncio.gather(*(
+            asyncio.to_thread(self._review_draft, draft, research_data, image_data) for draft in drafts
+        )))
+        
+        check_duplicates = auto_post and DUPLICATE_CHECK_ENABLED
+        if check_duplicates:
+            await self._avoid_near_duplicates(reviewed, research_data, image_data)
+        
+        best = max(reviewed, key=lambda r: (r["review_result"]["approved"], not r.get("near_duplicate"),
+                                            r["review_result"]["score"]))
+        if check_duplicates and best.get("near_duplicate"):
+            similar = best["near_duplicate"]
+            reason = f"Alle Entwürfe ähneln früheren Posts (Post #{similar['post_id']} vom {similar['date']}: {similar['similarity']:.0%})"
+            if pipeline is not None:
+                pipeline.degrade("review", reason, "Bester Entwurf trotzdem")
+            else:
+                logger.warning(f"⚠️ {reason}")
+        candidates = [self._draft_summary(r) for r in reviewed]
+        losers = [r for r in reviewed if r is not best]
+        if losers:
+            logger.info(f"🏆 Bester Entwurf: {best['post_data']['storytelling_structure']['name']} "
+                        f"(Score {best['review_result']['score']} von {[c['review_score'] for c in candidates]})")
+            draft_inventory.add_drafts(research_data.get("topic", "XRechnung"),
+                                       [{**self._draft_summary(r), "post_text": r["post_text"]} for r in losers])
+        
+        return {**best, "candidates": candidates}
+    
+    async def _avoid_near_duplicates(self, reviewed: List[Dict], research_data: Dict, image_data: Optional[Dict]):
+        """
+        Markiert Entwürfe, die einen früheren Post fast wiederholen (near_duplicate), und entwirft
+        weitere Storytelling-Strukturen, solange alle genehmigten Entwürfe frühere Posts wiederholen
+        (ohne genehmigten Entwurf entscheidet das Review, nicht die Duplikat-Prüfung)
+        """
+        for draft in reviewed:
+            draft["near_duplicate"] = self.history_tracker.find_similar(draft["post_text"])
+        
+        tried = {draft["post_data"]["storytelling_structure"]["name"] for draft in reviewed}
+        recent_structures = self.history_tracker.get_recent_structures(days=30)
+        remaining = [structure for structure in self.content_agent.select_candidate_structures(
+                         research_data, len(STORYTELLING_STRUCTURES), recent_structures)
+                     if structure["name"] not in tried]
+        
+        while remaining:
+            approved = [draft for draft in reviewed if draft["review_result"]["approved"]]
+            if not approved or not all(draft["near_duplicate"] for draft in approved):
+                break
+            similar = next((draft["near_duplicate"] for draft in approved if draft["near_duplicate"]), None)
+            structure = remaining.pop(0)
+            logger.info(f"♻️ Entwurf ähnelt Post #{similar['post_id']} ({similar['similarity']:.0%}) - "
+                        f"neuer Entwurf mit {structure['name']}")
+            draft = await asyncio.to_thread(self.content_agent.create_storytelling_post, research_data,
+                                            structure=structure)
+            checked = await asyncio.to_thread(self._review_draft, draft, research_data, image_data)
+            checked["near_duplicate"] = self.history_tracker.find_similar(checked["post_text"])
+            reviewed.append(checked)
+    
+    def _review_draft(self, post_result: Dict, research_data: Dict, image_data: Optional[Dict]) -> Dict:
+        """Reviewt einen Entwurf und verbessert ihn, falls er nicht genehmigt wird"""
+        post_result["image_data"] = image_data
+        post_text = post_result["post_content"]
+        
+        review_result = self.review_agent.review_post(post_text, research_data, image_data)
+        
+        if not review_result["approved"]:
+            logger.info("🔧 Schritt 5: Post wird verbessert")
+            with span("review.improve"):
+                post_text = self.review_agent.improve_post(post_text, review_result)
+                # Erneutes Review mit Bild-Daten
+                review_result = self.review_agent.review_post(post_text, research_data, image_data)
+            # Update post_result mit verbessertem Text
+            post_result["post_content"] = post_text
+        
+        return {
+            "post_text": post_text,
+            "review_result": review_result,
+            "post_data": post_result
+        }
+    
+    @staticmethod
+    def _draft_summary(reviewed: Dict) -> Dict:
+        return {
+            "storytelling_structure": reviewed["post_data"]["storytelling_structure"]["name"],
+            "review_score": reviewed["review_result"]["score"],
+            "near_duplicate": reviewed.get("near_duplicate")
+        }
+    
+    async def _stage_post(self, results: Dict, auto_post: bool) -> Dict:
+        """
+        Schritt 6: Optional - Post auf LinkedIn mit Bild
+        
+        Returns:
+            dict: attempted (Posting versucht) und status (Antwort des LinkedIn Clients)
+        """
+        image_data = results["image"]
+        post_text = results["review"]["post_text"]
+        review_result = results["review"]["review_result"]
+        
+        post_status = None
+        if auto_post and review_result["approved"]:
+            logger.info("📤 Schritt 6: Posting auf LinkedIn mit optionalem Bild")
+            
+            # Post mit Bild falls vorhanden
+            if image_data and image_data.get("image_url"):
+                post_status = await self.linkedin_client.acreate_post(
+                    text=post_text,
+                    image_url=image_data["image_url"]
+                )
+                if post_status:
+                    logger.info("✅ Post mit Bild erfolgreich auf LinkedIn gepostet")
+            else:
+                post_status = await self.linkedin_client.acreate_post(post_text)
+                if post_status:
+                    logger.info("✅ Text-Post erfolgreich auf LinkedIn gepostet")
+                    
+        elif auto_post and not review_result["approved"]:
+            logger.warning("❌ Post wurde nicht genehmigt und wird nicht gepostet")
+        
+        return {
+            "attempted": auto_post and review_result["approved"],
+            "status": post_status
+        }
+    
+    def _stage_history(self, results: Dict, topic: Optional[str], auto_post: bool,
+                       pipeline: StagePipeline) -> Dict:
+        """
+        Schritt 7: Post-Tracking hinzufügen (inkl. Stufenzeiten bis einschließlich Posting und Herabstufungen)
+
+        Nach einem fehlgeschlagenen Posting wird nichts eingetragen: resume() führt Posting und
+        Historie erneut aus, sonst stünde ein Lauf doppelt in der Historie (Latenzen, Near-Duplicates).
+        """
+        if self._post_failed(results["post"]):
+            logger.info("⏸️ Historien-Eintrag folgt nach erfolgreichem resume()")
+            return None
+
+        image_data = results["image"]
+        post_text = results["review"]["post_text"]
+        review_result = results["review"]["review_result"]
+        post_status = results["post"]["status"]
+        
+        # Sammle AI-Provider-Informationen für Tracking
+        research_model = get_research_model()
+        review_model = get_review_model()
+        
+        linkedin_post_id = None
+        linkedin_posted = False
+        if post_status:
+            # LinkedIn Client kann verschiedene Formate zurückgeben
+            if isinstance(post_status, dict):
+                linkedin_post_id = post_status.get('post_id') or post_status.get('id')
+                linkedin_posted = linkedin_post_id is not None
+            elif isinstance(post_status, str):
+                linkedin_post_id = post_status
+                linkedin_posted = True
+            else:
+                linkedin_posted = bool(post_status)
+        
+        mode = "post" if auto_post else "preview"
+        
+        # Erstelle Post-Tracking Entry
+        tracking_entry = self.history_tracker.add_post(
+            topic=topic or "XRechnung Post",
+            post_text=post_text,
+            storytelling_structure=results["review"]["post_data"]["storytelling_structure"],
+            research_model=research_model,
+            review_model=review_model,
+            review_score=review_result["score"],
+            image_theme=image_data.get('theme') if image_data else None,
+            image_url=image_data.get('url') if image_data else None,
+            linkedin_post_id=linkedin_post_id,
+            linkedin_posted=linkedin_posted,
+            mode=mode,
+            stage_timings=pipeline.durations(),
+            degradations=list(pipeline.degradations)
+        )
+        
+        return tracking_entry
+    
+    def _build_result(self, stage_results: Dict, auto_post: bool, pipeline: StagePipeline) -> Dict:
+        """Fasst die Stufenergebnisse zum Rückgabe-Dict zusammen"""
+        research_data = stage_results["research"]
+        image_data = stage_results["image"]
+        post_result = stage_results["review"]["post_data"]
+        post_text = stage_results["review"]["post_text"]
+        review_result = stage_results["review"]["review_result"]
+        post_status = stage_results["post"]["status"]
+        
+        # Extrahiere Daten für Rückgabe
+        invory_data = research_data.get('invory_data', {})
+        einvoicehub_data = research_data.get('einvoicehub_data', {})
+        
+        result = {
+            "success": True,
+            "post_data": post_result,  # Komplette Post-Daten mit Storytelling-Info
+            "post_text": post_text,
+            "storytelling_structure": post_result["storytelling_structure"],
+            "image_data": image_data,
+            "review_score": review_result["score"],
+            "review_approved": review_result["approved"],
+            "research_data": research_data,
+            "invory_data": invory_data,
+            "einvoicehub_data": einvoicehub_data,
+            "post_status": post_status,
+            "linkedin_posted": auto_post and review_result["approved"] and post_status is not None,
+            "includes_image": image_data is not None,
+            "character_count": len(post_text),
+            "draft_candidates": stage_results["review"]["candidates"],
+            "near_duplicate": stage_results["review"].get("near_duplicate"),
+            "stage_timings": pipeline.durations(),
+            "degradations": list(pipeline.degradations)
+        }
+        
+        logger.info(f"Post-Erstellung abgeschlossen. Score: {review_result['score']}")
+        return result
+    
     def create_post_preview(self, topic: Optional[str] = None) -> Dict:
         """
         Erstellt einen Post-Preview ohne zu posten
@@ -214,3 +838,26 @@ class LinkedInPostMultiAgentSystem:
         from config import XRECHNUNG_TOPICS
         return XRECHNUNG_TOPICS
 
+
+_shared_system: Optional[LinkedInPostMultiAgentSystem] = None
+_shared_system_lock = threading.Lock()
+
+
+def get_shared_system() -> LinkedInPostMultiAgentSystem:
+    """
+    Gibt die prozessweite System-Instanz zurück (wird beim ersten Aufruf erstellt)
+    
+    Für langlebige Prozesse (Railway Service, Scheduler, warme Lambda-Container):
+    Agents, LinkedIn Client und HTTP-Sessions werden nur einmal aufgebaut und
+    von allen Requests und Scheduler-Läufen geteilt.
+    
+    Returns:
+        LinkedInPostMultiAgentSystem: Geteilte Instanz mit Hintergrund-Event-Loop
+    """
+    global _shared_system
+    if _shared_system is None:
+        with _shared_system_lock:
+            if _shared_system is None:
+                _shared_system = LinkedInPostMultiAgentSystem(background_loop=True)
+                atexit.register(_shared_system.close)
+    return _shared_system
@@ -0,0 +1,143 @@
+"""
+Near-Duplicate Index - erkennt Posts, die einen früheren Post fast wiederholen
+
+Jeder Post wird in Wort-Shingles (SHINGLE_SIZE aufeinanderfolgende Wörter)
+zerlegt und per MinHash auf eine Signatur fester Länge abgebildet; der Anteil
+übereinstimmender Signatur-Werte schätzt die Jaccard-Ähnlichkeit der Shingle-
+Mengen. Locality Sensitive Hashing (Bänder der Signatur als Dict-Schlüssel)
+liefert Kandidaten, ohne die Historie zu durchlaufen - eine Anfrage kostet
+damit auch bei zehntausenden Posts unter einer Millisekunde (Signatur plus
+ein paar Dict-Zugriffe, siehe benchmarks/near_duplicate_benchmark.py).
+
+Die Signaturen werden in der Post-Historie gespeichert (Base64), damit der
+Index beim Start nicht jeden Post neu hashen muss.
+"""
+import base64
+import re
+import threading
+import zlib
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+SHINGLE_SIZE = 3      # Wörter pro Shingle
+NUM_PERM = 128        # Länge der MinHash-Signatur
+BANDS = 32            # LSH-Bänder à NUM_PERM / BANDS Werte: Kandidat ab ~0.4 Ähnlichkeit, ab 0.6 zu ~99%
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_WORD = re.compile(r"\w+")
+
+# Feste Hash-Permutationen - Signaturen bleiben über Prozesse und Neustarts vergleichbar
+_rng = np.random.default_rng(20240601)
+_PERM_A = _rng.integers(1, (1 << 61) - 1, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, (1 << 61) - 1, NUM_PERM, dtype=np.uint64)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Wort-Shingles eines Texts (kleingeschrieben, ohne Satzzeichen und Emojis)"""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[index:index + size]) for index in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """
+    MinHash-Signatur eines Texts
+
+    Args:
+        text: Post-Text
+
+    Returns:
+        np.ndarray: NUM_PERM uint32-Werte (leerer Text: alle Werte maximal)
+    """
+    hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(text)), dtype=np.uint64)
+    if not hashes.size:
+        return np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint32)
+    # (a·h + b) mod p für alle Permutationen und Shingles auf einmal, Minimum je Permutation. a und b
+    # decken den ganzen Bereich bis p ab; das Produkt läuft dabei modulo 2^64 über (wie in datasketch) -
+    # mit kleinen Faktoren wäre die Abbildung für kleine h monoton und damit keine Permutation
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return (permuted.min(axis=1) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+
+def encode_signature(signature: np.ndarray) -> str:
+    """Signatur als Base64-Text (für die Post-Historie)"""
+    return base64.b64encode(signature.astype("<u4").tobytes()).decode("ascii")
+
+
+def decode_signature(encoded: str) -> Optional[np.ndarray]:
+    """Signatur aus Base64-Text - None bei fremder Länge (z.B. nach Änderung von NUM_PERM)"""
+    signature = np.frombuffer(base64.b64decode(encoded), dtype="<u4").astype(np.uint32)
+    return signature if signature.size == NUM_PERM else None
+
+
+class NearDuplicateIndex:
+    """MinHash-LSH-Index über Post-Signaturen (thread-sicher)"""
+
+    def __init__(self, bands: int = BANDS):
+        """
+        Args:
+            bands: Anzahl LSH-Bänder (mehr Bänder = mehr Kandidaten bei geringerer Ähnlichkeit)
+        """
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._keys: List[Hashable] = []
+        self._timestamps: List[float] = []
+        self._signatures = np.empty((0, NUM_PERM), dtype=np.uint32)
+        self._pending: List[np.ndarray] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [band.tobytes() for band in signature[:self.bands * self.rows].reshape(self.bands, self.rows)]
+
+    def add(self, key: Hashable, signature: np.ndarray, timestamp: float = 0.0):
+        """
+        Nimmt einen Post in den Index auf
+
+        Args:
+            key: Kennung des Posts (z.B. ID in der Post-Historie)
+            signature: Ergebnis von minhash_signature
+            timestamp: Unix-Zeitstempel des Posts (für Abfragen mit since)
+        """
+        with self._lock:
+            row = len(self._keys)
+            self._keys.append(key)
+            self._timestamps.append(timestamp)
+            self._pending.append(signature)
+            for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+                buckets.setdefault(band_key, []).append(row)
+
+    def query(self, signature: np.ndarray, threshold: float, since: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """
+        Sucht Posts mit geschätzter Ähnlichkeit ab threshold
+
+        Args:
+            signature: Signatur des neuen Posts
+            threshold: Mindest-Ähnlichkeit (geschätzte Jaccard-Ähnlichkeit der Shingles, 0-1)
+            since: Optional - nur Posts ab diesem Unix-Zeitstempel
+
+        Returns:
+            list: (key, Ähnlichkeit), ähnlichste zuerst
+        """
+        with self._lock:
+            candidates = set()
+            for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(buckets.get(band_key, ()))
+            if since is not None:
+                candidates = {row for row in candidates if self._timestamps[row] >= since}
+            if not candidates:
+                return []
+            if self._pending:
+                # Neue Signaturen gesammelt anhängen statt die Matrix bei jedem add zu kopieren
+                self._signatures = np.vstack([self._signatures, np.stack(self._pending)])
+                self._pending = []
+            rows = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+            similarities = (self._signatures[rows] == signature).mean(axis=1)
+            matches = [(self._keys[row], float(similarity)) for row, similarity in zip(rows, similarities)
+                       if similarity >= threshold]
+        return sorted(matches, key=lambda match: match[1], reverse=True)
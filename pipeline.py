@@ -0,0 +1,304 @@
+"""
+Stage-Pipeline - führt Pipeline-Stufen mit deklarierten Abhängigkeiten parallel aus
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import asyncio
+import inspect
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SpanRecorder:
+    """Thread-sichere Sammlung benannter Zeitspannen (Sekunden) eines Pipeline-Laufs"""
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        """Speichert eine Dauer; mehrfach gemessene Spannen werden aufsummiert"""
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+
+# Aktiver Recorder des laufenden Pipeline-Laufs (wird an Worker-Threads weitergereicht)
+_current_spans: ContextVar[Optional[SpanRecorder]] = ContextVar("current_spans", default=None)
+
+
+@contextmanager
+def span(name: str):
+    """
+    Misst einen Abschnitt und speichert ihn im aktiven SpanRecorder
+
+    Ohne aktiven Pipeline-Lauf (z.B. direkter Client-Aufruf) ist span ein No-op.
+
+    Args:
+        name: Name der Zeitspanne, z.B. "linkedin.upload"
+    """
+    recorder = _current_spans.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if recorder is not None:
+            recorder.record(name, time.perf_counter() - start)
+
+
+def submit_with_context(executor: ThreadPoolExecutor, func: Callable, *args):
+    """Übergibt func an den Executor und reicht den aktuellen Kontext (aktive Spans) weiter"""
+    return executor.submit(copy_context().run, func, *args)
+
+
+class PipelineStage:
+    """Eine Stufe der Pipeline mit Funktion und Abhängigkeiten"""
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any], depends_on: Iterable[str] = (),
+                 timeout: Optional[float] = None, fallback: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 fallback_note: str = ""):
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on)
+        self.timeout = timeout
+        self.fallback = fallback
+        self.fallback_note = fallback_note
+        # Async-Stufen laufen direkt im Event Loop, synchrone in einem Worker-Thread
+        self.is_async = inspect.iscoroutinefunction(func)
+
+
+class StagePipeline:
+    """
+    Kleiner DAG-Executor: Stufen, deren Abhängigkeiten erfüllt sind, laufen parallel
+
+    Jede Stufe erhält ein Dict mit den Ergebnissen aller bereits abgeschlossenen
+    Stufen (Schlüssel = Stufenname). Start- und Endzeit jeder Stufe werden erfasst,
+    damit der kritische Pfad im Log sichtbar ist.
+    
+    Stufen können ein Zeitbudget und einen Fallback haben: Überschreitet eine Stufe
+    ihr Budget (oder die Deadline des Laufs), wird sie abgebrochen und der Fallback
+    liefert das Ergebnis. Jede solche Herabstufung landet in degradations.
+
+    Stufen dürfen async (Coroutine-Funktionen) oder synchron sein; viele Pipelines
+    können sich so einen Event Loop teilen, ohne pro Lauf einen Thread zu blockieren.
+    """
+
+    def __init__(self, name: str = "pipeline"):
+        self.name = name
+        self.stages: Dict[str, PipelineStage] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.spans = SpanRecorder()
+        self.degradations: List[Dict[str, Any]] = []
+
+    def add_stage(self, name: str, func: Callable[[Dict[str, Any]], Any], depends_on: Iterable[str] = (),
+                  timeout: Optional[float] = None, fallback: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                  fallback_note: str = "") -> "StagePipeline":
+        """
+        Registriert eine Stufe
+
+        Args:
+            name: Eindeutiger Stufenname
+            func: Funktion oder Coroutine-Funktion, die das Ergebnis-Dict der Vorgänger erhält
+            depends_on: Namen der Stufen, die vorher abgeschlossen sein müssen
+            timeout: Optional - Zeitbudget der Stufe in Sekunden
+            fallback: Optional - synchrone Funktion (Ergebnis-Dict → Ergebnis) bei Überschreitung
+                des Budgets oder der Deadline; ohne Fallback gilt für die Stufe keine Zeitgrenze
+            fallback_note: Beschreibung des Fallbacks für degradations (z.B. "Mock-Bild")
+
+        Returns:
+            StagePipeline: self für Verkettung
+        """
+        if name in self.stages:
+            raise ValueError(f"Stufe '{name}' ist bereits registriert")
+        for dependency in depends_on:
+            if dependency not in self.stages:
+                raise ValueError(f"Stufe '{name}' hängt von unbekannter Stufe '{dependency}' ab")
+        self.stages[name] = PipelineStage(name, func, depends_on, timeout, fallback, fallback_note)
+        return self
+
+    def degrade(self, stage: str, reason: str, fallback: str):
+        """
+        Vermerkt eine Herabstufung (z.B. Fallback-Daten statt Live-Daten)
+
+        Args:
+            stage: Betroffene Stufe
+            reason: Grund, z.B. "Zeitbudget von 45.0s überschritten"
+            fallback: Was stattdessen verwendet wurde
+        """
+        logger.warning(f"⬇️ Stufe '{stage}' herabgestuft: {reason} → {fallback}")
+        self.degradations.append({"stage": stage, "reason": reason, "fallback": fallback})
+
+    def run(self, results: Optional[Dict[str, Any]] = None,
+            on_stage_complete: Optional[Callable[[str, Any], None]] = None,
+            deadline: Optional[float] = None, targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Synchroner Wrapper um arun() mit eigenem Event Loop"""
+        return asyncio.run(self.arun(results, on_stage_complete, deadline, targets))
+
+    async def arun(self, results: Optional[Dict[str, Any]] = None,
+                   on_stage_complete: Optional[Callable[[str, Any], None]] = None,
+                   deadline: Optional[float] = None, targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Führt alle Stufen in Abhängigkeitsreihenfolge aus
+
+        Args:
+            results: Optional - bereits vorhandene Stufenergebnisse (werden nicht erneut ausgeführt)
+            on_stage_complete: Optional - Callback (stufe, ergebnis) nach jeder erfolgreichen Stufe,
+                z.B. zum Checkpointen
+            deadline: Optional - Unix-Zeitstempel, bis zu dem der Lauf fertig sein muss; Stufen mit
+                Fallback erhalten höchstens die verbleibende Zeit als Budget
+            targets: Optional - nur diese Stufen samt ihrer Abhängigkeiten ausführen
+                (z.B. ["review"], um einen Post vorzubereiten, ohne ihn zu veröffentlichen)
+
+        Returns:
+            dict: Ergebnisse aller ausgeführten Stufen
+
+        Raises:
+            Exception: Der erste Fehler einer Stufe; laufende Stufen werden abgebrochen
+        """
+        results = dict(results or {})
+        required = self._required_stages(targets) if targets is not None else set(self.stages)
+        pending = {name: stage for name, stage in self.stages.items() if name not in results and name in required}
+        running: Dict[asyncio.Task, str] = {}
+        self.timings = {}
+        self.spans = SpanRecorder()
+        self.degradations = []
+        started_at = time.perf_counter()
+        token = _current_spans.set(self.spans)
+
+        try:
+            while pending or running:
+                # Starte alle Stufen, deren Abhängigkeiten abgeschlossen sind
+                for name, stage in list(pending.items()):
+                    if all(dependency in results for dependency in stage.depends_on):
+                        del pending[name]
+                        task = asyncio.create_task(self._run_stage(stage, dict(results), started_at, deadline))
+                        running[task] = name
+
+                if not running:
+                    raise RuntimeError(f"Pipeline '{self.name}' blockiert - unerfüllbare Abhängigkeiten: {list(pending)}")
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    results[name] = task.result()
+                    if on_stage_complete:
+                        on_stage_complete(name, results[name])
+        finally:
+            for task in running:
+                task.cancel()
+            _current_spans.reset(token)
+
+        self._log_timings()
+        return results
+
+    def _required_stages(self, targets: Iterable[str]) -> set:
+        """Zielstufen plus alle (transitiven) Abhängigkeiten"""
+        required = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in required:
+                required.add(name)
+                stack.extend(self.stages[name].depends_on)
+        return required
+
+    async def _run_stage(self, stage: PipelineStage, results: Dict[str, Any], started_at: float,
+                         deadline: Optional[float] = None) -> Any:
+        """Führt eine Stufe aus (mit Zeitbudget) und erfasst Start- und Endzeit relativ zum Pipeline-Start"""
+        start = time.perf_counter() - started_at
+        try:
+            timeout = self._stage_timeout(stage, deadline)
+            if timeout is None:
+                return await self._call_stage(stage, results)
+            try:
+                return await asyncio.wait_for(self._call_stage(stage, results), max(0.0, timeout))
+            except asyncio.TimeoutError:
+                reason = (f"Zeitbudget von {stage.timeout:.1f}s überschritten" if timeout == stage.timeout
+                          else "Deadline des Laufs erreicht")
+                self.degrade(stage.name, reason, stage.fallback_note or "Fallback")
+                return stage.fallback(results)
+        finally:
+            end = time.perf_counter() - started_at
+            self.timings[stage.name] = {"start": start, "end": end, "duration": end - start}
+
+    async def _call_stage(self, stage: PipelineStage, results: Dict[str, Any]) -> Any:
+        if stage.is_async:
+            return await stage.func(results)
+        # asyncio.to_thread reicht den Kontext (aktive Spans) an den Thread weiter;
+        # ein abgelaufener Thread läuft im Hintergrund aus, die Pipeline wartet nicht
+        return await asyncio.to_thread(stage.func, results)
+
+    @staticmethod
+    def _stage_timeout(stage: PipelineStage, deadline: Optional[float]) -> Optional[float]:
+        """Effektives Budget: Minimum aus Stufenbudget und Restzeit bis zur Deadline (nur mit Fallback)"""
+        if stage.fallback is None:
+            return None
+        budgets = [stage.timeout] if stage.timeout is not None else []
+        if deadline is not None:
+            budgets.append(deadline - time.time())
+        return min(budgets) if budgets else None
+
+    def resumable(self, outputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Filtert gespeicherte Stufenergebnisse auf die wiederverwendbaren
+
+        Ein Ergebnis ist nur gültig, wenn auch alle Abhängigkeiten gültig sind -
+        fehlt z.B. "post", wird auch ein vorhandenes "history" neu ausgeführt.
+
+        Args:
+            outputs: Stufenname → gespeichertes Ergebnis
+
+        Returns:
+            dict: Wiederverwendbare Ergebnisse
+        """
+        valid = {}
+        # Stufen sind in Registrierungsreihenfolge topologisch sortiert
+        for name, stage in self.stages.items():
+            if name in outputs and all(dependency in valid for dependency in stage.depends_on):
+                valid[name] = outputs[name]
+        return valid
+
+    def durations(self) -> Dict[str, float]:
+        """
+        Dauer aller bisher abgeschlossenen Stufen plus gemessener Unter-Spannen
+
+        Returns:
+            dict: Name → Sekunden (auf Millisekunden gerundet)
+        """
+        durations = {name: timing["duration"] for name, timing in self.timings.items()}
+        durations.update(self.spans.durations)
+        return {name: round(seconds, 3) for name, seconds in durations.items()}
+
+    def critical_path(self) -> List[str]:
+        """
+        Ermittelt den kritischen Pfad anhand der erfassten Zeiten
+
+        Returns:
+            list: Stufennamen vom Start bis zur zuletzt beendeten Stufe
+        """
+        if not self.timings:
+            return []
+
+        path = []
+        current = max(self.timings, key=lambda name: self.timings[name]["end"])
+        while current:
+            path.append(current)
+            # Vorgänger = die Abhängigkeit, die zuletzt fertig wurde
+            dependencies = [d for d in self.stages[current].depends_on if d in self.timings]
+            current = max(dependencies, key=lambda name: self.timings[name]["end"]) if dependencies else None
+
+        return list(reversed(path))
+
+    def _log_timings(self):
+        """Loggt Stufenzeiten und kritischen Pfad"""
+        for name, timing in sorted(self.timings.items(), key=lambda item: item[1]["start"]):
+            logger.info(f"⏱️ Stufe '{name}': {timing['start']:.2f}s → {timing['end']:.2f}s ({timing['duration']:.2f}s)")
+
+        path = self.critical_path()
+        if path:
+            total = self.timings[path[-1]]["end"]
+            logger.info(f"🧭 Kritischer Pfad ({self.name}): {' → '.join(path)} = {total:.2f}s")
@@ -2,10 +2,14 @@
 Post History Tracker - Verfolgt alle LinkedIn Posts mit Details
 """
 import json
+import math
 import os
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
+from config import DUPLICATE_LOOKBACK_DAYS, DUPLICATE_THRESHOLD
+from near_duplicates import NearDuplicateIndex, decode_signature, encode_signature, minhash_signature
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +19,10 @@ class PostHistoryTracker:
     def __init__(self, history_file: str = "post_history.json"):
         self.history_file = history_file
         self.history = self._load_history()
+        # Batch-Läufe schreiben aus mehreren Threads
+        self._lock = threading.RLock()
+        # Ähnlichkeits-Index über veröffentlichte Posts - wird bei der ersten Abfrage aufgebaut
+        self._similarity_index: Optional[NearDuplicateIndex] = None
     
     def _load_history(self) -> List[Dict]:
         """Lädt Post-Historie aus JSON-Datei"""
@@ -30,7 +38,7 @@ class PostHistoryTracker:
     def _save_history(self):
         """Speichert Post-Historie in JSON-Datei"""
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
+            with self._lock, open(self.history_file, 'w', encoding='utf-8') as f:
                 json.dump(self.history, f, ensure_ascii=False, indent=2)
             logger.info(f"✅ Post-Historie gespeichert: {self.history_file}")
         except Exception as e:
@@ -46,40 +54,97 @@ class PostHistoryTracker:
                  image_theme: Optional[str] = None,
                  image_url: Optional[str] = None,
                  linkedin_post_id: Optional[str] = None,
-                 mode: str = "preview") -> Dict:
-        """Fügt einen neuen Post zur Historie hinzu"""
+                 linkedin_posted: Optional[bool] = None,
+                 mode: str = "preview",
+                 stage_timings: Optional[Dict[str, float]] = None,
+                 degradations: Optional[List[Dict]] = None) -> Dict:
+        """Fügt einen neuen Post zur Historie hinzu (linkedin_posted: Standard = Post-ID vorhanden)"""
+        if linkedin_posted is None:
+            linkedin_posted = linkedin_post_id is not None
+        with self._lock:
+            post_entry = {
+                "id": len(self.history) + 1,
+                "timestamp": datetime.now().isoformat(),
+                "date": datetime.now().strftime("%Y-%m-%d"),
+                "time": datetime.now().strftime("%H:%M:%S"),
+                "mode": mode,  # preview, post, schedule
+                "topic": topic,
+                "storytelling_structure": storytelling_structure.get("name", "Unknown") if isinstance(storytelling_structure, dict) else storytelling_structure,
+                "ai_providers": {
+                    "research_model": research_model,
+                    "review_model": review_model
+                },
+                "review_score": review_score,
+                "character_count": len(post_text),
+                "image": {
+                    "theme": image_theme,
+                    "url": image_url,
+                    "included": image_url is not None
+                },
+                "linkedin": {
+                    "post_id": linkedin_post_id,
+                    "posted": linkedin_posted
+                },
+                "content_preview": post_text[:100] + "..." if len(post_text) > 100 else post_text,
+                "post_text": post_text,
+                "stage_timings": stage_timings or {},  # Sekunden pro Stufe/Unter-Spanne
+                "degradations": degradations or []  # Fallbacks wegen Zeitbudget/Deadline
+            }
         
-        post_entry = {
-            "id": len(self.history) + 1,
-            "timestamp": datetime.now().isoformat(),
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "time": datetime.now().strftime("%H:%M:%S"),
-            "mode": mode,  # preview, post, schedule
-            "topic": topic,
-            "storytelling_structure": storytelling_structure.get("name", "Unknown") if isinstance(storytelling_structure, dict) else storytelling_structure,
-            "ai_providers": {
-                "research_model": research_model,
-                "review_model": review_model
-            },
-            "review_score": review_score,
-            "character_count": len(post_text),
-            "image": {
-                "theme": image_theme,
-                "url": image_url,
-                "included": image_url is not None
-            },
-            "linkedin": {
-                "post_id": linkedin_post_id,
-                "posted": linkedin_post_id is not None
-            },
-            "content_preview": post_text[:100] + "..." if len(post_text) > 100 else post_text
-        }
+            # Nur veröffentlichte Posts sind Referenz für Beinahe-Duplikate (abgelehnte auto_post-Läufe nicht)
+            if mode == "post" and linkedin_posted:
+                signature = minhash_signature(post_text)
+                post_entry["minhash"] = encode_signature(signature)
+                if self._similarity_index is not None:
+                    self._similarity_index.add(len(self.history), signature, datetime.now().timestamp())
+            
+            self.history.append(post_entry)
+            self._save_history()
         
-        self.history.append(post_entry)
-        self._save_history()
+            logger.info(f"📝 Post #{post_entry['id']} zur Historie hinzugefügt: {topic}")
+            return post_entry
+    
+    def find_similar(self, post_text: str, threshold: float = DUPLICATE_THRESHOLD,
+                     days: int = DUPLICATE_LOOKBACK_DAYS) -> Optional[Dict]:
+        """
+        Sucht einen früheren veröffentlichten Post (mode "post", linkedin.posted), den der Text fast wiederholt
         
-        logger.info(f"📝 Post #{post_entry['id']} zur Historie hinzugefügt: {topic}")
-        return post_entry
+        Args:
+            post_text: Neuer Post-Text
+            threshold: Mindest-Ähnlichkeit (geschätzte Shingle-Ähnlichkeit, 0-1)
+            days: Nur Posts der letzten N Tage (0 = gesamte Historie)
+            
+        Returns:
+            dict: post_id, date und similarity des ähnlichsten Posts oder None
+        """
+        since = (datetime.now() - timedelta(days=days)).timestamp() if days > 0 else None
+        matches = self._get_similarity_index().query(minhash_signature(post_text), threshold, since)
+        if not matches:
+            return None
+        position, similarity = matches[0]
+        post = self.history[position]
+        return {"post_id": post.get("id"), "date": post.get("date"), "similarity": round(similarity, 3)}
+    
+    def _get_similarity_index(self) -> NearDuplicateIndex:
+        """Baut den Ähnlichkeits-Index aus der Historie (gespeicherte Signaturen, sonst aus dem vollen Text)"""
+        with self._lock:
+            if self._similarity_index is None:
+                # Schlüssel = Position in der Historie (wird nur angehängt)
+                index = NearDuplicateIndex()
+                for position, post in enumerate(self.history):
+                    if (post.get("mode") != "post" or not post.get("linkedin", {}).get("posted")
+                            or not post.get("post_text")):
+                        continue
+                    signature = decode_signature(post["minhash"]) if post.get("minhash") else None
+                    if signature is None:
+                        signature = minhash_signature(post["post_text"])
+                    try:
+                        timestamp = datetime.fromisoformat(post["timestamp"]).timestamp()
+                    except (ValueError, KeyError):
+                        timestamp = 0.0
+                    index.add(position, signature, timestamp)
+                self._similarity_index = index
+            return self._similarity_index
     
     def get_posts_last_days(self, days: int = 7) -> List[Dict]:
         """Gibt Posts der letzten N Tage zurück"""
@@ -151,6 +216,42 @@ class PostHistoryTracker:
         
         return structures
     
+    def get_recent_structures(self, days: int = 30) -> List[str]:
+        """Namen der Storytelling-Strukturen der letzten N Tage (neueste zuerst)"""
+        names = []
+        for post in self.get_posts_last_days(days):
+            structure = post.get("storytelling_structure", "Unknown")
+            names.append(structure.get("name", "Unknown") if isinstance(structure, dict) else structure)
+        return names
+    
+    def get_stage_latency_stats(self, days: int = 30) -> Dict:
+        """
+        Aggregiert Stufenzeiten (p50/p95) über die Posts der letzten N Tage
+        
+        Returns:
+            dict: Stufenname → {"count", "p50", "p95"} in Sekunden
+        """
+        samples = {}
+        for post in self.get_posts_last_days(days):
+            for stage, seconds in post.get("stage_timings", {}).items():
+                samples.setdefault(stage, []).append(seconds)
+        
+        return {
+            stage: {
+                "count": len(values),
+                "p50": self._percentile(values, 50),
+                "p95": self._percentile(values, 95)
+            }
+            for stage, values in sorted(samples.items())
+        }
+    
+    @staticmethod
+    def _percentile(values: List[float], percentile: int) -> float:
+        """Perzentil nach Nearest-Rank-Methode"""
+        ordered = sorted(values)
+        rank = max(1, math.ceil(len(ordered) * percentile / 100))
+        return ordered[rank - 1]
+    
     def get_ai_provider_stats(self, days: int = 30) -> Dict:
         """Analysiert AI-Provider Verwendung"""
         recent_posts = self.get_posts_last_days(days)
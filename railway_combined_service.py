@@ -110,6 +110,15 @@ def scheduler_status():
         }
     return {'running': False, 'message': 'Scheduler not initialized'}
 
+@app.route('/sources/status')
+def sources_status():
+    """Circuit-Breaker-Zustand der Recherche-Quellen (Hosts und Negativ-Cache)"""
+    from services.circuit_breaker import circuit_breaker
+    return {
+        **circuit_breaker.snapshot(),
+        'timestamp': datetime.now().isoformat()
+    }
+
 @app.route('/scheduler/start')
 def start_scheduler():
     """Startet den Scheduler manuell"""
@@ -159,10 +168,10 @@ def test_post():
         logger.info("🧪 Manueller Test-Post ausgelöst")
         
         # Import hier um Circular Import zu vermeiden
-        from multi_agent_system import LinkedInPostMultiAgentSystem
+        from multi_agent_system import get_shared_system
         
-        # Erstelle Test-Post
-        system = LinkedInPostMultiAgentSystem()
+        # Erstelle Test-Post (geteilte Instanz - keine Agent-Initialisierung pro Request)
+        system = get_shared_system()
         result = system.create_and_post(topic="Railway Test Post", auto_post=True)
         
         if result.get('success'):
@@ -198,6 +207,7 @@ def index():
     <ul>
         <li><a href="/health">🏥 Health Check</a></li>
         <li><a href="/scheduler/status">📊 Scheduler Status</a></li>
+        <li><a href="/sources/status">🔌 Quellen-Status (Circuit Breaker)</a></li>
         <li><a href="/scheduler/start">▶️ Scheduler starten</a></li>
         <li><a href="/scheduler/stop">⏹️ Scheduler stoppen</a></li>
         <li><a href="/test-post">🧪 Test Post (manuell)</a></li>
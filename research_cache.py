@@ -0,0 +1,141 @@
+"""
+Research Cache - Recherche-Ergebnisse pro Thema und Quellen-Version mit TTL
+
+Vor ResearchAgent.research_xrechnung_topic: Preview-Läufe, /test-post und
+geplante Posts im selben Zeitfenster zahlen Scraping und Zusammenstellung
+nur einmal. Abgelaufene Einträge werden sofort geliefert und im Hintergrund
+neu recherchiert (stale-while-revalidate). Die Einträge liegen in einer
+JSON-Datei und überstehen Neustarts; Änderungen anderer Prozesse (z.B.
+Scheduler und Railway-Service) werden beim nächsten Zugriff nachgeladen.
+"""
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, NamedTuple, Optional
+import logging
+from config import RESEARCH_CACHE_FILE, RESEARCH_CACHE_MAX, RESEARCH_CACHE_TTL_MINUTES
+
+logger = logging.getLogger(__name__)
+
+
+def research_cache_key(topic: str, versions: Dict[str, Any]) -> str:
+    """
+    Bildet den Cache-Schlüssel aus Thema und Quellen-Versionen
+
+    Args:
+        topic: Recherche-Thema
+        versions: Versionen der Quellen (z.B. Profile, News-Stand, Tag)
+
+    Returns:
+        str: Hash über Thema und Versionen (unabhängig von der Reihenfolge)
+    """
+    payload = json.dumps({"topic": topic, "versions": versions}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class CachedResearch(NamedTuple):
+    """Treffer im Recherche-Cache"""
+    result: Dict
+    fresh: bool   # False = TTL abgelaufen, sollte im Hintergrund aktualisiert werden
+    age: float    # Alter in Sekunden
+
+
+class ResearchCache:
+    """Speichert Recherche-Ergebnisse in einer lokalen JSON-Datei (älteste Einträge fallen heraus)"""
+
+    def __init__(self, cache_file: str = RESEARCH_CACHE_FILE, ttl_minutes: float = RESEARCH_CACHE_TTL_MINUTES,
+                 max_entries: int = RESEARCH_CACHE_MAX):
+        self.cache_file = cache_file
+        self.ttl_seconds = ttl_minutes * 60
+        self.max_entries = max_entries
+        # Vordergrund-Läufe und Hintergrund-Aktualisierungen greifen aus mehreren Threads zu
+        self._lock = threading.RLock()
+        self._refreshing = set()
+        self._mtime: Optional[float] = None
+        self.entries = self._load_entries()
+
+    def _load_entries(self) -> Dict[str, Dict]:
+        """Lädt Einträge aus JSON-Datei"""
+        if os.path.exists(self.cache_file):
+            try:
+                self._mtime = os.path.getmtime(self.cache_file)
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Konnte Recherche-Cache nicht laden: {e}")
+                return {}
+        return {}
+
+    def _reload_if_changed(self):
+        """Übernimmt Einträge, die ein anderer Prozess geschrieben hat"""
+        try:
+            mtime = os.path.getmtime(self.cache_file)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.entries = self._load_entries()
+
+    def _save_entries(self):
+        """Speichert Einträge atomar (temporäre Datei + rename) - Leser sehen nie halbe Dateien"""
+        tmp_file = f"{self.cache_file}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.cache_file)
+            self._mtime = os.path.getmtime(self.cache_file)
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Speichern des Recherche-Caches: {e}")
+
+    def lookup(self, key: str) -> Optional[CachedResearch]:
+        """
+        Sucht ein Recherche-Ergebnis
+
+        Args:
+            key: Schlüssel aus research_cache_key
+
+        Returns:
+            CachedResearch: Kopie des Ergebnisses mit Frische und Alter, oder None
+        """
+        with self._lock:
+            self._reload_if_changed()
+            entry = self.entries.get(key)
+            if not entry:
+                return None
+            age = time.time() - entry["stored_at"]
+            return CachedResearch(copy.deepcopy(entry["result"]), age < self.ttl_seconds, age)
+
+    def store(self, key: str, result: Dict):
+        """
+        Speichert ein Recherche-Ergebnis (ersetzt einen vorhandenen Eintrag)
+
+        Args:
+            key: Schlüssel aus research_cache_key
+            result: Ergebnis von research_xrechnung_topic (JSON-serialisierbar)
+        """
+        with self._lock:
+            self._reload_if_changed()
+            self.entries.pop(key, None)
+            self.entries[key] = {"stored_at": time.time(), "topic": result.get("topic"), "result": result}
+            # Reihenfolge = zuletzt gespeichert; älteste Einträge fallen bei Überschreitung der Maximalgröße heraus
+            for stale in list(self.entries)[:-self.max_entries]:
+                del self.entries[stale]
+            self._save_entries()
+
+    def begin_refresh(self, key: str) -> bool:
+        """Markiert eine Hintergrund-Aktualisierung - False, wenn für den Schlüssel schon eine läuft"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key: str):
+        with self._lock:
+            self._refreshing.discard(key)
+
+# Singleton Instance
+research_cache = ResearchCache()
@@ -4,19 +4,30 @@ Scheduler für automatische LinkedIn-Posts mit Timezone-Support
 import schedule
 import time
 from datetime import datetime, timezone, timedelta
-from multi_agent_system import LinkedInPostMultiAgentSystem
-from config import POST_FREQUENCY, POST_TIME
+from multi_agent_system import get_shared_system
+from config import (
+    NEWS_INGEST_ENABLED,
+    NEWS_REFRESH_MINUTES,
+    POST_DEADLINE_MINUTES,
+    POST_FREQUENCY,
+    POST_TIME,
+    PREFETCH_LEAD_MINUTES
+)
+from services.news_ingestion import news_ingestor
 import logging
 import os
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
 class PostScheduler:
     """Scheduler für automatische LinkedIn-Post-Erstellung"""
     
     def __init__(self):
-        self.multi_agent_system = LinkedInPostMultiAgentSystem()
+        # Geteilte Instanz: Agents und HTTP-Sessions bleiben zwischen Scheduler-Läufen erhalten
+        self.multi_agent_system = get_shared_system()
         self.is_running = False
     
     def create_and_post_job(self):
@@ -27,7 +38,15 @@ class PostScheduler:
         logger.info(f"🕘 Starte automatische Post-Erstellung um {current_time.strftime('%H:%M:%S CET/CEST')}")
         
         try:
-            result = self.multi_agent_system.create_and_post(auto_post=True)
+            # Deadline: langsame Upstreams dürfen den Post nicht beliebig verzögern
+            deadline = datetime.now() + timedelta(minutes=POST_DEADLINE_MINUTES) if POST_DEADLINE_MINUTES > 0 else None
+            # Vorbereiteter Post aus prefetch_job - aus den Checkpoints, übersteht Neustarts
+            run_id = self.multi_agent_system.latest_staged_run(max_age_minutes=2 * PREFETCH_LEAD_MINUTES)
+            if run_id:
+                # Vorbereiteter Post: nur noch Quellen-Prüfung, Upload und Posting
+                result = self.multi_agent_system.publish_staged(run_id, deadline=deadline)
+            else:
+                result = self.multi_agent_system.create_and_post(auto_post=True, deadline=deadline)
             
             if result["success"]:
                 if result["linkedin_posted"]:
@@ -41,6 +60,34 @@ class PostScheduler:
         except Exception as e:
             logger.error(f"Fehler im Scheduled Job: {str(e)}")
     
+    def prefetch_job(self):
+        """Job-Funktion: Post PREFETCH_LEAD_MINUTES vor der Post-Zeit vorbereiten (Recherche, Bild, Content, Review)"""
+        try:
+            # Vorbereitung muss vor der Post-Zeit fertig sein - sonst greifen die Fallbacks
+            deadline = datetime.now() + timedelta(minutes=PREFETCH_LEAD_MINUTES)
+            result = self.multi_agent_system.prefetch(deadline=deadline)
+            if result["success"]:
+                logger.info(f"🗂️ Post vorbereitet (Lauf {result['run_id']}) - Veröffentlichung zur Post-Zeit")
+            else:
+                logger.error(f"Fehler bei der Post-Vorbereitung: {result.get('error', 'Unbekannter Fehler')}")
+        except Exception as e:
+            logger.error(f"Fehler im Prefetch-Job: {str(e)}")
+    
+    def ingest_news_job(self, only_if_stale: bool = False):
+        """
+        Job-Funktion: News-Feeds abrufen, damit die Recherche nur noch aus dem lokalen Store liest
+        
+        Args:
+            only_if_stale: Nur abrufen, wenn die letzte Ingestion länger als NEWS_REFRESH_MINUTES zurückliegt
+        """
+        try:
+            if only_if_stale:
+                news_ingestor.ingest_if_stale()
+            else:
+                news_ingestor.ingest()
+        except Exception as e:
+            logger.error(f"Fehler bei der News-Ingestion: {str(e)}")
+    
     def setup_schedule(self, frequency: str = None, post_time: str = None):
         """
         Richtet den Zeitplan für automatische Posts ein
@@ -61,21 +108,50 @@ class PostScheduler:
         utc_hour = (german_hour - 1) % 24  # CET ist UTC+1
         utc_time = f"{utc_hour:02d}:{german_minute:02d}"
         
+        days = ["day"]
         if frequency == "daily":
             schedule.every().day.at(utc_time).do(self.create_and_post_job)
             logger.info(f"🌍 Täglicher Post: {post_time} deutsche Zeit = {utc_time} UTC")
         elif frequency == "weekly":
             schedule.every().monday.at(utc_time).do(self.create_and_post_job)
+            days = ["monday"]
             logger.info(f"🌍 Wöchentlicher Post: Montags {post_time} deutsche Zeit = {utc_time} UTC")
         elif frequency == "custom":
             # Beispiel: Montag, Mittwoch, Freitag
             schedule.every().monday.at(utc_time).do(self.create_and_post_job)
             schedule.every().wednesday.at(utc_time).do(self.create_and_post_job)
             schedule.every().friday.at(utc_time).do(self.create_and_post_job)
+            days = ["monday", "wednesday", "friday"]
             logger.info(f"🌍 Custom Schedule: Mo, Mi, Fr {post_time} deutsche Zeit = {utc_time} UTC")
         else:
             logger.warning(f"Unbekannte Häufigkeit: {frequency}, verwende daily")
             schedule.every().day.at(post_time).do(self.create_and_post_job)
+            utc_time = post_time
+        
+        if PREFETCH_LEAD_MINUTES > 0:
+            self._schedule_prefetch(days, utc_time)
+        
+        if NEWS_INGEST_ENABLED:
+            schedule.every(NEWS_REFRESH_MINUTES).minutes.do(self.ingest_news_job)
+            logger.info(f"📰 News-Feeds werden alle {NEWS_REFRESH_MINUTES:g} Minuten abgerufen")
+    
+    def _schedule_prefetch(self, days: list, post_time: str):
+        """
+        Plant den Prefetch-Job PREFETCH_LEAD_MINUTES vor jedem Post-Termin ein
+        
+        Args:
+            days: Post-Tage ("day" = täglich oder Wochentage wie "monday")
+            post_time: Post-Zeit (HH:MM, wie im Zeitplan)
+        """
+        hour, minute = map(int, post_time.split(':'))
+        # Negative Minuten = Vortag (z.B. Post um 00:10, Vorbereitung um 23:40)
+        day_shift, start = divmod(hour * 60 + minute - PREFETCH_LEAD_MINUTES, 24 * 60)
+        prefetch_time = f"{start // 60:02d}:{start % 60:02d}"
+        for day in days:
+            if day != "day":
+                day = WEEKDAYS[(WEEKDAYS.index(day) + day_shift) % 7]
+            getattr(schedule.every(), day).at(prefetch_time).do(self.prefetch_job)
+        logger.info(f"🗂️ Vorbereitung {PREFETCH_LEAD_MINUTES} Minuten vor dem Post: {prefetch_time}")
     
     def run(self, frequency: str = None, post_time: str = None):
         """
@@ -87,6 +163,9 @@ class PostScheduler:
         """
         self.setup_schedule(frequency, post_time)
         self.is_running = True
+        if NEWS_INGEST_ENABLED:
+            # News-Store beim Start füllen, nicht erst nach dem ersten Intervall (Neustarts rufen nicht erneut ab)
+            self.ingest_news_job(only_if_stale=True)
         
         logger.info("Scheduler gestartet. Drücke Ctrl+C zum Beenden.")
         
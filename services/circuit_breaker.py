@@ -0,0 +1,201 @@
+"""
+Circuit Breaker pro Host mit Negativ-Cache - fällt bei bekannten Ausfällen sofort zurück
+
+Alle GETs über services/http_session.py (Scraper, Crawler, Seiten-Cache,
+News-Ingestion) melden hier Erfolg oder Fehlschlag:
+
+- closed: normale Abrufe; Verbindungsfehler, Timeouts, 5xx und 429 werden gezählt
+- open: nach CIRCUIT_FAILURE_THRESHOLD Fehlschlägen in Folge scheitern alle
+  Abrufe an den Host sofort (SourceUnavailableError), bis CIRCUIT_COOLDOWN_SECONDS
+  vergangen sind
+- half_open: danach darf genau ein Probe-Request durch - Erfolg schließt den
+  Circuit, ein Fehlschlag öffnet ihn für eine weitere Cool-down-Phase
+
+Zusätzlich merkt sich der Negativ-Cache jede fehlgeschlagene URL für
+NEGATIVE_CACHE_SECONDS - weitere Abrufe derselben URL (z.B. pro Thema im Batch)
+warten dann nicht erneut den Timeout ab, auch wenn der Host-Circuit noch zu ist.
+Der Zustand ist per snapshot() fürs Monitoring abrufbar (/sources/status).
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import logging
+from config import CIRCUIT_BREAKER_ENABLED, CIRCUIT_COOLDOWN_SECONDS, CIRCUIT_FAILURE_THRESHOLD, NEGATIVE_CACHE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class SourceUnavailableError(Exception):
+    """Abruf wurde nicht versucht: Host-Circuit offen oder URL kürzlich fehlgeschlagen"""
+
+    def __init__(self, url: str, reason: str):
+        super().__init__(f"{url} übersprungen: {reason}")
+        self.url = url
+        self.reason = reason
+
+
+class _HostState:
+    """Zustand eines Hosts"""
+    __slots__ = ("state", "failures", "total_failures", "opened_at", "probe_in_flight", "last_error", "last_failure_at")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0           # Fehlschläge in Folge
+        self.total_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe_in_flight = False
+        self.last_error: Optional[str] = None
+        self.last_failure_at: Optional[float] = None
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds") if timestamp else None
+
+
+class HostCircuitBreaker:
+    """Circuit Breaker pro Host plus Negativ-Cache pro URL (thread-sicher, geteilt von sync und async Abrufen)"""
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 cooldown_seconds: float = CIRCUIT_COOLDOWN_SECONDS,
+                 negative_ttl: float = NEGATIVE_CACHE_SECONDS, enabled: bool = CIRCUIT_BREAKER_ENABLED):
+        """
+        Args:
+            failure_threshold: Fehlschläge in Folge, nach denen der Host gesperrt wird
+            cooldown_seconds: Dauer der Sperre, bevor ein Probe-Request durchgelassen wird
+            negative_ttl: So lange wird eine fehlgeschlagene URL nicht erneut abgerufen (0 = aus)
+            enabled: False = alle Abrufe durchlassen, nichts zählen
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.negative_ttl = negative_ttl
+        self.enabled = enabled
+        self._hosts: Dict[str, _HostState] = {}
+        self._negative: Dict[str, tuple] = {}  # URL → (läuft ab, Grund)
+        self._lock = threading.Lock()
+
+    def before_request(self, url: str):
+        """
+        Prüft vor einem Abruf, ob er versucht werden darf (im half_open-Zustand: wird zum Probe-Request)
+
+        Raises:
+            SourceUnavailableError: Host gesperrt, Probe läuft bereits oder URL im Negativ-Cache
+        """
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            negative = self._negative.get(url)
+            if negative and negative[0] > now:
+                raise SourceUnavailableError(url, f"kürzlich fehlgeschlagen ({negative[1]})")
+
+            host = self._hosts.get(_host(url))
+            if host is None or host.state == CLOSED:
+                return
+            if host.state == OPEN:
+                remaining = host.opened_at + self.cooldown_seconds - now
+                if remaining > 0:
+                    raise SourceUnavailableError(url, f"Circuit für {_host(url)} offen (noch {remaining:.0f}s)")
+                host.state = HALF_OPEN
+            if host.probe_in_flight:
+                raise SourceUnavailableError(url, f"Probe-Request an {_host(url)} läuft")
+            host.probe_in_flight = True
+        logger.info(f"🔌 {_host(url)}: Probe-Request nach Cool-down")
+
+    def record_success(self, url: str):
+        """Host hat geantwortet (auch 304/404) - Fehlerzähler zurücksetzen, half_open → closed"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._negative.pop(url, None)
+            host = self._hosts.get(_host(url))
+            if host is None:
+                return
+            if host.state != CLOSED:
+                logger.info(f"✅ {_host(url)} wieder erreichbar - Circuit geschlossen")
+            host.state = CLOSED
+            host.failures = 0
+            host.opened_at = None
+            host.probe_in_flight = False
+
+    def record_failure(self, url: str, reason: str):
+        """
+        Abruf endgültig fehlgeschlagen (nach allen Retries)
+
+        Args:
+            url: Abgerufene URL
+            reason: Fehlerbeschreibung (z.B. "TimeoutError", "HTTP 503")
+        """
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            if self.negative_ttl > 0:
+                self._negative[url] = (now + self.negative_ttl, reason)
+            host = self._hosts.setdefault(_host(url), _HostState())
+            host.failures += 1
+            host.total_failures += 1
+            host.last_error = reason
+            host.last_failure_at = now
+            probe_failed = host.state == HALF_OPEN
+            host.probe_in_flight = False
+            if probe_failed or (host.state == CLOSED and host.failures >= self.failure_threshold):
+                host.state = OPEN
+                host.opened_at = now
+                logger.warning(f"🔌 Circuit für {_host(url)} geöffnet ({host.failures} Fehlschläge in Folge, "
+                               f"zuletzt {reason}) - Abrufe scheitern {self.cooldown_seconds:.0f}s lang sofort")
+
+    def release(self, url: str):
+        """Abruf ohne Ergebnis beendet (z.B. abgebrochen) - ein laufender Probe-Request gibt seinen Platz frei"""
+        if not self.enabled:
+            return
+        with self._lock:
+            host = self._hosts.get(_host(url))
+            if host is not None:
+                host.probe_in_flight = False
+
+    def snapshot(self) -> Dict:
+        """
+        Zustand aller bekannten Hosts und der Negativ-Cache (für Monitoring)
+
+        Returns:
+            dict: hosts (Host → state, failures, total_failures, last_error, last_failure_at, retry_at)
+                  und negative_cache (URL → reason, expires_at)
+        """
+        now = time.time()
+        with self._lock:
+            for url in [url for url, (expires, _) in self._negative.items() if expires <= now]:
+                del self._negative[url]
+            hosts = {
+                name: {
+                    "state": host.state,
+                    "failures": host.failures,
+                    "total_failures": host.total_failures,
+                    "last_error": host.last_error,
+                    "last_failure_at": _iso(host.last_failure_at),
+                    "retry_at": _iso(host.opened_at + self.cooldown_seconds) if host.state == OPEN else None
+                }
+                for name, host in self._hosts.items()
+            }
+            negative = {url: {"reason": reason, "expires_at": _iso(expires)}
+                        for url, (expires, reason) in self._negative.items()}
+        return {"enabled": self.enabled, "hosts": hosts, "negative_cache": negative}
+
+    def reset(self):
+        """Vergisst alle Zustände (z.B. nach manuellem Eingriff)"""
+        with self._lock:
+            self._hosts.clear()
+            self._negative.clear()
+
+
+# Singleton Instance
+circuit_breaker = HostCircuitBreaker()
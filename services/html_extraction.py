@@ -0,0 +1,358 @@
+"""
+HTML Extraction Engine - Titel, Feature-Kandidaten, Abschnitte, Text und Keywords in einem Durchlauf
+
+Ersetzt das bisherige Vorgehen (html.parser-Baum, decompose, zwei find_all-Läufe
+mit Regex und ein vollständiges get_text) durch einen einzigen lxml-Parse mit
+Parser-Target: Es wird kein Baum aufgebaut, alle Ergebnisse entstehen während
+des Parsens aus den start/data/end-Ereignissen.
+
+Die Semantik entspricht dem bisherigen BeautifulSoup-Code:
+- script/style/nav/footer/header werden samt Inhalt ignoriert (wie decompose)
+- Feature-Kandidaten: Elemente, deren .string (genau ein Text-Kind, ggf. über
+  ein einzelnes Kind-Element) dem Feature-Pattern entspricht (wie find_all(string=...))
+- Abschnitte: section/div, deren class-Attribut dem Pattern entspricht (wie find_all(class_=...))
+- Text: alle übrigen Texte, Whitespace wie bisher bereinigt (reine Whitespace-Knoten
+  werden wie bei BeautifulSoup zusammengefasst)
+- Links: href aller <a>-Elemente (auch aus nav/header/footer, für den Crawler)
+
+Für gestreamte Downloads parst ExtractionStream Chunk für Chunk und meldet, sobald
+Titel, Feature-Kandidaten, Abschnitte und Vorschautext feststehen - der Rest der
+Seite muss dann nicht mehr geladen werden. Text, Keywords und Links beziehen sich
+in diesem Fall auf den gelesenen Teil der Seite.
+"""
+import codecs
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern
+from lxml import etree
+from services.keyword_matcher import KeywordMatcher
+
+# Wie bisher vor der Textextraktion entfernt
+SKIPPED_TAGS = frozenset({"script", "style", "nav", "footer", "header"})
+FEATURE_TAGS = frozenset({"h2", "h3", "li", "p"})
+SECTION_TAGS = frozenset({"section", "div"})
+# Wie BeautifulSoup: reiner Whitespace wird außerhalb dieser Tags zu "\n" bzw. " " zusammengefasst
+PRESERVE_WHITESPACE_TAGS = frozenset({"pre", "textarea"})
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+def clean_text(text: str) -> str:
+    """Bereinigt Whitespace wie die bisherige Textextraktion (Zeilen und Doppel-Leerzeichen)"""
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)
+
+
+class ExtractionGoals(NamedTuple):
+    """Ziele, nach denen eine gestreamte Extraktion aufhören darf"""
+    max_features: int    # Feature-Kandidaten in Dokumentreihenfolge
+    max_sections: int    # Abschnitte in Dokumentreihenfolge
+    min_text_chars: int  # Sichtbare Zeichen (ohne Whitespace) für die Textvorschau
+
+
+class _Element:
+    """Zustand eines offenen Elements während des Parsens"""
+    __slots__ = ("tag", "skipped", "start_index", "order", "children", "last_was_text", "child_string", "collect")
+
+    def __init__(self, tag: str, skipped: bool, start_index: int, order: int, collect: bool):
+        self.tag = tag
+        self.skipped = skipped
+        self.start_index = start_index  # Position in der Textliste beim Öffnen
+        self.order = order              # Dokumentreihenfolge (wie find_all)
+        self.children = 0               # Kind-Knoten (Text-Läufe und Elemente, ohne entfernte Tags)
+        self.last_was_text = False
+        self.child_string: Optional[str] = None  # .string des einzigen Kind-Elements
+        self.collect = collect          # Abschnitt, dessen Text gesammelt wird
+
+
+class _ExtractionTarget:
+    """lxml Parser-Target, das die Ergebnisse während des Parsens berechnet"""
+
+    def __init__(self, extractor: "HtmlExtractor", goals: Optional[ExtractionGoals] = None):
+        self.extractor = extractor
+        self.goals = goals
+        self.done = False        # Ziele erfüllt - weitere Ereignisse werden ignoriert
+        self.visible_chars = 0   # Nicht-Whitespace-Zeichen im Text (nur mit Zielen gezählt)
+        self.stack: List[_Element] = []
+        self.texts: List[str] = []
+        self.title: Optional[str] = None
+        self.features: List[tuple] = []
+        self.sections: List[tuple] = []
+        self.links: List[str] = []
+        self.order = 0
+        self.run_start: Optional[int] = None  # Beginn des aktuellen Text-Laufs in self.texts
+        self.preserve_depth = 0
+
+    def _end_text_run(self):
+        """Schließt den aktuellen Text-Lauf ab (lxml liefert Text ggf. in mehreren data-Aufrufen)"""
+        if self.run_start is None:
+            return
+        run = ''.join(self.texts[self.run_start:])
+        if not self.preserve_depth and not run.strip(ASCII_SPACES):
+            self.texts[self.run_start:] = ["\n" if "\n" in run else " "]
+        self.run_start = None
+
+    def start(self, tag, attrib):
+        if self.done:
+            return
+        self._end_text_run()
+        if tag == "a" and attrib.get("href") is not None:
+            self.links.append(attrib["href"])
+        parent = self.stack[-1] if self.stack else None
+        skipped = (parent is not None and parent.skipped) or tag in SKIPPED_TAGS
+        if parent is not None:
+            parent.last_was_text = False
+            if not skipped:
+                parent.children += 1
+
+        collect = False
+        if not skipped and tag in SECTION_TAGS:
+            classes = attrib.get("class")
+            collect = bool(classes) and self.extractor.matches_section_class(classes)
+
+        if tag in PRESERVE_WHITESPACE_TAGS:
+            self.preserve_depth += 1
+        self.order += 1
+        self.stack.append(_Element(tag, skipped, len(self.texts), self.order, collect))
+
+    def data(self, data):
+        if self.done:
+            return
+        element = self.stack[-1] if self.stack else None
+        if element is not None and element.skipped:
+            return
+        if self.goals is not None and self.visible_chars < self.goals.min_text_chars:
+            self.visible_chars += len(''.join(data.split()))
+        if self.run_start is None:
+            self.run_start = len(self.texts)
+        self.texts.append(data)
+        if element is not None and not element.last_was_text:
+            element.children += 1
+            element.last_was_text = True
+
+    def end(self, tag):
+        if self.done:
+            return
+        self._end_text_run()
+        element = self.stack.pop()
+        if tag in PRESERVE_WHITESPACE_TAGS:
+            self.preserve_depth -= 1
+        if element.skipped:
+            return
+
+        # .string: genau ein Kind - entweder ein Text-Lauf oder ein Element mit eigenem .string
+        string = None
+        if element.children == 1:
+            string = ''.join(self.texts[element.start_index:]) if element.last_was_text else element.child_string
+
+        parent = self.stack[-1] if self.stack else None
+        if parent is not None and parent.children == 1:
+            parent.child_string = string
+
+        if tag == "title" and self.title is None:
+            self.title = ''.join(self.texts[element.start_index:])
+        if string is not None and tag in FEATURE_TAGS and self.extractor.feature_pattern.search(string):
+            self.features.append((element.order, string))
+        if element.collect:
+            self.sections.append((element.order, ''.join(self.texts[element.start_index:])))
+        if self.goals is not None and self._goals_met():
+            self.done = True
+
+    def _goals_met(self) -> bool:
+        """
+        Geprüft an Element-Enden - so hängt der Abbruchpunkt nicht von den Chunk-Grenzen ab
+
+        Noch offene Elemente haben eine frühere Dokumentposition als alles Folgende und
+        können selbst noch Kandidaten werden (z.B. <li> um ein <p>) - die ersten
+        max_features/max_sections stehen erst fest, wenn keins davon davor liegt.
+        """
+        goals = self.goals
+        if self.title is None or self.visible_chars < goals.min_text_chars:
+            return False
+        if len(self.features) < goals.max_features or len(self.sections) < goals.max_sections:
+            return False
+        open_features = [e.order for e in self.stack if e.tag in FEATURE_TAGS and not e.skipped]
+        open_sections = [e.order for e in self.stack if e.collect]
+        return (self._settled(self.features, goals.max_features, open_features)
+                and self._settled(self.sections, goals.max_sections, open_sections))
+
+    @staticmethod
+    def _settled(found: List[tuple], limit: int, open_orders: List[int]) -> bool:
+        """True, wenn die ersten limit Kandidaten vor allen noch offenen Kandidaten liegen"""
+        if limit <= 0 or not open_orders:
+            return True
+        return sorted(order for order, _ in found)[limit - 1] < min(open_orders)
+
+    def comment(self, text):
+        # Kommentare zählen (wie bei get_text) nicht zum Text
+        pass
+
+    def close(self) -> Dict:
+        self._end_text_run()
+        return {
+            "title": self.title,
+            "features": [text for _, text in sorted(self.features)],
+            "sections": [text for _, text in sorted(self.sections)],
+            "text": ''.join(self.texts),
+            "links": self.links
+        }
+
+
+class ExtractionStream:
+    """
+    Inkrementelle Extraktion für gestreamte Downloads (ein Parser pro Seite)
+
+    feed() parst jeden Chunk sofort; mit Zielen liefert es True, sobald Titel,
+    Feature-Kandidaten, Abschnitte und Vorschautext feststehen. close() liefert
+    dasselbe Ergebnis wie HtmlExtractor.extract für den gelesenen Teil der Seite.
+    """
+
+    def __init__(self, extractor: "HtmlExtractor", max_features: int, max_sections: int,
+                 goals: Optional[ExtractionGoals] = None):
+        self.extractor = extractor
+        self.max_features = max_features
+        self.max_sections = max_sections
+        self.goals = goals
+        # Wie BeautifulSoup: UTF-8 bevorzugen - Rohdaten bleiben bis zum ersten ungültigen Byte erhalten
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._raw: Optional[List[bytes]] = []
+        self._start()
+
+    def _start(self):
+        self._pending = None  # Noch nicht weitergegebener Rest nach dem letzten '>'
+        self._target = _ExtractionTarget(self.extractor, self.goals)
+        self._parser = etree.HTMLParser(target=self._target, remove_comments=True)
+
+    @property
+    def satisfied(self) -> bool:
+        """True, sobald die Ziele erfüllt sind (weitere Chunks werden ignoriert)"""
+        return self._target.done
+
+    def feed(self, chunk) -> bool:
+        """
+        Parst den nächsten Chunk
+
+        Args:
+            chunk: HTML-Rohdaten (bytes) oder bereits dekodierter Text
+
+        Returns:
+            bool: True, wenn der Rest der Seite nicht mehr gebraucht wird
+        """
+        if self._target.done:
+            return True
+        if isinstance(chunk, str) or self._raw is None:
+            self._push(chunk)
+            return self._target.done
+
+        self._raw.append(chunk)
+        try:
+            text = self._decoder.decode(chunk)
+        except UnicodeDecodeError:
+            # Kein UTF-8 → Neustart mit den Rohdaten, lxml erkennt das Encoding (meta charset)
+            raw, self._raw = b"".join(self._raw), None
+            self._start()
+            self._push(raw)
+        else:
+            self._push(text)
+        return self._target.done
+
+    def _push(self, data):
+        """
+        Gibt Daten bis zum letzten '>' an den Parser weiter, den Rest beim nächsten Chunk
+
+        Der HTML-Push-Parser von libxml2 verliert bei manchen Chunk-Grenzen innerhalb
+        eines Tags den restlichen Body - an Tag-Enden ist das Ergebnis unabhängig
+        von der Aufteilung in Chunks.
+        """
+        data = self._pending + data if self._pending else data
+        cut = data.rfind(">" if isinstance(data, str) else b">") + 1
+        self._pending = data[cut:]
+        if cut:
+            self._parser.feed(data[:cut])
+
+    def close(self) -> Dict:
+        """
+        Beendet das Parsen (ein am Ende abgeschnittenes UTF-8-Zeichen wird verworfen)
+
+        Returns:
+            dict: title (oder None), features, sections, text (bereinigt), keywords, links
+        """
+        if not self._target.done:
+            # Auch leer füttern - ein Parser ohne Daten scheitert sonst an close()
+            self._parser.feed(self._pending or ("" if self._raw is not None else b""))
+        self._raw = self._pending = None
+        return self.extractor._finish(self._parser.close(), self.max_features, self.max_sections)
+
+
+class HtmlExtractor:
+    """
+    Vorkonfigurierter Extraktor für eine Website (Patterns und Keywords werden einmal kompiliert)
+
+    Thread-sicher: Jeder Aufruf von extract nutzt einen eigenen Parser.
+    """
+
+    def __init__(self, feature_pattern: str, section_class_pattern: str, keywords: Iterable[str]):
+        """
+        Args:
+            feature_pattern: Regex für Feature-Texte (case-insensitive)
+            section_class_pattern: Regex für class-Attribute relevanter section/div
+            keywords: Keywords, deren Vorkommen im Text gemeldet wird
+        """
+        self.feature_pattern: Pattern = re.compile(feature_pattern, re.I)
+        self.section_class_pattern: Pattern = re.compile(section_class_pattern, re.I)
+        self.keyword_matcher = KeywordMatcher(keywords)
+
+    def matches_section_class(self, classes: str) -> bool:
+        """Wie BeautifulSoup class_=regex: einzelne Klassen oder das ganze Attribut"""
+        search = self.section_class_pattern.search
+        return any(search(name) for name in classes.split()) or bool(search(classes))
+
+    def extract(self, body: bytes, max_features: int = 10, max_sections: int = 5) -> Dict:
+        """
+        Extrahiert alle Informationen in einem Parse-Durchlauf
+
+        Args:
+            body: HTML-Rohdaten
+            max_features: Maximal betrachtete Feature-Kandidaten (Dokumentreihenfolge)
+            max_sections: Maximal betrachtete Abschnitte (Dokumentreihenfolge)
+
+        Returns:
+            dict: title (oder None), features, sections, text (bereinigt), keywords, links
+        """
+        stream = self.stream(max_features, max_sections)
+        stream.feed(body)
+        return stream.close()
+
+    def stream(self, max_features: int = 10, max_sections: int = 5,
+               min_text_chars: Optional[int] = None) -> ExtractionStream:
+        """
+        Erstellt eine inkrementelle Extraktion für eine gestreamte Seite
+
+        Args:
+            max_features: Maximal betrachtete Feature-Kandidaten (Dokumentreihenfolge)
+            max_sections: Maximal betrachtete Abschnitte (Dokumentreihenfolge)
+            min_text_chars: Optional - mit Angabe meldet feed() True, sobald Titel, Features,
+                            Abschnitte und so viele sichtbare Textzeichen feststehen
+
+        Returns:
+            ExtractionStream: Parser für die Chunks einer Seite
+        """
+        goals = ExtractionGoals(max_features, max_sections, min_text_chars) if min_text_chars is not None else None
+        return ExtractionStream(self, max_features, max_sections, goals)
+
+    def _finish(self, result: Dict, max_features: int, max_sections: int) -> Dict:
+        """Bereinigt die Rohergebnisse des Parser-Targets und sucht die Keywords"""
+        text = clean_text(result["text"])
+        features = [feature.strip() for feature in result["features"][:max_features]]
+        sections = [section.strip()[:500] for section in result["sections"][:max_sections]]
+        return {
+            "title": result["title"],
+            "features": [feature for feature in features if feature and len(feature) < 200],
+            "sections": [section for section in sections if section],
+            "text": text,
+            "keywords": self.match_keywords(text),
+            "links": result["links"]
+        }
+
+    def match_keywords(self, text: str) -> List[str]:
+        """Keywords in Konfigurationsreihenfolge, die (case-insensitive) im Text vorkommen"""
+        return self.keyword_matcher.matched(text)
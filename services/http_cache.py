@@ -0,0 +1,242 @@
+"""
+HTTP Page Cache - Conditional GET (ETag/Last-Modified) mit Body und geparstem Ergebnis auf der Platte
+"""
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Mapping, Optional
+import aiohttp
+import logging
+from config import HTTP_CACHE_DIR, HTTP_CACHE_ENABLED, HTTP_CACHE_MAX_AGE
+from services.http_session import FetchResponse, afetch_response, fetch_response
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+# Inkrementeller Parser: feed(chunk) → True, sobald genug gelesen ist; close() → Ergebnis wie parse
+StreamParserFactory = Callable[[], Any]
+
+
+class PageCache:
+    """
+    Cache für gescrapte Seiten
+
+    Pro URL liegen unter <cache_dir>/ zwei Dateien: <key>.body (Rohdaten) und
+    <key>.json (Validatoren, Abrufzeit, geparstes Ergebnis).
+
+    - Seiten mit ETag/Last-Modified werden per If-None-Match/If-Modified-Since
+      revalidiert; bei 304 wird das gespeicherte Parse-Ergebnis geliefert
+    - Seiten ohne Validatoren gelten max_age Sekunden als frisch (kein Request)
+    - Cache-Control: max-age des Servers hat Vorrang, no-store wird nicht gespeichert
+    - Schlägt der Abruf fehl, wird ein vorhandener (veralteter) Eintrag geliefert
+    - Optional wird der Body gestreamt: höchstens max_bytes, und ein inkrementeller
+      Parser (stream) kann den Download beenden, sobald er alles Nötige hat
+    """
+
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR, max_age: int = HTTP_CACHE_MAX_AGE,
+                 enabled: bool = HTTP_CACHE_ENABLED):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.enabled = enabled
+
+    def get(self, url: str, parse: Callable[[bytes], Optional[Dict]], headers: Optional[Dict] = None,
+            timeout: float = 10, max_bytes: Optional[int] = None,
+            stream: Optional[StreamParserFactory] = None) -> Optional[Dict]:
+        """
+        Liefert das geparste Ergebnis einer Seite (aus dem Cache oder frisch abgerufen)
+
+        Args:
+            url: URL der Seite
+            parse: Funktion Body → Ergebnis (None = nicht verwertbar, wird nicht gecacht)
+            headers: Optional - zusätzliche Request-Header
+            timeout: Timeout in Sekunden
+            max_bytes: Optional - Byte-Limit für den Body (der Rest wird nicht geladen)
+            stream: Optional - Fabrik für einen inkrementellen Parser, der den Body während
+                    des Downloads parst und ihn vorzeitig beenden kann (ersetzt parse beim Abruf)
+
+        Returns:
+            dict: Geparstes Ergebnis oder None bei Fehler ohne Cache-Eintrag
+        """
+        entry = self._load(url)
+        if entry and self._is_fresh(entry):
+            logger.info(f"📦 Cache-Treffer (frisch): {url}")
+            return self._cached_result(entry, parse)
+
+        parsers: List[Any] = []
+        try:
+            response = fetch_response(url, headers={**(headers or {}), **self._conditional_headers(entry)},
+                                      timeout=timeout, max_bytes=max_bytes, reader=self._reader(stream, parsers))
+            return self._handle_response(url, entry, response, parse, parsers[-1] if parsers else None)
+        except Exception as e:
+            return self._handle_error(url, entry, e, parse)
+
+    async def aget(self, session: aiohttp.ClientSession, url: str, parse: Callable[[bytes], Optional[Dict]],
+                   headers: Optional[Dict] = None, timeout: float = 10, max_bytes: Optional[int] = None,
+                   stream: Optional[StreamParserFactory] = None) -> Optional[Dict]:
+        """
+        Async-Variante von get auf einer geteilten aiohttp-Session
+
+        Args:
+            session: aiohttp-Session des Aufrufers
+            url: URL der Seite
+            parse: Funktion Body → Ergebnis (None = nicht verwertbar, wird nicht gecacht)
+            headers: Optional - zusätzliche Request-Header
+            timeout: Timeout in Sekunden
+            max_bytes: Optional - Byte-Limit für den Body (der Rest wird nicht geladen)
+            stream: Optional - Fabrik für einen inkrementellen Parser (siehe get)
+
+        Returns:
+            dict: Geparstes Ergebnis oder None bei Fehler ohne Cache-Eintrag
+        """
+        entry = self._load(url)
+        if entry and self._is_fresh(entry):
+            logger.info(f"📦 Cache-Treffer (frisch): {url}")
+            return self._cached_result(entry, parse)
+
+        parsers: List[Any] = []
+        try:
+            response = await afetch_response(session, url, headers={**(headers or {}), **self._conditional_headers(entry)},
+                                             timeout=timeout, max_bytes=max_bytes, reader=self._reader(stream, parsers))
+            return self._handle_response(url, entry, response, parse, parsers[-1] if parsers else None)
+        except Exception as e:
+            return self._handle_error(url, entry, e, parse)
+
+    def _reader(self, stream: Optional[StreamParserFactory], parsers: List[Any]) -> Optional[Callable]:
+        """Chunk-Leser-Fabrik für den Abruf: pro Versuch ein neuer Parser (der letzte liefert das Ergebnis)"""
+        if stream is None:
+            return None
+
+        def reader():
+            parsers.append(stream())
+            return parsers[-1].feed
+        return reader
+
+    def version(self, url: str) -> Optional[str]:
+        """
+        Inhalts-Version einer Seite aus dem Cache (ohne Netzwerkzugriff)
+
+        Args:
+            url: URL der Seite
+
+        Returns:
+            str: content_hash des gespeicherten Ergebnisses, sonst ETag/Last-Modified bzw.
+                 Abrufzeit; None ohne Eintrag (oder bei deaktiviertem Cache)
+        """
+        entry = self._load(url)
+        if not entry:
+            return None
+        parsed = entry.get("parsed")
+        if isinstance(parsed, dict) and parsed.get("content_hash"):
+            return parsed["content_hash"]
+        return entry.get("etag") or entry.get("last_modified") or str(entry.get("fetched_at"))
+
+    def _handle_response(self, url: str, entry: Optional[Dict], response: FetchResponse,
+                         parse: Callable[[bytes], Optional[Dict]], streamed: Optional[Any] = None) -> Optional[Dict]:
+        """
+        Verarbeitet 304 (Cache-Eintrag bestätigen) bzw. 200 (parsen und speichern)
+
+        Beim Streaming ist der Body bereits geparst - das Ergebnis liefert dann der
+        inkrementelle Parser des letzten Versuchs (streamed).
+        """
+        status, headers, body = response.status, response.headers, response.body
+        if status == 304 and entry:
+            logger.info(f"📦 Cache-Treffer (304 Not Modified): {url}")
+            entry["fetched_at"] = time.time()
+            entry["max_age"] = self._server_max_age(headers, entry.get("max_age"))
+            self._write_meta(url, entry)
+            return self._cached_result(entry, parse)
+
+        if response.truncated:
+            logger.info(f"✂️ {url}: nach {len(body) / 1024:.0f} KB abgebrochen")
+        parsed = streamed.close() if streamed is not None else parse(body)
+        if parsed is not None and self.enabled and "no-store" not in headers.get("Cache-Control", ""):
+            self._store(url, headers, body, parsed)
+        return parsed
+
+    def _handle_error(self, url: str, entry: Optional[Dict], error: Exception,
+                      parse: Callable[[bytes], Optional[Dict]]) -> Optional[Dict]:
+        logger.error(f"Fehler beim Abrufen der Seite {url}: {str(error)}")
+        if entry:
+            logger.warning(f"📦 Nutze veralteten Cache-Eintrag für {url}")
+            return self._cached_result(entry, parse)
+        return None
+
+    def _cached_result(self, entry: Dict, parse: Callable[[bytes], Optional[Dict]]) -> Optional[Dict]:
+        """Gespeichertes Parse-Ergebnis; fehlt es, wird der gespeicherte Body neu geparst"""
+        if entry.get("parsed") is not None:
+            return entry["parsed"]
+        try:
+            with open(self._path(entry["url"], "body"), "rb") as f:
+                return parse(f.read())
+        except OSError:
+            return None
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        """Frisch = innerhalb von max-age; Seiten mit Validatoren ohne Server-max-age werden immer revalidiert"""
+        return time.time() - entry.get("fetched_at", 0) < (entry.get("max_age") or 0)
+
+    def _conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _server_max_age(self, headers: Mapping[str, str], default: Optional[int]) -> Optional[int]:
+        match = _MAX_AGE_PATTERN.search(headers.get("Cache-Control", ""))
+        return int(match.group(1)) if match else default
+
+    def _store(self, url: str, headers: Mapping[str, str], body: bytes, parsed: Any):
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        # Ohne Validatoren kann nicht revalidiert werden → konfigurierte Frische-Dauer
+        default_max_age = None if (etag or last_modified) else self.max_age
+        self._write_atomic(self._path(url, "body"), body)
+        self._write_meta(url, {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "max_age": self._server_max_age(headers, default_max_age),
+            "parsed": parsed
+        })
+
+    def _load(self, url: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(url, "json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Cache-Eintrag für {url} nicht lesbar: {e}")
+            return None
+
+    def _write_meta(self, url: str, entry: Dict):
+        self._write_atomic(self._path(url, "json"),
+                           json.dumps(entry, ensure_ascii=False, default=str).encode("utf-8"))
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{key}.{suffix}")
+
+    def _write_atomic(self, path: str, data: bytes):
+        """Schreibt atomar (temporäre Datei + rename) - parallele Läufe sehen nie halbe Einträge"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Cache-Eintrag konnte nicht geschrieben werden ({path}): {e}")
+
+
+# Singleton Instance
+page_cache = PageCache()
@@ -0,0 +1,276 @@
+"""
+Geteilte HTTP-Sessions für alle Services (Verbindungen werden über Aufrufe hinweg wiederverwendet)
+
+- Connection-Pooling mit Keep-Alive und begrenzten Verbindungen pro Host
+- Begrenzte Retries mit exponentiellem Backoff plus Jitter (nur idempotente Requests)
+- Komprimierte Übertragung (gzip/deflate)
+- Optional gestreamter Body mit Byte-Limit und Abbruch, sobald ein Leser genug hat
+- GETs laufen über den Circuit Breaker pro Host (services/circuit_breaker.py)
+"""
+import asyncio
+import random
+import threading
+import weakref
+from typing import Callable, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import logging
+from config import HTTP_POOL_PER_HOST, HTTP_RETRIES, HTTP_RETRY_BACKOFF
+from services.circuit_breaker import circuit_breaker
+
+logger = logging.getLogger(__name__)
+
+# Statuscodes, bei denen ein erneuter Versuch sinnvoll ist
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+DEFAULT_HEADERS = {"Accept-Encoding": "gzip, deflate"}
+# Chunk-Größe beim gestreamten Lesen des Bodys
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Leser für gestreamte Bodies: bekommt jeden (dekomprimierten) Chunk, True = genug gelesen
+ChunkReader = Callable[[bytes], bool]
+
+
+class FetchResponse(NamedTuple):
+    """Ergebnis eines GET: Status, Header und (dekomprimierter) Body"""
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+    truncated: bool = False  # Lesen vorzeitig beendet (max_bytes überschritten oder Leser fertig)
+
+
+_sync_session: Optional[requests.Session] = None
+_sync_session_lock = threading.Lock()
+
+# aiohttp-Sessions sind an ihren Event Loop gebunden - eine Session pro Loop
+_async_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+def _create_session() -> requests.Session:
+    """Erstellt eine requests-Session mit Pool pro Host und Retry-Strategie"""
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        backoff_jitter=HTTP_RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUS_CODES,
+        # POST/PUT (z.B. LinkedIn-Posts) nie automatisch wiederholen - sonst Doppel-Posts
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=HTTP_POOL_PER_HOST, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Gibt die prozessweite requests-Session zurück (Keep-Alive, Connection-Pool, Retries)
+
+    Returns:
+        requests.Session: Geteilte Session
+    """
+    global _sync_session
+    if _sync_session is None:
+        with _sync_session_lock:
+            if _sync_session is None:
+                _sync_session = _create_session()
+    return _sync_session
+
+
+def get_async_session() -> aiohttp.ClientSession:
+    """
+    Gibt die aiohttp-Session des laufenden Event Loops zurück (wird bei Bedarf angelegt)
+
+    Muss innerhalb einer Coroutine aufgerufen werden.
+
+    Returns:
+        aiohttp.ClientSession: Geteilte Session des aktuellen Loops
+    """
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit_per_host=HTTP_POOL_PER_HOST, ttl_dns_cache=300)
+        session = aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS)
+        _async_sessions[loop] = session
+    return session
+
+
+async def close_async_session():
+    """Schließt die Session des laufenden Event Loops (z.B. bevor ein kurzlebiger Loop endet)"""
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponentielles Backoff mit Jitter - wie urllib3 Retry(backoff_factor, backoff_jitter)"""
+    return HTTP_RETRY_BACKOFF * (2 ** attempt) + random.uniform(0, HTTP_RETRY_BACKOFF)
+
+
+async def afetch(session: aiohttp.ClientSession, url: str, headers: Optional[Dict] = None,
+                 timeout: float = 10) -> bytes:
+    """
+    GET mit begrenzten Retries und Backoff auf einer aiohttp-Session
+
+    Args:
+        session: aiohttp-Session (z.B. get_async_session())
+        url: Abzurufende URL
+        headers: Optional - zusätzliche Header
+        timeout: Timeout pro Versuch in Sekunden
+
+    Returns:
+        bytes: Response-Body (bereits dekomprimiert)
+
+    Raises:
+        aiohttp.ClientError, asyncio.TimeoutError: Wenn auch der letzte Versuch scheitert
+    """
+    return (await afetch_response(session, url, headers, timeout)).body
+
+
+def _take_chunk(chunk: bytes, size: int, max_bytes: Optional[int]) -> Tuple[bytes, bool]:
+    """Kürzt einen Chunk auf das verbleibende Byte-Budget - (Chunk, Budget erschöpft)"""
+    if max_bytes is not None and size + len(chunk) > max_bytes:
+        return chunk[:max_bytes - size], True
+    return chunk, False
+
+
+async def _aread_body(response: aiohttp.ClientResponse, max_bytes: Optional[int],
+                      reader: Optional[ChunkReader]) -> Tuple[bytes, bool]:
+    """Liest den Body in Chunks bis zum Ende, zum Byte-Limit oder bis der Leser fertig ist"""
+    chunks, size = [], 0
+    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+        chunk, exhausted = _take_chunk(chunk, size, max_bytes)
+        chunks.append(chunk)
+        size += len(chunk)
+        done = reader(chunk) if reader is not None else False
+        if exhausted or done:
+            # Rest nicht mehr lesen - die Verbindung wird geschlossen statt in den Pool zurückgegeben
+            return b"".join(chunks), True
+    return b"".join(chunks), False
+
+
+def _read_body(chunks: Iterable[bytes], max_bytes: Optional[int],
+               reader: Optional[ChunkReader]) -> Tuple[bytes, bool]:
+    """Sync-Gegenstück zu _aread_body für requests (iter_content)"""
+    body, size = [], 0
+    for chunk in chunks:
+        chunk, exhausted = _take_chunk(chunk, size, max_bytes)
+        body.append(chunk)
+        size += len(chunk)
+        done = reader(chunk) if reader is not None else False
+        if exhausted or done:
+            return b"".join(body), True
+    return b"".join(body), False
+
+
+def fetch_response(url: str, headers: Optional[Dict] = None, timeout: float = 10,
+                   max_bytes: Optional[int] = None, reader: Optional[Callable[[], ChunkReader]] = None) -> FetchResponse:
+    """
+    GET auf der geteilten requests-Session, Body gestreamt (Retries übernimmt der Adapter der Session)
+
+    Args:
+        url: Abzurufende URL
+        headers: Optional - zusätzliche Header
+        timeout: Timeout in Sekunden
+        max_bytes: Optional - höchstens so viele (dekomprimierte) Bytes lesen, danach abbrechen
+        reader: Optional - Fabrik für einen Leser, der jeden Chunk bekommt und mit True den Download beendet
+
+    Returns:
+        FetchResponse: Status, Header und (ggf. gekürzter) Body
+
+    Raises:
+        requests.RequestException: Bei Verbindungsfehlern und HTTP-Fehlern (>= 400)
+        SourceUnavailableError: Host-Circuit offen oder URL kürzlich fehlgeschlagen (ohne Request)
+    """
+    circuit_breaker.before_request(url)
+    try:
+        with get_session().get(url, headers=headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            chunks = response.iter_content(STREAM_CHUNK_SIZE)
+            body, truncated = _read_body(chunks, max_bytes, reader() if reader is not None else None)
+            result = FetchResponse(response.status_code, response.headers, body, truncated)
+    except requests.HTTPError as e:
+        _record_status(url, e.response.status_code if e.response is not None else None)
+        raise
+    except (requests.ConnectionError, requests.Timeout) as e:
+        circuit_breaker.record_failure(url, type(e).__name__)
+        raise
+    except BaseException:
+        circuit_breaker.release(url)
+        raise
+    circuit_breaker.record_success(url)
+    return result
+
+
+def _record_status(url: str, status: Optional[int]):
+    """HTTP-Fehler: 5xx/429 zählen als Ausfall des Hosts, andere Statuscodes (z.B. 404) als Antwort"""
+    if status is None or status in RETRY_STATUS_CODES or status >= 500:
+        circuit_breaker.record_failure(url, f"HTTP {status}")
+    else:
+        circuit_breaker.record_success(url)
+
+
+async def afetch_response(session: aiohttp.ClientSession, url: str, headers: Optional[Dict] = None,
+                          timeout: float = 10, max_bytes: Optional[int] = None,
+                          reader: Optional[Callable[[], ChunkReader]] = None) -> FetchResponse:
+    """
+    Wie afetch, liefert aber auch Status und Header (z.B. 304 bei Conditional GET)
+
+    Wiederholt bei Verbindungsfehlern, Timeouts und RETRY_STATUS_CODES;
+    andere HTTP-Fehler (>= 400) werden sofort ausgelöst.
+
+    Args:
+        max_bytes: Optional - höchstens so viele (dekomprimierte) Bytes lesen, danach abbrechen
+        reader: Optional - Fabrik für einen Leser, der jeden Chunk bekommt und mit True den Download
+                beendet; pro Versuch wird ein neuer Leser erstellt (ein abgebrochener Versuch
+                hinterlässt keinen halb gefütterten Leser)
+
+    Returns:
+        FetchResponse: Status, Header und (ggf. gekürzter) Body
+
+    Raises:
+        aiohttp.ClientError, asyncio.TimeoutError: Wenn auch der letzte Versuch scheitert
+        SourceUnavailableError: Host-Circuit offen oder URL kürzlich fehlgeschlagen (ohne Request)
+    """
+    circuit_breaker.before_request(url)
+    try:
+        response = await _afetch_attempts(session, url, headers, timeout, max_bytes, reader)
+    except aiohttp.ClientResponseError as e:
+        _record_status(url, e.status)
+        raise
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+        circuit_breaker.record_failure(url, type(e).__name__)
+        raise
+    except BaseException:
+        # z.B. abgebrochen, weil das Recherche-Budget abgelaufen ist - kein Urteil über den Host
+        circuit_breaker.release(url)
+        raise
+    circuit_breaker.record_success(url)
+    return response
+
+
+async def _afetch_attempts(session: aiohttp.ClientSession, url: str, headers: Optional[Dict], timeout: float,
+                           max_bytes: Optional[int], reader: Optional[Callable[[], ChunkReader]]) -> FetchResponse:
+    """Versuche von afetch_response (Retries mit Backoff)"""
+    for attempt in range(HTTP_RETRIES + 1):
+        last_attempt = attempt == HTTP_RETRIES
+        try:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status in RETRY_STATUS_CODES and not last_attempt:
+                    logger.warning(f"🔁 {url}: HTTP {response.status} - Versuch {attempt + 2}/{HTTP_RETRIES + 1}")
+                else:
+                    response.raise_for_status()
+                    if max_bytes is None and reader is None:
+                        return FetchResponse(response.status, response.headers, await response.read())
+                    body, truncated = await _aread_body(response, max_bytes, reader() if reader is not None else None)
+                    return FetchResponse(response.status, response.headers, body, truncated)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if last_attempt:
+                raise
+            logger.warning(f"🔁 {url}: {type(e).__name__} - Versuch {attempt + 2}/{HTTP_RETRIES + 1}")
+        await asyncio.sleep(_backoff_delay(attempt))
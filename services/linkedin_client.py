@@ -1,17 +1,20 @@
 """
 LinkedIn API Client für das Posting von LinkedIn-Posts mit Bildern
 """
-import requests
+import aiohttp
 import os
 import tempfile
 from typing import Dict, Optional, Union
 import logging
 from config import (
     LINKEDIN_ACCESS_TOKEN,
+    LINKEDIN_API_BASE_URL,
     LINKEDIN_ORGANIZATION_ID,
     LINKEDIN_COMPANY_NAME
 )
 from persistent_linkedin_auth import get_linkedin_credentials
+from pipeline import span
+from services.http_session import get_async_session, get_session
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +26,9 @@ class LinkedInClient:
         self.access_token = LINKEDIN_ACCESS_TOKEN
         self.organization_id = LINKEDIN_ORGANIZATION_ID
         self.company_name = LINKEDIN_COMPANY_NAME or "Invory"
-        self.base_url = "https://api.linkedin.com/v2"
+        self.base_url = LINKEDIN_API_BASE_URL
+        # Geteilte Session: Keep-Alive-Verbindungen zur LinkedIn API über Posts hinweg
+        self.session = get_session()
         
         # Falls keine statischen Credentials, verwende persistente Token-Verwaltung
         if not self.access_token:
@@ -67,6 +72,58 @@ class LinkedInClient:
         # Verwende persönlichen Post mit Standard-Scopes
         return self._create_personal_post(text, visibility, image_url, image_path)
     
+    async def acreate_post(self, text: str, visibility: str = "PUBLIC", image_url: str = None, image_path: str = None) -> Optional[Dict]:
+        """
+        Async-Variante von create_post (aiohttp statt requests)
+        
+        Args:
+            text: Post-Text
+            visibility: Sichtbarkeit (PUBLIC, CONNECTIONS, LOGGED_IN_MEMBERS)
+            image_url: URL eines Bildes zum Download und Upload
+            image_path: Lokaler Pfad zu einem Bild
+            
+        Returns:
+            dict: Antwort von LinkedIn API oder None bei Fehler
+        """
+        if not self.access_token:
+            print("❌ Kein LinkedIn Access Token verfügbar")
+            return None
+        
+        return await self._acreate_personal_post(get_async_session(), text, visibility, image_url, image_path)
+    
+    def _build_post_payload(self, person_urn: str, text: str, visibility: str, media_asset_urn: Optional[str]) -> Dict:
+        """Erstellt den ugcPosts-Payload (mit Bild, falls eine Asset URN vorhanden ist)"""
+        share_content = {
+            "shareCommentary": {
+                "text": text
+            },
+            "shareMediaCategory": "NONE"
+        }
+        
+        if media_asset_urn:
+            # Post mit Bild
+            share_content["shareMediaCategory"] = "IMAGE"
+            share_content["media"] = [
+                {
+                    "status": "READY",
+                    "description": {
+                        "text": "XRechnung Illustration"
+                    },
+                    "media": media_asset_urn
+                }
+            ]
+        
+        return {
+            "author": person_urn,
+            "lifecycleState": "PUBLISHED",
+            "specificContent": {
+                "com.linkedin.ugc.ShareContent": share_content
+            },
+            "visibility": {
+                "com.linkedin.ugc.MemberNetworkVisibility": visibility
+            }
+        }
+    
     def _create_personal_post(self, text: str, visibility: str = "PUBLIC", image_url: str = None, image_path: str = None) -> Optional[Dict]:
         """Erstellt einen persönlichen LinkedIn-Post optional mit Bild"""
         try:
@@ -81,59 +138,18 @@ class LinkedInClient:
             # Bearbeite Bild falls vorhanden
             media_asset_urn = None
             if image_url or image_path:
-                media_asset_urn = self._upload_image(image_url, image_path, person_urn)
-            
-            # Basis-Payload
-            if media_asset_urn:
-                # Post mit Bild
-                payload = {
-                    "author": person_urn,
-                    "lifecycleState": "PUBLISHED",
-                    "specificContent": {
-                        "com.linkedin.ugc.ShareContent": {
-                            "shareCommentary": {
-                                "text": text
-                            },
-                            "shareMediaCategory": "IMAGE",
-                            "media": [
-                                {
-                                    "status": "READY",
-                                    "description": {
-                                        "text": "XRechnung Illustration"
-                                    },
-                                    "media": media_asset_urn
-                                }
-                            ]
-                        }
-                    },
-                    "visibility": {
-                        "com.linkedin.ugc.MemberNetworkVisibility": visibility
-                    }
-                }
-            else:
-                # Post ohne Bild
-                payload = {
-                    "author": person_urn,
-                    "lifecycleState": "PUBLISHED",
-                    "specificContent": {
-                        "com.linkedin.ugc.ShareContent": {
-                            "shareCommentary": {
-                                "text": text
-                            },
-                            "shareMediaCategory": "NONE"
-                        }
-                    },
-                    "visibility": {
-                        "com.linkedin.ugc.MemberNetworkVisibility": visibility
-                    }
-                }
+                with span("linkedin.upload"):
+                    media_asset_urn = self._upload_image(image_url, image_path, person_urn)
             
-            response = requests.post(
-                endpoint,
-                headers=self.headers,
-                json=payload,
-                timeout=10
-            )
+            payload = self._build_post_payload(person_urn, text, visibility, media_asset_urn)
+            
+            with span("linkedin.post"):
+                response = self.session.post(
+                    endpoint,
+                    headers=self.headers,
+                    json=payload,
+                    timeout=10
+                )
             
             if response.status_code in [200, 201]:
                 print("✅ Persönlicher LinkedIn-Post erfolgreich erstellt")
@@ -146,20 +162,45 @@ class LinkedInClient:
             print(f"❌ Fehler bei LinkedIn persönlichem Post: {str(e)}")
             return None
     
+    async def _acreate_personal_post(self, session: aiohttp.ClientSession, text: str, visibility: str = "PUBLIC",
+                                     image_url: str = None, image_path: str = None) -> Optional[Dict]:
+        """Async-Variante von _create_personal_post"""
+        try:
+            person_urn = await self._aget_person_urn(session)
+            if not person_urn:
+                print("Fehler: Konnte Person URN nicht ermitteln")
+                return None
+            
+            media_asset_urn = None
+            if image_url or image_path:
+                with span("linkedin.upload"):
+                    media_asset_urn = await self._aupload_image(session, image_url, image_path, person_urn)
+            
+            payload = self._build_post_payload(person_urn, text, visibility, media_asset_urn)
+            
+            with span("linkedin.post"):
+                async with session.post(f"{self.base_url}/ugcPosts", headers=self.headers, json=payload,
+                                        timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    if response.status in [200, 201]:
+                        print("✅ Persönlicher LinkedIn-Post erfolgreich erstellt")
+                        return await response.json(content_type=None)
+                    print(f"❌ Fehler beim persönlichen Post: {response.status}")
+                    print(f"Response: {await response.text()}")
+                    return None
+        except Exception as e:
+            print(f"❌ Fehler bei LinkedIn persönlichem Post: {str(e)}")
+            return None
+    
     def _get_person_urn(self) -> Optional[str]:
         """Holt die Person URN für persönliche Posts mit korrekter LinkedIn ID"""
         try:
             # Verwende OpenID userinfo endpoint - das funktioniert mit Standard-Scopes
-            userinfo_endpoint = "https://api.linkedin.com/v2/userinfo"
-            response = requests.get(userinfo_endpoint, headers=self.headers, timeout=10)
+            response = self.session.get(f"{self.base_url}/userinfo", headers=self.headers, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
-                # OpenID userinfo gibt uns die 'sub' (subject) ID
-                person_id = data.get('sub')
-                if person_id:
-                    print(f"✅ Person ID gefunden: {person_id}")
-                    return f"urn:li:person:{person_id}"
+                person_urn = self._person_urn_from_userinfo(response.json())
+                if person_urn:
+                    return person_urn
             
             print(f"❌ Userinfo Fehler: {response.status_code} - {response.text}")
             return None
@@ -168,6 +209,36 @@ class LinkedInClient:
             print(f"❌ Fehler bei Person URN Abruf: {str(e)}")
             return None
     
+    async def _aget_person_urn(self, session: aiohttp.ClientSession) -> Optional[str]:
+        """Async-Variante von _get_person_urn"""
+        try:
+            async with session.get(f"{self.base_url}/userinfo", headers=self.headers,
+                                   timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 200:
+                    person_urn = self._person_urn_from_userinfo(await response.json(content_type=None))
+                    if person_urn:
+                        return person_urn
+                
+                print(f"❌ Userinfo Fehler: {response.status} - {await response.text()}")
+                return None
+        except Exception as e:
+            print(f"❌ Fehler bei Person URN Abruf: {str(e)}")
+            return None
+    
+    def _person_urn_from_userinfo(self, data: Dict) -> Optional[str]:
+        """OpenID userinfo gibt uns die 'sub' (subject) ID"""
+        person_id = data.get('sub')
+        if person_id:
+            print(f"✅ Person ID gefunden: {person_id}")
+            return f"urn:li:person:{person_id}"
+        return None
+    
+    def _image_filename(self, image_url: str) -> str:
+        """Versuche Dateiname aus URL zu extrahieren"""
+        if '.' in image_url.split('/')[-1]:
+            return image_url.split('/')[-1].split('?')[0]
+        return "xrechnung_image.png"
+    
     def _upload_image(self, image_url: str = None, image_path: str = None, person_urn: str = None) -> Optional[str]:
         """
         Lädt ein Bild zu LinkedIn hoch und gibt die Asset URN zurück
@@ -187,12 +258,10 @@ class LinkedInClient:
             
             if image_url:
                 print(f"📥 Lade Bild von URL herunter: {image_url[:50]}...")
-                response = requests.get(image_url, timeout=30)
+                response = self.session.get(image_url, timeout=30)
                 response.raise_for_status()
                 image_data = response.content
-                # Versuche Dateiname aus URL zu extrahieren
-                if '.' in image_url.split('/')[-1]:
-                    filename = image_url.split('/')[-1].split('?')[0]
+                filename = self._image_filename(image_url)
                     
             elif image_path and os.path.exists(image_path):
                 print(f"📁 Lade Bild von lokalem Pfad: {image_path}")
@@ -206,26 +275,15 @@ class LinkedInClient:
                 
             # Schritt 1: Registriere Upload
             register_response = self._register_image_upload(person_urn, filename)
-            if not register_response:
-                print("❌ Image Upload Registrierung fehlgeschlagen")
-                return None
-                
-            upload_url = register_response.get('value', {}).get('uploadMechanism', {}).get('com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest', {}).get('uploadUrl')
-            asset_urn = register_response.get('value', {}).get('asset')
-            
-            if not upload_url or not asset_urn:
-                print("❌ Upload URL oder Asset URN fehlt")
+            upload_url, asset_urn = self._parse_upload_target(register_response)
+            if not upload_url:
                 return None
             
             # Schritt 2: Lade Bild hoch
             print(f"📤 Lade Bild zu LinkedIn hoch...")
-            upload_headers = {
-                "Authorization": f"Bearer {self.access_token}"
-            }
-            
-            upload_response = requests.put(
+            upload_response = self.session.put(
                 upload_url,
-                headers=upload_headers,
+                headers=self._upload_headers(),
                 data=image_data,
                 timeout=60
             )
@@ -241,28 +299,94 @@ class LinkedInClient:
             print(f"❌ Fehler beim Bild-Upload: {str(e)}")
             return None
     
+    async def _aupload_image(self, session: aiohttp.ClientSession, image_url: str = None,
+                             image_path: str = None, person_urn: str = None) -> Optional[str]:
+        """Async-Variante von _upload_image"""
+        try:
+            image_data = None
+            filename = "xrechnung_image.png"
+            
+            if image_url:
+                print(f"📥 Lade Bild von URL herunter: {image_url[:50]}...")
+                async with session.get(image_url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                    response.raise_for_status()
+                    image_data = await response.read()
+                filename = self._image_filename(image_url)
+            elif image_path and os.path.exists(image_path):
+                print(f"📁 Lade Bild von lokalem Pfad: {image_path}")
+                with open(image_path, 'rb') as f:
+                    image_data = f.read()
+                filename = os.path.basename(image_path)
+            
+            if not image_data:
+                print("❌ Keine gültigen Bilddaten gefunden")
+                return None
+            
+            register_response = await self._aregister_image_upload(session, person_urn, filename)
+            upload_url, asset_urn = self._parse_upload_target(register_response)
+            if not upload_url:
+                return None
+            
+            print(f"📤 Lade Bild zu LinkedIn hoch...")
+            async with session.put(upload_url, headers=self._upload_headers(), data=image_data,
+                                   timeout=aiohttp.ClientTimeout(total=60)) as upload_response:
+                if upload_response.status in [200, 201]:
+                    print(f"✅ Bild erfolgreich hochgeladen: {asset_urn}")
+                    return asset_urn
+                print(f"❌ Bild-Upload fehlgeschlagen: {upload_response.status}")
+                return None
+                
+        except Exception as e:
+            print(f"❌ Fehler beim Bild-Upload: {str(e)}")
+            return None
+    
+    def _upload_headers(self) -> Dict:
+        return {
+            "Authorization": f"Bearer {self.access_token}"
+        }
+    
+    def _parse_upload_target(self, register_response: Optional[Dict]):
+        """
+        Liest Upload-URL und Asset URN aus der Upload-Registrierung
+        
+        Returns:
+            tuple: (upload_url, asset_urn) oder (None, None) bei Fehler
+        """
+        if not register_response:
+            print("❌ Image Upload Registrierung fehlgeschlagen")
+            return None, None
+        
+        upload_url = register_response.get('value', {}).get('uploadMechanism', {}).get('com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest', {}).get('uploadUrl')
+        asset_urn = register_response.get('value', {}).get('asset')
+        
+        if not upload_url or not asset_urn:
+            print("❌ Upload URL oder Asset URN fehlt")
+            return None, None
+        return upload_url, asset_urn
+    
+    def _build_register_upload_payload(self, person_urn: str) -> Dict:
+        return {
+            "registerUploadRequest": {
+                "recipes": ["urn:li:digitalmediaRecipe:feedshare-image"],
+                "owner": person_urn,
+                "serviceRelationships": [
+                    {
+                        "relationshipType": "OWNER",
+                        "identifier": "urn:li:userGeneratedContent"
+                    }
+                ]
+            }
+        }
+    
     def _register_image_upload(self, person_urn: str, filename: str) -> Optional[Dict]:
         """Registriert einen Bild-Upload bei LinkedIn"""
         try:
             endpoint = f"{self.base_url}/assets?action=registerUpload"
             
-            payload = {
-                "registerUploadRequest": {
-                    "recipes": ["urn:li:digitalmediaRecipe:feedshare-image"],
-                    "owner": person_urn,
-                    "serviceRelationships": [
-                        {
-                            "relationshipType": "OWNER",
-                            "identifier": "urn:li:userGeneratedContent"
-                        }
-                    ]
-                }
-            }
-            
-            response = requests.post(
+            response = self.session.post(
                 endpoint,
                 headers=self.headers,
-                json=payload,
+                json=self._build_register_upload_payload(person_urn),
                 timeout=30
             )
             
@@ -277,6 +401,22 @@ class LinkedInClient:
         except Exception as e:
             print(f"❌ Fehler bei Upload-Registrierung: {str(e)}")
             return None
+    
+    async def _aregister_image_upload(self, session: aiohttp.ClientSession, person_urn: str, filename: str) -> Optional[Dict]:
+        """Async-Variante von _register_image_upload"""
+        try:
+            async with session.post(f"{self.base_url}/assets?action=registerUpload", headers=self.headers,
+                                    json=self._build_register_upload_payload(person_urn),
+                                    timeout=aiohttp.ClientTimeout(total=30)) as response:
+                if response.status in [200, 201]:
+                    print("✅ Bild-Upload registriert")
+                    return await response.json(content_type=None)
+                print(f"❌ Upload-Registrierung fehlgeschlagen: {response.status}")
+                print(f"Response: {await response.text()}")
+                return None
+        except Exception as e:
+            print(f"❌ Fehler bei Upload-Registrierung: {str(e)}")
+            return None
 
     def _create_organization_post(self, text: str, visibility: str = "PUBLIC") -> Optional[Dict]:
         """
@@ -310,7 +450,7 @@ class LinkedInClient:
                 }
             }
             
-            response = requests.post(
+            response = self.session.post(
                 endpoint,
                 headers=self.headers,
                 json=payload,
@@ -364,7 +504,7 @@ class LinkedInClient:
                 "publishedAt": scheduled_time
             }
             
-            response = requests.post(
+            response = self.session.post(
                 endpoint,
                 headers=self.headers,
                 json=payload,
@@ -397,7 +537,7 @@ class LinkedInClient:
                 "projection": "(elements*(organization~(id,localizedName)))"
             }
             
-            response = requests.get(
+            response = self.session.get(
                 endpoint,
                 headers=self.headers,
                 params=params,
@@ -450,7 +590,7 @@ class LinkedInClient:
         try:
             endpoint = f"{self.base_url}/people/~"
             
-            response = requests.get(
+            response = self.session.get(
                 endpoint,
                 headers=self.headers,
                 timeout=10
@@ -504,7 +644,7 @@ class LinkedInClient:
                 "count": min(count, 50)
             }
             
-            response = requests.get(
+            response = self.session.get(
                 endpoint,
                 headers=self.headers,
                 params=params,
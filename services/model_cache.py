@@ -0,0 +1,177 @@
+"""
+Model Response Cache - Antworten von Modell-Aufrufen (DALL-E, LLMs) auf der Platte
+
+Der Schlüssel ist ein Hash über Modell, Prompt und Parameter (content-addressed):
+gleicher Aufruf → gleiche Datei unter <cache_dir>/<key>.json. Preview-Läufe und
+Tests spielen wiederholte Aufrufe damit sofort und ohne API-Kosten ab; echte
+Posts übergeben use_cache=False und rufen das Modell immer neu auf.
+
+- Einträge älter als ttl_seconds gelten als Miss (DALL-E-URLs laufen nach etwa
+  einer Stunde ab)
+- Überschreitet das Verzeichnis max_bytes, fallen die am längsten nicht mehr
+  genutzten Einträge heraus (LRU über die Datei-mtime, die jeder Treffer erneuert)
+- Mehrere Prozesse (Scheduler, Railway-Service) teilen sich das Verzeichnis
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+import logging
+from config import MODEL_CACHE_DIR, MODEL_CACHE_ENABLED, MODEL_CACHE_MAX_MB, MODEL_CACHE_TTL_MINUTES
+
+logger = logging.getLogger(__name__)
+
+
+def model_cache_key(model: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Bildet den Cache-Schlüssel eines Modell-Aufrufs
+
+    Args:
+        model: Modellname (z.B. dall-e-3)
+        prompt: Prompt des Aufrufs
+        params: Optional - weitere Parameter, die die Antwort beeinflussen (Größe, Qualität, Temperatur, ...)
+
+    Returns:
+        str: SHA-256 über Modell, Prompt und Parameter (unabhängig von der Reihenfolge der Parameter)
+    """
+    payload = json.dumps({"model": model, "prompt": prompt, "params": params or {}},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ModelResponseCache:
+    """Speichert JSON-serialisierbare Modell-Antworten als Dateien (LRU nach Gesamtgröße, TTL)"""
+
+    def __init__(self, cache_dir: str = MODEL_CACHE_DIR, max_bytes: int = int(MODEL_CACHE_MAX_MB * 1024 * 1024),
+                 ttl_seconds: float = MODEL_CACHE_TTL_MINUTES * 60, enabled: bool = MODEL_CACHE_ENABLED):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Liefert eine gespeicherte Antwort und markiert sie als zuletzt genutzt
+
+        Args:
+            key: Schlüssel aus model_cache_key
+
+        Returns:
+            Antwort oder None (kein Eintrag, abgelaufen oder Cache deaktiviert)
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Modell-Cache-Eintrag {key[:12]} nicht lesbar: {e}")
+            return None
+        if time.time() - entry.get("stored_at", 0) >= self.ttl_seconds:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["response"]
+
+    def put(self, key: str, response: Any, model: Optional[str] = None):
+        """
+        Speichert eine Antwort atomar und räumt bei Überschreitung von max_bytes auf
+
+        Args:
+            key: Schlüssel aus model_cache_key
+            response: JSON-serialisierbare Antwort
+            model: Optional - Modellname (nur zur Orientierung in der Datei)
+        """
+        if not self.enabled:
+            return
+        tmp_file = f"{self._path(key)}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"stored_at": time.time(), "model": model, "response": response}, f, ensure_ascii=False)
+            os.replace(tmp_file, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"❌ Fehler beim Speichern im Modell-Cache: {e}")
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            return
+        self._evict()
+
+    def _evict(self):
+        """Entfernt die am längsten nicht genutzten Einträge, bis das Verzeichnis unter max_bytes liegt"""
+        with self._lock:
+            entries = []
+            with os.scandir(self.cache_dir) as scan:
+                for item in scan:
+                    if item.name.endswith(".json"):
+                        try:
+                            stat = item.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime, stat.st_size, item.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total -= size
+
+    def call(self, model: str, prompt: str, fetch: Callable[[], Any], params: Optional[Dict[str, Any]] = None,
+             use_cache: bool = True) -> Any:
+        """
+        Führt einen Modell-Aufruf aus oder spielt ihn aus dem Cache ab
+
+        Args:
+            model: Modellname
+            prompt: Prompt des Aufrufs
+            fetch: Eigentlicher Aufruf ohne Argumente, liefert eine JSON-serialisierbare Antwort
+            params: Optional - weitere Parameter für den Schlüssel
+            use_cache: False = Cache für diesen Aufruf umgehen (weder lesen noch schreiben)
+
+        Returns:
+            Antwort des Modells bzw. gespeicherte Antwort
+        """
+        if not use_cache:
+            return fetch()
+        key = model_cache_key(model, prompt, params)
+        cached = self.get(key)
+        if cached is not None:
+            logger.info(f"📦 Modell-Cache-Treffer: {model}")
+            return cached
+        response = fetch()
+        self.put(key, response, model)
+        return response
+
+    async def acall(self, model: str, prompt: str, afetch: Callable[[], Awaitable[Any]],
+                    params: Optional[Dict[str, Any]] = None, use_cache: bool = True) -> Any:
+        """Async-Variante von call (afetch liefert ein Awaitable)"""
+        if not use_cache:
+            return await afetch()
+        key = model_cache_key(model, prompt, params)
+        cached = self.get(key)
+        if cached is not None:
+            logger.info(f"📦 Modell-Cache-Treffer: {model}")
+            return cached
+        response = await afetch()
+        self.put(key, response, model)
+        return response
+
+# Singleton Instance
+model_cache = ModelResponseCache()
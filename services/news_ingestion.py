@@ -0,0 +1,406 @@
+"""
+News Ingestion - RSS/Atom-Feeds der XRECHNUNG_NEWS_SOURCES in einen lokalen News-Store
+
+- Feeds: NEWS_FEED_URLS bzw. per Autodiscovery (<link rel="alternate"> auf den
+  Startseiten der News-Quellen, Ergebnis wird im Store gemerkt)
+- Abruf aller Feeds parallel über die geteilte Session und den Seiten-Cache
+  (Conditional GET - unveränderte Feeds werden nicht erneut geladen/geparst)
+- Streaming-Parse mit lxml iterparse (verarbeitete Einträge werden sofort freigegeben)
+- Deduplizierung über normalisierte Links und Titel, auch quellenübergreifend
+- Relevanz über XRECHNUNG_KEYWORDS (Treffer im Titel zählen doppelt); Einträge
+  ohne Keyword-Treffer werden verworfen
+
+Die Recherche liest nur aus dem Store (indizierte Abfrage, kein Live-Abruf);
+aktualisiert wird er vom Scheduler bzw. mit `python main.py --mode news`.
+"""
+import asyncio
+import hashlib
+import html
+import io
+import os
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urldefrag, urlencode, urljoin, urlparse, urlunparse
+import aiohttp
+import logging
+from lxml import etree
+from config import (
+    NEWS_DB_FILE, NEWS_FEED_URLS, NEWS_MAX_AGE_DAYS, NEWS_REFRESH_MINUTES, SCRAPE_MAX_BYTES,
+    XRECHNUNG_KEYWORDS, XRECHNUNG_NEWS_SOURCES
+)
+from services.http_cache import PageCache, page_cache
+from services.http_session import close_async_session, get_async_session
+from services.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+FEED_DISCOVERY_DAYS = 7  # Autodiscovery der Feeds pro Quelle höchstens so oft wiederholen
+MAX_SUMMARY_LENGTH = 300
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS news_items (
+    id TEXT PRIMARY KEY,
+    title_key TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    summary TEXT,
+    link TEXT,
+    source TEXT,
+    published TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    relevance TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_news_published ON news_items (published);
+CREATE TABLE IF NOT EXISTS feeds (
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    discovered_at TEXT NOT NULL,
+    PRIMARY KEY (source, url)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _source_label(url: str) -> str:
+    """Quellenname aus der URL (wie bei den News-Scraper-Profilen), z.B. xrechnung.org"""
+    return urlparse(url).netloc.removeprefix("www.")
+
+
+def _normalize_link(link: str) -> str:
+    """Link ohne Fragment und Tracking-Parameter (utm_*), Host kleingeschrieben"""
+    parts = urlparse(urldefrag(link)[0])
+    query = urlencode([(key, value) for key, value in parse_qsl(parts.query) if not key.startswith("utm_")])
+    return urlunparse(parts._replace(netloc=parts.netloc.lower(), query=query))
+
+
+def _key(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+def _plain_text(value: Optional[str]) -> str:
+    """Entfernt HTML aus Feed-Texten und fasst Whitespace zusammen"""
+    return " ".join(html.unescape(_TAG_PATTERN.sub(" ", value or "")).split())
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """RFC 822 (RSS pubDate) oder ISO 8601 (Atom) → UTC"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+class NewsStore:
+    """SQLite-Store für News-Einträge, entdeckte Feeds und den Zeitpunkt der letzten Ingestion"""
+
+    def __init__(self, db_file: str = NEWS_DB_FILE):
+        self.db_file = db_file
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # Eine Verbindung pro Aufruf - Recherche-Threads und Scheduler greifen parallel zu
+        connection = sqlite3.connect(self.db_file, timeout=10)
+        connection.row_factory = sqlite3.Row
+        if not self._initialized:
+            directory = os.path.dirname(self.db_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            self._initialized = True
+        return connection
+
+    def add_items(self, items: Iterable[Dict]) -> int:
+        """
+        Speichert neue Einträge; bereits bekannte Links oder Titel werden ignoriert
+
+        Returns:
+            int: Anzahl neu gespeicherter Einträge
+        """
+        rows = [(item["id"], item["title_key"], item["title"], item["summary"], item["link"], item["source"],
+                 item["published"], item["fetched_at"], item["score"], item["relevance"]) for item in items]
+        with closing(self._connect()) as connection, connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO news_items (id, title_key, title, summary, link, source, published,"
+                " fetched_at, score, relevance) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            return connection.total_changes - before
+
+    def latest(self, limit: int = 7, max_age_days: int = NEWS_MAX_AGE_DAYS) -> List[Dict]:
+        """
+        Relevanteste News der letzten Tage (indizierte Abfrage)
+
+        Args:
+            limit: Maximale Anzahl
+            max_age_days: Nur Einträge, die höchstens so alt sind
+
+        Returns:
+            list: Einträge mit title, summary, source, relevance, link, published - relevanteste und neueste zuerst
+        """
+        cutoff = (_now() - timedelta(days=max_age_days)).isoformat()
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT title, summary, source, relevance, link, published FROM news_items"
+                " WHERE published >= ? ORDER BY score DESC, published DESC LIMIT ?", (cutoff, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def prune(self, max_age_days: int = NEWS_MAX_AGE_DAYS) -> int:
+        """Entfernt Einträge, die älter als max_age_days sind; Returns: Anzahl entfernter Einträge"""
+        cutoff = (_now() - timedelta(days=max_age_days)).isoformat()
+        with closing(self._connect()) as connection, connection:
+            return connection.execute("DELETE FROM news_items WHERE published < ?", (cutoff,)).rowcount
+
+    def get_feeds(self, source: str, max_age_days: int = FEED_DISCOVERY_DAYS) -> Optional[List[str]]:
+        """Gemerkte Feeds einer Quelle oder None, wenn die Autodiscovery (erneut) laufen muss"""
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT url, discovered_at FROM feeds WHERE source = ?", (source,)).fetchall()
+        if not rows or min(row["discovered_at"] for row in rows) < (_now() - timedelta(days=max_age_days)).isoformat():
+            return None
+        # Leerer Eintrag (url = "") merkt sich Quellen ohne Feed
+        return [row["url"] for row in rows if row["url"]]
+
+    def set_feeds(self, source: str, urls: List[str]):
+        """Merkt sich die Feeds einer Quelle (auch keine, damit nicht bei jedem Lauf gesucht wird)"""
+        discovered_at = _now().isoformat()
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM feeds WHERE source = ?", (source,))
+            connection.executemany("INSERT INTO feeds (source, url, discovered_at) VALUES (?, ?, ?)",
+                                   [(source, url, discovered_at) for url in urls or [""]])
+
+    def last_ingest(self) -> Optional[datetime]:
+        """Zeitpunkt der letzten Ingestion (UTC) oder None"""
+        with closing(self._connect()) as connection:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'last_ingest'").fetchone()
+        return datetime.fromisoformat(row["value"]) if row else None
+
+    def mark_ingested(self):
+        with closing(self._connect()) as connection, connection:
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_ingest', ?)",
+                               (_now().isoformat(),))
+
+
+class _FeedLinkTarget:
+    """lxml-Parser-Target: sammelt <link rel="alternate" type="application/rss+xml|atom+xml"> einer Seite"""
+
+    def __init__(self):
+        self.feeds: List[str] = []
+
+    def start(self, tag, attrib):
+        if tag == "link" and "alternate" in attrib.get("rel", "").lower().split() \
+                and attrib.get("type", "").lower() in FEED_TYPES and attrib.get("href"):
+            self.feeds.append(attrib["href"])
+
+    def close(self):
+        return self.feeds
+
+
+class NewsIngestor:
+    """Holt die Feeds der News-Quellen und füllt den News-Store"""
+
+    def __init__(self, store: NewsStore = None, sources: List[str] = None, feed_urls: List[str] = None,
+                 keywords: Iterable[str] = XRECHNUNG_KEYWORDS, refresh_minutes: float = NEWS_REFRESH_MINUTES,
+                 max_age_days: int = NEWS_MAX_AGE_DAYS, cache: PageCache = page_cache):
+        """
+        Args:
+            store: News-Store (Standard: news_store)
+            sources: Startseiten für die Feed-Autodiscovery (Standard: XRECHNUNG_NEWS_SOURCES)
+            feed_urls: Feste Feed-URLs zusätzlich zur Autodiscovery (Standard: NEWS_FEED_URLS)
+            keywords: Keywords für die Relevanzbewertung
+            refresh_minutes: ingest_if_stale ruft die Feeds höchstens so oft ab
+            max_age_days: Ältere Einträge werden nicht übernommen bzw. aus dem Store entfernt
+            cache: Seiten-Cache für Conditional GET
+        """
+        self.store = store or news_store
+        self.sources = list(XRECHNUNG_NEWS_SOURCES if sources is None else sources)
+        self.feed_urls = list(NEWS_FEED_URLS if feed_urls is None else feed_urls)
+        self.matcher = KeywordMatcher(keywords)
+        self.refresh_minutes = refresh_minutes
+        self.max_age_days = max_age_days
+        self.cache = cache
+
+    def ingest(self) -> int:
+        """
+        Synchrone Variante von aingest (eigener Event Loop, z.B. aus dem Scheduler)
+
+        Returns:
+            int: Anzahl neu gespeicherter Einträge
+        """
+        async def run():
+            try:
+                return await self.aingest(get_async_session())
+            finally:
+                await close_async_session()
+
+        return asyncio.run(run())
+
+    def ingest_if_stale(self) -> Optional[int]:
+        """Ingestion nur, wenn die letzte länger als refresh_minutes zurückliegt; Returns: neue Einträge oder None"""
+        last = self.store.last_ingest()
+        if last and _now() - last < timedelta(minutes=self.refresh_minutes):
+            return None
+        return self.ingest()
+
+    async def aingest(self, session: aiohttp.ClientSession) -> int:
+        """
+        Ruft alle Feeds parallel ab und speichert neue, relevante Einträge
+
+        Args:
+            session: aiohttp-Session des Aufrufers
+
+        Returns:
+            int: Anzahl neu gespeicherter Einträge
+        """
+        discovered = await asyncio.gather(*(self._feeds_for(session, source) for source in self.sources))
+        feeds = {url: _source_label(url) for url in self.feed_urls}
+        for source, urls in zip(self.sources, discovered):
+            for url in urls:
+                feeds.setdefault(url, _source_label(source))
+
+        results = await asyncio.gather(*(
+            self.cache.aget(session, url, lambda body, url=url, source=source: self._parse_feed(body, url, source),
+                            max_bytes=SCRAPE_MAX_BYTES or None)
+            for url, source in feeds.items()
+        ))
+
+        cutoff = (_now() - timedelta(days=self.max_age_days)).isoformat()
+        items, title_keys = {}, set()
+        for result in results:
+            for item in (result or {}).get("items", []):
+                if item["published"] < cutoff:
+                    continue
+                # Quellenübergreifend: gleicher Link oder gleicher Titel = gleiche Meldung (erste Quelle gewinnt)
+                if item["id"] not in items and item["title_key"] not in title_keys:
+                    items[item["id"]] = item
+                    title_keys.add(item["title_key"])
+
+        added = self.store.add_items(items.values())
+        self.store.prune(self.max_age_days)
+        self.store.mark_ingested()
+        logger.info(f"📰 News-Ingestion: {len(feeds)} Feeds, {len(items)} relevante Einträge, {added} neu")
+        return added
+
+    async def _feeds_for(self, session: aiohttp.ClientSession, source: str) -> List[str]:
+        """Feeds einer Quelle (gemerkt im Store, sonst per Autodiscovery auf der Startseite)"""
+        feeds = self.store.get_feeds(source)
+        if feeds is not None:
+            return feeds
+        result = await self.cache.aget(session, source, lambda body: self._discover_feeds(body, source),
+                                       max_bytes=SCRAPE_MAX_BYTES or None)
+        if result is None:
+            # Startseite nicht erreichbar - beim nächsten Lauf erneut versuchen
+            return []
+        self.store.set_feeds(source, result["feeds"])
+        if not result["feeds"]:
+            logger.info(f"📰 Kein RSS/Atom-Feed auf {source} gefunden")
+        return result["feeds"]
+
+    def _discover_feeds(self, body: bytes, page_url: str) -> Optional[Dict]:
+        """Feed-Autodiscovery: <link rel="alternate"> im HTML der Seite"""
+        try:
+            parser = etree.HTMLParser(target=_FeedLinkTarget())
+            parser.feed(body)
+            return {"feeds": list(dict.fromkeys(urljoin(page_url, href) for href in parser.close()))}
+        except etree.LxmlError as e:
+            logger.warning(f"Feed-Autodiscovery für {page_url} fehlgeschlagen: {e}")
+            return None
+
+    def _parse_feed(self, body: bytes, feed_url: str, source: str) -> Optional[Dict]:
+        """
+        Parst einen RSS- oder Atom-Feed im Streaming-Verfahren
+
+        Args:
+            body: Rohdaten des Feeds
+            feed_url: URL des Feeds (Basis für relative Links)
+            source: Quellenname der Einträge
+
+        Returns:
+            dict: {"items": [...]} mit allen relevanten Einträgen oder None, wenn der Feed nicht lesbar ist
+        """
+        items = []
+        fetched_at = _now().isoformat()
+        try:
+            for _, element in etree.iterparse(io.BytesIO(body), events=("end",), recover=True,
+                                              resolve_entities=False, no_network=True):
+                if etree.QName(element).localname not in ("item", "entry"):
+                    continue
+                item = self._build_item(element, feed_url, source, fetched_at)
+                if item:
+                    items.append(item)
+                # Verarbeitete Einträge freigeben - der Speicher bleibt auch bei großen Feeds klein
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        except etree.LxmlError as e:
+            logger.warning(f"Feed {feed_url} nicht lesbar: {e}")
+            return None
+        return {"items": items}
+
+    def _build_item(self, element, feed_url: str, source: str, fetched_at: str) -> Optional[Dict]:
+        """Ein Feed-Eintrag → News-Eintrag mit Relevanz (None ohne Titel oder ohne Keyword-Treffer)"""
+        fields = {}
+        link = None
+        for child in element:
+            if not isinstance(child.tag, str):
+                continue
+            name = etree.QName(child).localname
+            if name == "link":
+                # Atom: <link rel="alternate" href="...">, RSS: <link>URL</link>
+                if child.get("href") and child.get("rel", "alternate") == "alternate":
+                    link = link or child.get("href")
+                elif child.text and child.text.strip():
+                    link = link or child.text.strip()
+            else:
+                fields.setdefault(name, child.text)
+
+        title = _plain_text(fields.get("title"))
+        if not title:
+            return None
+        summary = _plain_text(fields.get("description") or fields.get("summary") or fields.get("content"))
+        title_hits = self.matcher.matched(title)
+        summary_hits = [keyword for keyword in self.matcher.matched(summary) if keyword not in title_hits]
+        score = 2 * len(title_hits) + len(summary_hits)
+        if not score:
+            return None
+
+        published = (_parse_date(fields.get("pubDate")) or _parse_date(fields.get("published"))
+                     or _parse_date(fields.get("updated")) or _parse_date(fields.get("date")))
+        link = _normalize_link(urljoin(feed_url, link)) if link else None
+        title_key = _key(title.lower())
+        return {
+            "id": _key(link) if link else title_key,
+            "title_key": title_key,
+            "title": title,
+            "summary": summary[:MAX_SUMMARY_LENGTH],
+            "link": link,
+            "source": source,
+            "published": published.isoformat() if published else fetched_at,
+            "fetched_at": fetched_at,
+            "score": score,
+            "relevance": "high" if title_hits else "medium"
+        }
+
+# Singleton Instances
+news_store = NewsStore()
+news_ingestor = NewsIngestor()
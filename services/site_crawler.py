@@ -0,0 +1,333 @@
+"""
+Site Crawler - begrenztes Multi-Page-Crawling über sitemap.xml und Links derselben Website
+
+- Startet bei den URLs des Scraper-Profils, ergänzt Seiten aus sitemap.xml
+  (bzw. den Sitemap-Einträgen der robots.txt, neueste lastmod zuerst) und folgt
+  Links derselben Website bis CRAWL_MAX_DEPTH / CRAWL_MAX_PAGES
+- Respektiert robots.txt (Disallow, Crawl-delay) für CRAWL_USER_AGENT
+- Politeness: höchstens CRAWL_CONCURRENCY_PER_HOST Requests pro Host, dazwischen
+  mindestens CRAWL_DELAY Sekunden
+- Persistenter Crawl-Index (URL, Abrufzeit, Content-Hash, Ergebnis): Seiten, die
+  jünger als CRAWL_REFRESH_HOURS sind, werden ohne Request aus dem Index geliefert,
+  ältere per Conditional GET über den Seiten-Cache revalidiert. robots.txt und
+  Sitemaps (auch fehlende) liegen ebenfalls im Index.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+import weakref
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+import aiohttp
+import logging
+from lxml import etree
+from config import (
+    CRAWL_CONCURRENCY_PER_HOST, CRAWL_DELAY, CRAWL_INDEX_FILE, CRAWL_MAX_DEPTH, CRAWL_MAX_PAGES,
+    CRAWL_REFRESH_HOURS, CRAWL_USER_AGENT
+)
+from services.http_cache import PageCache, page_cache
+from services.http_session import afetch_response, close_async_session, get_async_session
+
+logger = logging.getLogger(__name__)
+
+# Links auf diese Dateitypen sind keine Seiten
+NON_HTML_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".ico",
+                       ".zip", ".css", ".js", ".xml", ".json", ".mp4")
+MAX_SITEMAPS = 3  # Sitemap-Dateien pro Website (inkl. Sitemap-Index)
+INDEX_RETENTION_DAYS = 30  # Nicht mehr gecrawlte Seiten werden danach aus dem Index entfernt
+
+
+class _HostLimiter:
+    """Parallelität und Mindestabstand der Requests an einen Host (gebunden an einen Event Loop)"""
+
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.next_slot = 0.0
+
+
+class SiteCrawler:
+    """Crawlt die Websites der Scraper-Profile und führt den Crawl-Index"""
+
+    def __init__(self, index_file: str = CRAWL_INDEX_FILE, max_pages: int = CRAWL_MAX_PAGES,
+                 max_depth: int = CRAWL_MAX_DEPTH, concurrency_per_host: int = CRAWL_CONCURRENCY_PER_HOST,
+                 delay: float = CRAWL_DELAY, refresh_hours: float = CRAWL_REFRESH_HOURS,
+                 cache: PageCache = page_cache):
+        """
+        Args:
+            index_file: Pfad des Crawl-Index (JSON)
+            max_pages: Maximale Seiten pro Website und Lauf
+            max_depth: Maximale Link-Tiefe ab den Start-URLs
+            concurrency_per_host: Parallele Requests pro Host
+            delay: Mindestabstand zwischen Requests an denselben Host (Sekunden)
+            refresh_hours: So lange gilt eine Seite im Index als aktuell
+            cache: Seiten-Cache für Conditional GET
+        """
+        self.index_file = index_file
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.concurrency_per_host = concurrency_per_host
+        self.delay = delay
+        self.refresh_seconds = refresh_hours * 3600
+        self.cache = cache
+        self._index_lock = threading.Lock()
+        # asyncio-Primitive sind an ihren Event Loop gebunden - Limiter pro Loop und Host
+        self._limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _HostLimiter]]" = weakref.WeakKeyDictionary()
+
+    def crawl(self, scraper) -> List[Optional[Dict]]:
+        """
+        Synchrone Variante von acrawl (eigener Event Loop, z.B. aus Worker-Threads der Recherche)
+
+        Args:
+            scraper: SiteScraper der Website
+
+        Returns:
+            list: Parse-Ergebnisse der Seiten (Start-URLs zuerst)
+        """
+        async def run():
+            try:
+                return await self.acrawl(get_async_session(), scraper)
+            finally:
+                await close_async_session()
+
+        return asyncio.run(run())
+
+    async def acrawl(self, session: aiohttp.ClientSession, scraper) -> List[Optional[Dict]]:
+        """
+        Crawlt eine Website ausgehend von den URLs ihres Profils
+
+        Args:
+            session: aiohttp-Session des Aufrufers
+            scraper: SiteScraper der Website (URLs, Header, Parser)
+
+        Returns:
+            list: Parse-Ergebnisse der Seiten (Start-URLs zuerst, None = nicht verwertbar)
+        """
+        index = self._load_index()
+        updates = {"pages": {}, "resources": {}}
+        robots = await self._robots(session, scraper, index, updates)
+        delay = max(self.delay, float(robots.crawl_delay(CRAWL_USER_AGENT) or 0))
+        sitemap_task = asyncio.create_task(self._sitemap_urls(session, scraper, robots, delay, index, updates))
+
+        pages: Dict[str, Optional[Dict]] = {}
+        level = [self._normalize(url) for url in scraper.urls]
+        seen = set(level)
+        depth = 0
+        try:
+            while level and len(pages) < self.max_pages:
+                level = [url for url in level if self._allowed(robots, url)][:self.max_pages - len(pages)]
+                results = await asyncio.gather(*(self._page(session, scraper, url, index["pages"].get(url), delay)
+                                                 for url in level))
+
+                next_level = []
+                if depth == 0:
+                    # Sitemap-Seiten zählen als Tiefe 1 und kommen vor den Links der Startseite
+                    next_level = [url for url in await sitemap_task if self._claim(scraper, url, seen)]
+                for url, (page, entry) in zip(level, results):
+                    pages[url] = page
+                    if entry:
+                        updates["pages"][url] = entry
+                    if page and depth < self.max_depth:
+                        next_level.extend(link for link in (self._normalize(href, url) for href in page.get("links", []))
+                                          if self._claim(scraper, link, seen))
+                level = next_level
+                depth += 1
+        finally:
+            if not sitemap_task.done():
+                sitemap_task.cancel()
+            self._save_index(updates)
+
+        fetched = len(updates["pages"])
+        logger.info(f"🕸️ {scraper.label}: {len(pages)} Seiten ({fetched} abgerufen, {len(pages) - fetched} aus dem Crawl-Index)")
+        return list(pages.values())
+
+    def page_versions(self, scraper) -> Dict[str, Optional[str]]:
+        """
+        content_hash je Seite einer Website laut Crawl-Index (ohne Netzwerkzugriff)
+
+        Args:
+            scraper: SiteScraper der Website
+
+        Returns:
+            dict: URL → content_hash aller indizierten Seiten der Website
+        """
+        return {url: entry.get("content_hash") for url, entry in sorted(self._load_index()["pages"].items())
+                if entry.get("site") == scraper.name}
+
+    async def _page(self, session: aiohttp.ClientSession, scraper, url: str,
+                    entry: Optional[Dict], delay: float) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Liefert (Ergebnis, neuer Index-Eintrag) - aktuelle Index-Einträge ohne Request"""
+        if entry and entry.get("parsed") and time.time() - entry.get("fetched_at", 0) < self.refresh_seconds:
+            return entry["parsed"], None
+
+        # Ohne vorzeitiges Ende - der Crawler braucht die Links der ganzen Seite (Byte-Limit gilt trotzdem)
+        page = await self._polite(url, delay, lambda: self.cache.aget(session, url, scraper._parse_page,
+                                                                      headers=scraper.headers,
+                                                                      max_bytes=scraper.max_bytes))
+        if page is None:
+            # Abruf fehlgeschlagen - veraltetes Ergebnis aus dem Index ist besser als keins
+            return (entry or {}).get("parsed"), None
+
+        now = time.time()
+        changed = not entry or entry.get("content_hash") != page.get("content_hash")
+        return page, {
+            "site": scraper.name,
+            "fetched_at": now,
+            "content_hash": page.get("content_hash"),
+            "changed_at": now if changed else entry.get("changed_at", now),
+            "parsed": page
+        }
+
+    async def _polite(self, url: str, delay: float, fetch: Callable[[], Awaitable]):
+        """Führt fetch unter dem Parallelitäts- und Abstandslimit des Hosts aus"""
+        limiter = self._limiter(urlparse(url).netloc)
+        async with limiter.semaphore:
+            now = asyncio.get_running_loop().time()
+            wait = max(0.0, limiter.next_slot - now)
+            limiter.next_slot = max(now, limiter.next_slot) + delay
+            if wait:
+                await asyncio.sleep(wait)
+            return await fetch()
+
+    def _limiter(self, host: str) -> _HostLimiter:
+        limiters = self._limiters.setdefault(asyncio.get_running_loop(), {})
+        if host not in limiters:
+            limiters[host] = _HostLimiter(self.concurrency_per_host)
+        return limiters[host]
+
+    async def _resource(self, session: aiohttp.ClientSession, scraper, url: str, parse: Callable[[bytes], Dict],
+                        delay: float, index: Dict, updates: Dict) -> Optional[Dict]:
+        """robots.txt/Sitemap über den Crawl-Index; fehlende Dateien (404/410) werden ebenfalls vermerkt"""
+        entry = index["resources"].get(url)
+        if entry and time.time() - entry.get("fetched_at", 0) < self.refresh_seconds:
+            return entry.get("parsed")
+
+        try:
+            response = await self._polite(url, delay, lambda: afetch_response(session, url, headers=scraper.headers))
+            parsed = parse(response.body)
+        except aiohttp.ClientResponseError as e:
+            if e.status not in (404, 410):
+                logger.warning(f"{url} nicht abrufbar: HTTP {e.status}")
+                return (entry or {}).get("parsed")
+            parsed = None
+        except Exception as e:
+            logger.warning(f"{url} nicht abrufbar: {str(e)}")
+            return (entry or {}).get("parsed")
+
+        updates["resources"][url] = {"fetched_at": time.time(), "parsed": parsed}
+        return parsed
+
+    async def _robots(self, session: aiohttp.ClientSession, scraper, index: Dict, updates: Dict) -> RobotFileParser:
+        """Lädt robots.txt der Website - fehlt sie (oder ist nicht abrufbar), ist alles erlaubt"""
+        robots_url = urljoin(scraper.base_url, "/robots.txt")
+        result = await self._resource(session, scraper, robots_url, _parse_robots, self.delay, index, updates)
+        robots = RobotFileParser(robots_url)
+        robots.parse(result["lines"] if result else [])
+        return robots
+
+    async def _sitemap_urls(self, session: aiohttp.ClientSession, scraper, robots: RobotFileParser,
+                            delay: float, index: Dict, updates: Dict) -> List[str]:
+        """Seiten-URLs aus sitemap.xml bzw. den Sitemaps der robots.txt (neueste lastmod zuerst)"""
+        queue = list(robots.site_maps() or [urljoin(scraper.base_url, "sitemap.xml")])
+        fetched, urls = set(), []
+        while queue and len(fetched) < MAX_SITEMAPS:
+            sitemap_url = queue.pop(0)
+            if sitemap_url in fetched:
+                continue
+            fetched.add(sitemap_url)
+            result = await self._resource(session, scraper, sitemap_url, _parse_sitemap, delay, index, updates)
+            if not result:
+                continue
+            entries = sorted(result["entries"], key=lambda entry: entry["lastmod"], reverse=True)
+            (queue if result["index"] else urls).extend(entry["loc"] for entry in entries)
+        return [self._normalize(url) for url in urls]
+
+    def _claim(self, scraper, url: Optional[str], seen: set) -> bool:
+        """True, wenn die URL zur Website gehört und noch nicht eingeplant ist (und merkt sie vor)"""
+        if not url or url in seen or not self._in_scope(scraper, url):
+            return False
+        seen.add(url)
+        return True
+
+    def _in_scope(self, scraper, url: str) -> bool:
+        """Gleicher Host und unterhalb des Pfads der Startseite, keine Dateien"""
+        parsed, base = urlparse(url), urlparse(scraper.base_url)
+        if parsed.scheme not in ("http", "https") or parsed.netloc != base.netloc:
+            return False
+        prefix = base.path[:base.path.rfind("/") + 1] or "/"
+        path = parsed.path or "/"
+        return path.startswith(prefix) and not path.lower().endswith(NON_HTML_EXTENSIONS)
+
+    def _allowed(self, robots: RobotFileParser, url: str) -> bool:
+        if robots.can_fetch(CRAWL_USER_AGENT, url):
+            return True
+        logger.info(f"🚫 robots.txt verbietet {url}")
+        return False
+
+    def _normalize(self, href: str, page_url: Optional[str] = None) -> Optional[str]:
+        """Absolute URL ohne Fragment"""
+        try:
+            return urldefrag(urljoin(page_url, href.strip()) if page_url else href.strip())[0]
+        except ValueError:
+            return None
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Crawl-Index: pages (Seiten) und resources (robots.txt, Sitemaps) je URL"""
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {"pages": data.get("pages", {}), "resources": data.get("resources", {})}
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Crawl-Index {self.index_file} nicht lesbar: {e}")
+        return {"pages": {}, "resources": {}}
+
+    def _save_index(self, updates: Dict[str, Dict]):
+        """Übernimmt neue Einträge in den Index (parallele Crawls: neuester Abruf gewinnt)"""
+        if not updates["pages"] and not updates["resources"]:
+            return
+        with self._index_lock:
+            index = self._load_index()
+            cutoff = time.time() - INDEX_RETENTION_DAYS * 86400
+            for section, entries in updates.items():
+                for url, entry in entries.items():
+                    if entry["fetched_at"] >= index[section].get(url, {}).get("fetched_at", 0):
+                        index[section][url] = entry
+                index[section] = {url: entry for url, entry in index[section].items()
+                                  if entry.get("fetched_at", 0) >= cutoff}
+            try:
+                directory = os.path.dirname(self.index_file)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_path = f"{self.index_file}.{uuid.uuid4().hex}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(index, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.index_file)
+            except OSError as e:
+                logger.warning(f"Crawl-Index konnte nicht geschrieben werden: {e}")
+
+
+def _parse_robots(body: bytes) -> Dict:
+    return {"lines": body.decode("utf-8", errors="replace").splitlines()}
+
+
+def _parse_sitemap(body: bytes) -> Optional[Dict]:
+    """URL-Einträge einer Sitemap bzw. Sitemap-Einträge eines Sitemap-Index"""
+    parser = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+    root = etree.fromstring(body, parser)
+    if root is None:
+        return None
+    entries = []
+    for element in root.iter("{*}url", "{*}sitemap"):
+        loc = (element.findtext("{*}loc") or "").strip()
+        if loc:
+            entries.append({"loc": loc, "lastmod": (element.findtext("{*}lastmod") or "").strip()})
+    return {"index": etree.QName(root).localname == "sitemapindex", "entries": entries}
+
+
+# Singleton Instance
+site_crawler = SiteCrawler()
@@ -0,0 +1,260 @@
+"""
+Scraper Engine - ein Web-Client für alle Websites, gesteuert über Profile (SCRAPER_SITES in config.py)
+
+Pro Profil werden alle URLs über die geteilten Sessions und den Seiten-Cache
+abgerufen (async: parallel), mit der Single-Pass-Extraktion geparst und zu
+Insights mit Profil-Präfix zusammengeführt (z.B. invory_features, invory_url).
+Seiten werden gestreamt: höchstens SCRAPE_MAX_BYTES, und ohne Crawling endet der
+Download, sobald die Extraktionsziele erfüllt sind (SCRAPE_EARLY_STOP).
+Mit Crawling (CRAWL_ENABLED bzw. Profil-Key "crawl") kommen weitere Seiten aus
+sitemap.xml und Links der Website hinzu (services/site_crawler.py).
+Schlägt das Scraping fehl, liefert get_mock_data die Fallback-Daten des Profils.
+"""
+import asyncio
+import hashlib
+from typing import Callable, Dict, Iterable, List, Optional
+import aiohttp
+import logging
+from config import CRAWL_ENABLED, SCRAPE_EARLY_STOP, SCRAPE_MAX_BYTES, SCRAPER_SITES
+from services.html_extraction import ExtractionStream, HtmlExtractor
+from services.http_cache import page_cache
+from services.site_crawler import site_crawler
+
+logger = logging.getLogger(__name__)
+
+# Standardwerte für Profile ohne eigene Angaben
+DEFAULT_FEATURE_PATTERN = r'(feature|funktion|service|leistung|lösung)'
+DEFAULT_SECTION_CLASS_PATTERN = r'(feature|service|about|solution)'
+# Länge der Textvorschau (content_preview) pro Seite
+PREVIEW_CHARS = 1000
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+
+class SiteScraper:
+    """Web-Client für eine Website, beschrieben durch ein Scraper-Profil"""
+
+    def __init__(self, profile: Dict):
+        """
+        Args:
+            profile: Scraper-Profil (siehe SCRAPER_SITES in config.py)
+        """
+        self.profile = profile
+        self.name = profile["name"]
+        self.label = profile.get("label", self.name)
+        self.urls: List[str] = list(profile["urls"])
+        self.base_url = self.urls[0]
+        self.headers = dict(DEFAULT_HEADERS)
+        self.default_title = profile.get("default_title", self.label)
+        self.default_features = list(profile.get("default_features", []))
+        self.crawl = profile.get("crawl", CRAWL_ENABLED)
+        # Profil-Keys "max_bytes"/"early_stop" überschreiben SCRAPE_MAX_BYTES/SCRAPE_EARLY_STOP
+        self.max_bytes = profile.get("max_bytes", SCRAPE_MAX_BYTES) or None
+        self.early_stop = profile.get("early_stop", SCRAPE_EARLY_STOP)
+        # Patterns und Keywords einmal kompilieren - die Extraktion läuft in einem einzigen lxml-Durchlauf
+        self.extractor = HtmlExtractor(
+            feature_pattern=profile.get("feature_pattern", DEFAULT_FEATURE_PATTERN),
+            section_class_pattern=profile.get("section_class_pattern", DEFAULT_SECTION_CLASS_PATTERN),
+            keywords=profile.get("keywords", [])
+        )
+
+    def get_xrechnung_info(self) -> Optional[Dict]:
+        """
+        Holt XRechnung-Informationen von allen URLs des Profils durch Web-Scraping
+
+        Returns:
+            dict: Zusammengeführte Informationen oder None, wenn keine Seite verwertbar war
+        """
+        if self.crawl:
+            return self._build_info(site_crawler.crawl(self))
+        # Conditional GET über den Seiten-Cache - unveränderte Seiten werden nicht erneut geladen/geparst
+        return self._build_info([page_cache.get(url, self._parse_page, headers=self.headers, max_bytes=self.max_bytes,
+                                                stream=self._page_stream if self.early_stop else None)
+                                 for url in self.urls])
+
+    def content_versions(self) -> Dict[str, Optional[str]]:
+        """
+        Versionen der zuletzt abgerufenen Seiten aus Seiten-Cache bzw. Crawl-Index (ohne Netzwerkzugriff)
+
+        Returns:
+            dict: URL → Version (None = Seite noch nicht im Cache)
+        """
+        if self.crawl:
+            return site_crawler.page_versions(self)
+        return {url: page_cache.version(url) for url in self.urls}
+
+    async def aget_xrechnung_info(self, session: aiohttp.ClientSession) -> Optional[Dict]:
+        """
+        Async-Variante von get_xrechnung_info - alle URLs parallel auf der geteilten Session
+
+        Args:
+            session: aiohttp-Session des Aufrufers
+
+        Returns:
+            dict: Zusammengeführte Informationen oder None, wenn keine Seite verwertbar war
+        """
+        if self.crawl:
+            return self._build_info(await site_crawler.acrawl(session, self))
+        stream = self._page_stream if self.early_stop else None
+        pages = await asyncio.gather(*(page_cache.aget(session, url, self._parse_page, headers=self.headers,
+                                                       max_bytes=self.max_bytes, stream=stream)
+                                       for url in self.urls))
+        return self._build_info(pages)
+
+    def _parse_page(self, body: bytes) -> Optional[Dict]:
+        """
+        Extrahiert Titel, Features, Abschnitte, Keywords und Links aus einer Seite (Parser für den Seiten-Cache)
+
+        Args:
+            body: HTML-Rohdaten der Seite
+
+        Returns:
+            dict: Extrahierte Informationen oder None bei Fehler
+        """
+        return self._page_result(lambda: self.extractor.extract(body))
+
+    def _page_stream(self) -> "_PageStream":
+        """Inkrementeller Parser für den Seiten-Cache - beendet den Download, sobald die Ziele erfüllt sind"""
+        return _PageStream(self, self.extractor.stream(min_text_chars=PREVIEW_CHARS))
+
+    def _page_result(self, extract: Callable[[], Dict]) -> Optional[Dict]:
+        """Formt das Extraktionsergebnis in das Seiten-Ergebnis um (None bei Fehler)"""
+        try:
+            page = extract()
+            return {
+                "title": page["title"],
+                "content_preview": page["text"][:PREVIEW_CHARS],
+                "features": page["features"],
+                "relevant_sections": page["sections"],
+                "keywords": page["keywords"],
+                "links": page["links"],
+                # Hash des bereinigten Texts - ändert sich nur mit dem sichtbaren Inhalt
+                # (bei vorzeitigem Ende des gelesenen Teils, dessen Ende nicht von den Chunks abhängt)
+                "content_hash": hashlib.sha256(page["text"].encode("utf-8")).hexdigest()[:16]
+            }
+        except Exception as e:
+            logger.error(f"Fehler beim Scraping von {self.label}: {str(e)}")
+            return None
+
+    def _build_info(self, pages: Iterable[Optional[Dict]]) -> Optional[Dict]:
+        """
+        Führt die Seiten eines Profils zusammen (Titel/Inhalt der ersten Seite, Features/Keywords aller Seiten)
+
+        Args:
+            pages: Parse-Ergebnisse in URL-Reihenfolge (None = Seite nicht verwertbar)
+
+        Returns:
+            dict: Informationen zur Website oder None, wenn keine Seite verwertbar war
+        """
+        pages = [page for page in pages if page]
+        if not pages:
+            return None
+
+        first = pages[0]
+        features = list(dict.fromkeys(feature for page in pages for feature in page.get("features", [])))
+        keywords = list(dict.fromkeys(keyword for page in pages for keyword in page.get("keywords", [])))
+        sections = [section for page in pages for section in page.get("relevant_sections", [])]
+
+        return {
+            "url": self.base_url,
+            "title": first.get("title") or self.default_title,
+            "content_preview": first.get("content_preview", ""),
+            "features": features[:5] if features else list(self.default_features),
+            "relevant_sections": sections[:3],
+            "keywords": keywords[:5],
+            # Fingerprint aller Seiten - ändert sich, sobald sich der Text einer Seite ändert
+            "content_hash": hashlib.sha256("|".join(page.get("content_hash", "") for page in pages)
+                                           .encode("utf-8")).hexdigest()[:16]
+        }
+
+    def get_xrechnung_insights(self) -> Optional[Dict]:
+        """
+        Holt Insights zu XRechnung von der Website
+
+        Returns:
+            dict: Insights und Informationen
+        """
+        return self._build_insights(self.get_xrechnung_info())
+
+    async def aget_xrechnung_insights(self, session: aiohttp.ClientSession) -> Optional[Dict]:
+        """
+        Async-Variante von get_xrechnung_insights
+
+        Args:
+            session: aiohttp-Session des Aufrufers
+
+        Returns:
+            dict: Insights und Informationen
+        """
+        return self._build_insights(await self.aget_xrechnung_info(session))
+
+    def _build_insights(self, info: Optional[Dict]) -> Dict:
+        """Formt Scraping-Ergebnisse in Insights mit Profil-Präfix um (Mock-Daten, falls Scraping fehlschlug)"""
+        if not info:
+            return self.get_mock_data()
+
+        return {
+            f"{self.name}_features": info.get("features", []),
+            f"{self.name}_url": info.get("url", self.base_url),
+            f"{self.name}_title": info.get("title", self.default_title),
+            f"{self.name}_keywords": info.get("keywords", []),
+            f"{self.name}_content": info.get("content_preview", ""),
+            f"{self.name}_content_hash": info.get("content_hash")
+        }
+
+    def get_mock_data(self) -> Dict:
+        """
+        Gibt die Mock-Daten des Profils zurück, wenn Web-Scraping fehlschlägt
+
+        Returns:
+            dict: Mock-Daten im Insight-Format
+        """
+        mock = self.profile.get("mock_data", {})
+        return {
+            f"{self.name}_features": list(mock.get("features", self.default_features)),
+            f"{self.name}_url": self.base_url,
+            f"{self.name}_title": mock.get("title", self.default_title),
+            f"{self.name}_keywords": list(mock.get("keywords", [])),
+            f"{self.name}_content": mock.get("content", "")
+        }
+
+
+class _PageStream:
+    """Gestreamte Seite eines SiteScrapers: feed wie ExtractionStream, close liefert das Seiten-Ergebnis"""
+
+    def __init__(self, scraper: SiteScraper, extraction: ExtractionStream):
+        self.scraper = scraper
+        self.extraction = extraction
+
+    def feed(self, chunk: bytes) -> bool:
+        return self.extraction.feed(chunk)
+
+    def close(self) -> Optional[Dict]:
+        return self.scraper._page_result(self.extraction.close)
+
+
+def get_site_profile(name: str, profiles: Iterable[Dict] = None) -> Dict:
+    """
+    Sucht ein Scraper-Profil nach Namen
+
+    Raises:
+        KeyError: Wenn kein Profil mit diesem Namen konfiguriert ist
+    """
+    for profile in SCRAPER_SITES if profiles is None else profiles:
+        if profile["name"] == name:
+            return profile
+    raise KeyError(f"Kein Scraper-Profil '{name}' in SCRAPER_SITES konfiguriert")
+
+
+def create_scrapers(profiles: Iterable[Dict] = None) -> Dict[str, SiteScraper]:
+    """
+    Erstellt je Profil einen SiteScraper
+
+    Args:
+        profiles: Optional - Profile (Standard: SCRAPER_SITES)
+
+    Returns:
+        dict: Profilname → SiteScraper (in Konfigurationsreihenfolge)
+    """
+    return {profile["name"]: SiteScraper(profile) for profile in (SCRAPER_SITES if profiles is None else profiles)}
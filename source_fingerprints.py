@@ -0,0 +1,167 @@
+"""
+Source Fingerprints - erkennt unveränderte Quellen-Bündel der Recherche
+
+Pro Recherche wird aus den abgerufenen Quellen (Websites, News) ein normalisierter
+Hash gebildet. Ist er schon bekannt, wird das daraus abgeleitete Material
+(Key-Point-Kandidaten, Features, Keywords) wiederverwendet statt neu berechnet,
+und die Recherche wird als "keine neuen Quellen" markiert.
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import logging
+from config import SOURCE_FINGERPRINT_FILE, SOURCE_FINGERPRINT_MAX
+
+logger = logging.getLogger(__name__)
+
+# Felder, die sich bei jedem Abruf ändern, ohne dass sich der Inhalt ändert
+VOLATILE_KEYS = {"timestamp", "current_date", "fallback"}
+# Lokal berechnete Quellen (kein Quellenmaterial, z.B. der tägliche Countdown)
+EXCLUDED_SOURCES = {"countdown_data"}
+
+
+def _normalize(value: Any) -> Any:
+    """Entfernt flüchtige Felder und vereinheitlicht Whitespace in Texten"""
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items() if key not in VOLATILE_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return value
+
+
+def fingerprint_sources(sources: Dict[str, Optional[dict]]) -> str:
+    """
+    Bildet den Content-Fingerprint eines Quellen-Bündels
+
+    Args:
+        sources: Quellen wie von ResearchAgent.gather_sources geliefert
+
+    Returns:
+        str: Hash über den normalisierten Inhalt (unabhängig von Abrufzeit und Reihenfolge)
+    """
+    bundle = {name: _normalize(data) for name, data in sources.items() if name not in EXCLUDED_SOURCES}
+    payload = json.dumps(bundle, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def source_versions(sources: Dict[str, Optional[dict]]) -> Dict[str, Optional[str]]:
+    """
+    Fingerprint je einzelner Quelle (z.B. um einen vorbereiteten Post auf geänderte Quellen zu prüfen)
+
+    Args:
+        sources: Quellen wie von ResearchAgent.gather_sources geliefert
+
+    Returns:
+        dict: Quellenname → Fingerprint, None für Quellen mit Fallback-Daten (Inhalt unbekannt)
+    """
+    return {
+        name: None if isinstance(data, dict) and data.get("fallback") else fingerprint_sources({name: data})
+        for name, data in sources.items() if name not in EXCLUDED_SOURCES
+    }
+
+
+def changed_sources(versions: Dict[str, Optional[str]], sources: Dict[str, Optional[dict]]) -> List[str]:
+    """
+    Vergleicht gespeicherte Quellen-Versionen mit neu abgerufenen Quellen
+
+    Quellen, die jetzt nur Fallback-Daten liefern, lassen sich nicht prüfen und
+    gelten als unverändert; war eine Quelle damals Fallback und ist jetzt live,
+    gilt sie als geändert.
+
+    Args:
+        versions: Ergebnis von source_versions zum früheren Zeitpunkt
+        sources: Neu abgerufene Quellen
+
+    Returns:
+        list: Namen der geänderten Quellen
+    """
+    return [name for name, version in source_versions(sources).items()
+            if version is not None and versions.get(name) != version]
+
+
+class SourceFingerprintStore:
+    """Speichert Fingerprints und abgeleitetes Recherche-Material in einer lokalen JSON-Datei"""
+
+    def __init__(self, store_file: str = SOURCE_FINGERPRINT_FILE, max_entries: int = SOURCE_FINGERPRINT_MAX):
+        self.store_file = store_file
+        self.max_entries = max_entries
+        self.entries = self._load_entries()
+        # Parallele Pipeline-Läufe schreiben aus mehreren Threads
+        self._lock = threading.RLock()
+
+    def _load_entries(self) -> Dict[str, Dict]:
+        """Lädt Fingerprints aus JSON-Datei"""
+        if os.path.exists(self.store_file):
+            try:
+                with open(self.store_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError) as e:
+                logger.warning(f"Konnte Quellen-Fingerprints nicht laden: {e}")
+                return {}
+        return {}
+
+    def _save_entries(self):
+        """Speichert Fingerprints in JSON-Datei"""
+        try:
+            with self._lock, open(self.store_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Speichern der Quellen-Fingerprints: {e}")
+
+    def lookup(self, fingerprint: str) -> Optional[Dict]:
+        """
+        Sucht das abgeleitete Material zu einem Fingerprint
+
+        Returns:
+            dict: Abgeleitetes Material oder None, wenn das Bündel neu ist
+        """
+        with self._lock:
+            entry = self.entries.get(fingerprint)
+            return entry["derived"] if entry else None
+
+    def seen_for_topic(self, fingerprint: str, topic: str) -> bool:
+        """
+        Prüft, ob das Quellen-Bündel schon einmal für dieses Thema recherchiert wurde
+
+        Batch-Läufe teilen ein Bündel über mehrere Themen - für jedes weitere Thema
+        ist das Material trotzdem neu.
+
+        Returns:
+            bool: True, wenn record() das Bündel bereits mit diesem Thema gesehen hat
+        """
+        with self._lock:
+            entry = self.entries.get(fingerprint)
+            return bool(entry) and topic in entry.get("topics", [])
+
+    def record(self, fingerprint: str, derived: Dict, topic: Optional[str] = None) -> Dict:
+        """
+        Merkt sich einen Fingerprint samt abgeleitetem Material (bekannte Bündel: Zähler und Zeitpunkt aktualisieren)
+
+        Args:
+            fingerprint: Fingerprint des Quellen-Bündels
+            derived: Abgeleitetes Material
+            topic: Optional - Thema, für das das Bündel recherchiert wurde (siehe seen_for_topic)
+
+        Returns:
+            dict: Gespeicherter Eintrag
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            entry = self.entries.pop(fingerprint, None) or {"first_seen": now, "runs": 0}
+            entry.update({"last_seen": now, "runs": entry["runs"] + 1, "derived": derived})
+            if topic is not None and topic not in entry.setdefault("topics", []):
+                entry["topics"].append(topic)
+            # Reihenfolge = zuletzt gesehen; älteste Bündel fallen bei Überschreitung der Maximalgröße heraus
+            self.entries[fingerprint] = entry
+            for stale in list(self.entries)[:-self.max_entries]:
+                del self.entries[stale]
+            self._save_entries()
+        return entry
+
+# Singleton Instance
+source_fingerprints = SourceFingerprintStore()
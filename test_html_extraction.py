@@ -0,0 +1,61 @@
+"""
+Tests für die Single-Pass HTML-Extraktion (Ergebnis muss dem bisherigen BeautifulSoup-Verfahren entsprechen)
+"""
+import os
+
+from benchmarks.extraction_benchmark import FIXTURES_DIR, beautifulsoup_extract
+from services.einvoicehub_client import EinvoiceHubClient
+from services.html_extraction import HtmlExtractor
+from services.invory_client import InvoryClient
+
+EDGE_CASES = b"""<html><head><title>XRechnung &amp; E-Invoicing</title></head>
+<body>
+  <header><h2>Service im Header</h2></header>
+  <h2><span>Feature: verschachtelt</span></h2>
+  <li>Feature <b>mit</b> Markup</li>
+  <p>Leistung<script>var x = 1;</script>geteilt</p>
+  <div class="box feature-list">  <p>Service: im Abschnitt</p>  </div>
+  <div class="other"><!-- Kommentar --><p>Kein Treffer</p></div>
+  <pre>   Compliance   </pre>
+  <footer>ZUGFeRD</footer>
+</body></html>"""
+
+
+def test_extraction_matches_beautifulsoup_on_fixtures():
+    """Titel, Features, Abschnitte, Text und Keywords sind identisch zum bisherigen Verfahren"""
+    for name, client in (("invory", InvoryClient()), ("einvoicehub", EinvoiceHubClient())):
+        with open(os.path.join(FIXTURES_DIR, f"{name}.html"), "rb") as f:
+            body = f.read()
+        page = client.extractor.extract(body)
+        assert page == beautifulsoup_extract(client.extractor, body), name
+        assert page["features"] and page["sections"] and page["keywords"]
+
+
+def test_extraction_edge_cases():
+    """Entfernte Tags, .string über ein Kind-Element, geteilte Texte und Whitespace wie BeautifulSoup"""
+    extractor = HtmlExtractor(r'(feature|service|leistung)', r'(feature)', ["Compliance", "ZUGFeRD", "XRechnung"])
+    page = extractor.extract(EDGE_CASES)
+
+    assert page == beautifulsoup_extract(extractor, EDGE_CASES)
+    assert page["title"] == "XRechnung & E-Invoicing"
+    assert page["features"] == ["Feature: verschachtelt", "Service: im Abschnitt"]
+    assert page["sections"] == ["Service: im Abschnitt"]
+    assert page["keywords"] == ["Compliance", "XRechnung"]
+
+
+def test_client_parse_falls_back_to_defaults():
+    """Seiten ohne Titel/Features liefern die Standardwerte des Clients"""
+    client = InvoryClient()
+    info = client._build_info([client._parse_page(b"<html><body><p>XRechnung Pflicht ab 2025</p></body></html>")])
+    assert info["title"] == "Invory.de - XRechnung Lösungen"
+    assert info["features"][0] == "XRechnung-Erstellung"
+    assert info["keywords"] == ["XRechnung"]
+    assert info["content_preview"] == "XRechnung Pflicht ab 2025"
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte HTML-Extraktions-Tests\n")
+    test_extraction_matches_beautifulsoup_on_fixtures()
+    test_extraction_edge_cases()
+    test_client_parse_falls_back_to_defaults()
+    print("✅ Alle HTML-Extraktions-Tests bestanden!")
@@ -0,0 +1,176 @@
+"""
+Tests für die geteilten HTTP-Sessions und den Seiten-Cache (offline, lokaler aiohttp-Server)
+"""
+import asyncio
+import tempfile
+
+from aiohttp import web
+
+from services import http_session
+from services.circuit_breaker import HostCircuitBreaker, SourceUnavailableError
+from services.http_cache import PageCache
+from services.http_session import afetch, close_async_session, get_async_session, get_session
+
+
+async def _serve(handler):
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}/"
+
+
+def test_afetch_retries_transient_errors():
+    """503 wird mit Backoff wiederholt, der zweite Versuch liefert den Body"""
+    calls = []
+
+    async def handler(request):
+        calls.append(request.headers.get("Accept-Encoding"))
+        if len(calls) == 1:
+            return web.Response(status=503)
+        return web.Response(text="<html>ok</html>")
+
+    async def run():
+        runner, url = await _serve(handler)
+        try:
+            return await afetch(get_async_session(), url)
+        finally:
+            await close_async_session()
+            await runner.cleanup()
+
+    assert asyncio.run(run()) == b"<html>ok</html>"
+    assert len(calls) == 2
+    assert "gzip" in calls[0]
+
+
+def test_sessions_are_shared():
+    """Sync-Session ist prozessweit, Async-Session pro Event Loop geteilt"""
+    assert get_session() is get_session()
+
+    async def same_session():
+        try:
+            return get_async_session() is get_async_session()
+        finally:
+            await close_async_session()
+
+    assert asyncio.run(same_session())
+
+
+def test_page_cache_revalidates_with_etag():
+    """Zweiter Abruf sendet If-None-Match, 304 liefert das gespeicherte Parse-Ergebnis ohne neues Parsing"""
+    seen_etags, parsed = [], []
+
+    async def handler(request):
+        seen_etags.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.Response(text="<title>XRechnung</title>", headers={"ETag": '"v1"'})
+
+    def parse(body):
+        parsed.append(body)
+        return {"title": body.decode()}
+
+    async def run():
+        runner, url = await _serve(handler)
+        cache = PageCache(tempfile.mkdtemp(), max_age=3600, enabled=True)
+        try:
+            first = await cache.aget(get_async_session(), url, parse)
+            second = await cache.aget(get_async_session(), url, parse)
+            return first, second
+        finally:
+            await close_async_session()
+            await runner.cleanup()
+
+    first, second = asyncio.run(run())
+    assert first == second == {"title": "<title>XRechnung</title>"}
+    assert seen_etags == [None, '"v1"']
+    assert len(parsed) == 1
+
+
+def test_page_cache_serves_pages_without_validators_within_max_age():
+    """Ohne ETag/Last-Modified wird innerhalb von max_age gar kein Request gesendet"""
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        return web.Response(text="<p>Seite</p>")
+
+    async def run():
+        runner, url = await _serve(handler)
+        cache = PageCache(tempfile.mkdtemp(), max_age=3600, enabled=True)
+        try:
+            return [await cache.aget(get_async_session(), url, lambda body: {"len": len(body)}) for _ in range(3)]
+        finally:
+            await close_async_session()
+            await runner.cleanup()
+
+    assert asyncio.run(run()) == [{"len": 12}] * 3
+    assert len(calls) == 1
+
+
+def test_circuit_breaker_fails_fast_and_probes_after_cooldown():
+    """Gesperrter Host: kein Request, Seiten-Cache fällt sofort zurück; nach dem Cool-down schließt ein Probe-Request den Circuit"""
+    calls, healthy = [], [False]
+
+    async def handler(request):
+        calls.append(request.path)
+        if healthy[0] or request.path == "/ok":
+            return web.Response(text="<p>ok</p>")
+        return web.Response(status=503)
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        session = get_async_session()
+        outcomes = []
+        try:
+            for path in ("/a", "/b", "/a"):
+                try:
+                    await afetch(session, base + path)
+                except Exception as e:
+                    outcomes.append(type(e).__name__)
+            cache = PageCache(tempfile.mkdtemp(), enabled=False)
+            outcomes.append(await cache.aget(session, base + "/c", lambda body: {"len": len(body)}))
+            state = breaker.snapshot()["hosts"][base[len("http://"):]]["state"]
+
+            await asyncio.sleep(0.25)
+            healthy[0] = True
+            outcomes.append(await afetch(session, base + "/c"))
+            return outcomes, state, breaker.snapshot()["hosts"][base[len("http://"):]]["state"], base
+        finally:
+            await close_async_session()
+            await runner.cleanup()
+
+    breaker = HostCircuitBreaker(failure_threshold=2, cooldown_seconds=0.2, negative_ttl=60)
+    original = http_session.circuit_breaker, http_session.HTTP_RETRIES
+    http_session.circuit_breaker, http_session.HTTP_RETRIES = breaker, 0
+    try:
+        outcomes, open_state, closed_state, base = asyncio.run(run())
+    finally:
+        http_session.circuit_breaker, http_session.HTTP_RETRIES = original
+
+    assert outcomes == ["ClientResponseError", "ClientResponseError", "SourceUnavailableError", None, b"<p>ok</p>"]
+    assert calls == ["/a", "/b", "/c"]
+    assert open_state == "open" and closed_state == "closed"
+    # /a bleibt im Negativ-Cache, auch wenn der Host wieder erreichbar ist
+    assert list(breaker.snapshot()["negative_cache"]) == [f"{base}/a", f"{base}/b"]
+    try:
+        breaker.before_request(f"{base}/a")
+        raise AssertionError("URL im Negativ-Cache muss sofort scheitern")
+    except SourceUnavailableError as e:
+        assert "kürzlich fehlgeschlagen" in e.reason
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte HTTP-Session-Tests\n")
+    test_afetch_retries_transient_errors()
+    test_sessions_are_shared()
+    test_page_cache_revalidates_with_etag()
+    test_page_cache_serves_pages_without_validators_within_max_age()
+    test_circuit_breaker_fails_fast_and_probes_after_cooldown()
+    print("✅ Alle HTTP-Session-Tests bestanden!")
@@ -0,0 +1,51 @@
+"""
+Tests für den KeywordMatcher (Aho-Corasick und Substring-Suche liefern dieselben Treffer)
+"""
+import random
+
+from agents.image_agent import ImageAgent
+from agents.review_agent import ReviewAgent
+from services.keyword_matcher import KeywordHit, KeywordMatcher
+
+
+def test_both_strategies_find_all_overlapping_hits():
+    """Überlappende und verschachtelte Keywords, Groß-/Kleinschreibung, gleiche Treffer in beiden Verfahren"""
+    keywords = ["XRechnung", "Rechnung", "E-Rechnung", "ERP", "hub", "einvoicehub", "ZUGFeRD"]
+    text = "Die E-Rechnung kommt: XRechnung via einvoiceHub ins erp - kein ZUGFeRD"
+
+    automaton = KeywordMatcher(keywords, use_automaton=True)
+    substring = KeywordMatcher(keywords, use_automaton=False)
+    hits = automaton.find_all(text)
+
+    assert hits == substring.find_all(text)
+    assert hits[:3] == [KeywordHit(4, 14, "E-Rechnung"), KeywordHit(6, 14, "Rechnung"), KeywordHit(22, 31, "XRechnung")]
+    assert [hit.keyword for hit in hits].count("Rechnung") == 2
+    assert KeywordHit(36, 47, "einvoicehub") in hits and KeywordHit(44, 47, "hub") in hits
+    assert automaton.matched(text) == substring.matched(text) == keywords
+    assert not automaton.contains_any("PEPPOL") and substring.contains_any("peppol ERP")
+
+    # Zufällige Texte über kleinem Alphabet: viele Überlappungen
+    random.seed(7)
+    words = ["".join(random.choice("abc") for _ in range(random.randint(1, 4))) for _ in range(30)]
+    text = "".join(random.choice("abcd") for _ in range(500))
+    assert KeywordMatcher(words, use_automaton=True).find_all(text) == KeywordMatcher(words, use_automaton=False).find_all(text)
+
+
+def test_groups_and_agent_call_sites():
+    """Gruppen-Treffer in Konfigurations-Reihenfolge; Bild- und Review-Agent nutzen den Matcher"""
+    matcher = KeywordMatcher(groups={"zeit": ["deadline", "countdown"], "digital": ["digital"], "leer": ["fax"]})
+    assert matcher.matched_groups("Digitale Rechnung vor der Deadline") == ["zeit", "digital"]
+
+    theme = ImageAgent()._select_image_theme({"post_content": "Die ZUKUNFT ist digital"})
+    assert theme.startswith("digitale Transformation")
+
+    review = ReviewAgent()._review_image({"image_url": "https://bild", "theme": "Countdown: Kalender", "prompt": "x" * 30},
+                                         "Nur noch wenig Zeit bis zur Pflicht", {})
+    assert not any("passt möglicherweise nicht" in suggestion for suggestion in review["suggestions"])
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte Keyword-Matcher-Tests\n")
+    test_both_strategies_find_all_overlapping_hits()
+    test_groups_and_agent_call_sites()
+    print("✅ Alle Keyword-Matcher-Tests bestanden!")
@@ -0,0 +1,75 @@
+"""
+Tests für den Modell-Antwort-Cache (content-addressed, LRU nach Größe, Opt-out pro Aufruf)
+"""
+import asyncio
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from agents.image_agent import ImageAgent
+from services.model_cache import ModelResponseCache, model_cache_key
+
+
+def test_responses_are_replayed_and_evicted_lru():
+    """Gleicher Aufruf → Cache; andere Parameter oder use_cache=False → Modell; älteste Einträge fallen zuerst heraus"""
+    cache = ModelResponseCache(tempfile.mkdtemp(), max_bytes=10_000, ttl_seconds=60)
+    calls = []
+
+    def fetch(answer):
+        return lambda: calls.append(answer) or answer
+
+    assert cache.call("gpt", "Prompt", fetch("A"), params={"temperature": 0.2}) == "A"
+    assert cache.call("gpt", "Prompt", fetch("B"), params={"temperature": 0.2}) == "A"
+    assert cache.call("gpt", "Prompt", fetch("C"), params={"temperature": 0.7}) == "C"
+    assert cache.call("gpt", "Prompt", fetch("D"), params={"temperature": 0.2}, use_cache=False) == "D"
+    assert asyncio.run(cache.acall("gpt", "Prompt", lambda: asyncio.sleep(0, "E"), params={"temperature": 0.2})) == "A"
+    assert calls == ["A", "C", "D"]
+    assert model_cache_key("gpt", "Prompt", {"a": 1, "b": 2}) == model_cache_key("gpt", "Prompt", {"b": 2, "a": 1})
+
+    # Abgelaufene Einträge gelten als Miss
+    cache.ttl_seconds = 0
+    assert cache.get(model_cache_key("gpt", "Prompt", {"temperature": 0.2})) is None
+
+    # LRU: Treffer erneuern die Nutzung, bei Überschreitung der Größe fällt der älteste ungenutzte Eintrag heraus
+    cache = ModelResponseCache(tempfile.mkdtemp(), max_bytes=2500, ttl_seconds=60)
+    for index in range(2):
+        cache.put(f"k{index}", "x" * 1000)
+        past = time.time() - 100 + index
+        os.utime(cache._path(f"k{index}"), (past, past))
+    assert cache.get("k0") is not None
+    cache.put("k2", "x" * 1000)
+    assert cache.get("k1") is None and cache.get("k2") is not None
+    assert sorted(os.listdir(cache.cache_dir)) == ["k0.json", "k2.json"]
+
+
+def test_image_agent_uses_pluggable_cache():
+    """Preview-Bilder kommen beim zweiten Mal aus dem Cache, echte Posts rufen DALL-E immer auf"""
+    generated = []
+
+    def generate(**kwargs):
+        generated.append(kwargs["prompt"])
+        return SimpleNamespace(data=[SimpleNamespace(url=f"https://images.example/{len(generated)}.png")])
+
+    agent = ImageAgent(response_cache=ModelResponseCache(tempfile.mkdtemp(), max_bytes=10_000, ttl_seconds=60))
+    agent.openai_client = SimpleNamespace(images=SimpleNamespace(generate=generate))
+    agent._create_dalle_prompt = lambda theme, content_data: f"{theme}, comic style"
+    content = {"post_content": "Countdown zur XRechnung-Pflicht", "topic": "XRechnung"}
+
+    first = agent.generate_image_for_post(content)
+    assert agent.generate_image_for_post(content)["image_url"] == first["image_url"]
+    assert agent.generate_image_for_post(content, use_cache=False)["image_url"] != first["image_url"]
+    assert len(generated) == 2
+
+    uncached = ImageAgent(response_cache=ModelResponseCache(tempfile.mkdtemp(), enabled=False))
+    uncached.openai_client, uncached._create_dalle_prompt = agent.openai_client, agent._create_dalle_prompt
+    uncached.generate_image_for_post(content)
+    uncached.generate_image_for_post(content)
+    assert len(generated) == 4 and not os.listdir(uncached.response_cache.cache_dir)
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte Modell-Cache-Tests\n")
+    test_responses_are_replayed_and_evicted_lru()
+    test_image_agent_uses_pluggable_cache()
+    print("✅ Alle Modell-Cache-Tests bestanden!")
@@ -0,0 +1,114 @@
+"""
+Tests für die Near-Duplicate-Erkennung über die Post-Historie (MinHash/LSH)
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+import multi_agent_system
+from draft_inventory import DraftInventory
+from multi_agent_system import LinkedInPostMultiAgentSystem
+from near_duplicates import NearDuplicateIndex, minhash_signature
+from post_history import PostHistoryTracker
+
+STORY = """Sarah, Geschäftsführerin eines mittelständischen Unternehmens, stand vor einem Berg von Rechnungen.
+Nächtliche Überstunden beim manuellen Rechnungsabgleich und ständige Angst vor Compliance-Fehlern.
+Dann entdeckte Sarah die XRechnung-Automatisierung und verlässt heute pünktlich das Büro."""
+
+
+def add(tracker: PostHistoryTracker, text: str, mode: str = "post", posted: bool = True):
+    """Eintrag wie _stage_history - auto_post-Läufe mit LinkedIn-ID gelten als veröffentlicht"""
+    linkedin_post_id = f"urn:li:share:{len(tracker.history) + 1}" if mode == "post" and posted else None
+    tracker.add_post(topic="XRechnung", post_text=text, storytelling_structure="Hero's Journey",
+                     research_model="test", review_model="test", review_score=80, mode=mode,
+                     linkedin_post_id=linkedin_post_id)
+
+
+def test_similar_posts_are_found_and_signatures_persist():
+    """Leicht veränderter Text wird erkannt, fremder nicht; Previews zählen nicht; Index übersteht Neustarts"""
+    history_file = os.path.join(tempfile.mkdtemp(), "history.json")
+    tracker = PostHistoryTracker(history_file)
+    add(tracker, STORY)
+    add(tracker, "PEPPOL und ZUGFeRD im Vergleich: welche Formate Empfänger ab 2025 annehmen müssen.")
+    add(tracker, "Ein ganz anderer Preview-Text über Fußball am Wochenende und das Wetter.", mode="preview")
+
+    variant = STORY.replace("einem Berg", "einem riesigen Berg")
+    similar = tracker.find_similar(variant)
+    assert similar["post_id"] == 1 and 0.8 <= similar["similarity"] < 1
+    assert tracker.find_similar("XRechnung Countdown: noch 42 Tage bis zur Pflicht für alle Unternehmen.") is None
+    assert tracker.find_similar("Ein ganz anderer Preview-Text über Fußball am Wochenende und das Wetter.") is None
+
+    # Neuer Prozess: Signaturen kommen aus der Historie, neue Posts landen direkt im Index
+    restarted = PostHistoryTracker(history_file)
+    assert restarted.history[0]["post_text"] == STORY and restarted.history[0]["minhash"]
+    assert restarted.find_similar(variant)["post_id"] == 1
+    add(restarted, "Behind the Scenes: 47 Kaffeetassen später ist der neue XRechnung-Validator fertig.")
+    assert restarted.find_similar("Behind the Scenes: 47 Kaffeetassen später ist der neue XRechnung-Validator fertig!")["post_id"] == 4
+
+    # Zeitfenster: ältere Posts werden ignoriert
+    index = NearDuplicateIndex()
+    index.add("alt", minhash_signature(STORY), timestamp=time.time() - 200 * 86400)
+    assert index.query(minhash_signature(STORY), 0.8) == [("alt", 1.0)]
+    assert index.query(minhash_signature(STORY), 0.8, since=time.time() - 90 * 86400) == []
+
+
+def test_unpublished_posts_are_no_duplicate_reference():
+    """auto_post-Lauf ohne Veröffentlichung (Review abgelehnt) zählt weder im Index noch nach einem Neustart"""
+    history_file = os.path.join(tempfile.mkdtemp(), "history.json")
+    tracker = PostHistoryTracker(history_file)
+    tracker.find_similar("Index aufbauen, damit add_post inkrementell ergänzt")
+    add(tracker, STORY, posted=False)
+    tracker.add_post(topic="XRechnung", post_text="PEPPOL und ZUGFeRD im Vergleich: welche Formate Empfänger annehmen müssen.",
+                     storytelling_structure="Hero's Journey", research_model="test", review_model="test",
+                     review_score=80, mode="post", linkedin_posted=True)
+
+    assert tracker.history[0]["linkedin"]["posted"] is False and "minhash" not in tracker.history[0]
+    assert tracker.history[1]["linkedin"] == {"post_id": None, "posted": True}
+    for current in (tracker, PostHistoryTracker(history_file)):
+        assert current.find_similar(STORY) is None
+        assert current.find_similar("PEPPOL und ZUGFeRD im Vergleich: welche Formate Empfänger annehmen müssen!")["post_id"] == 2
+
+
+def test_review_drafts_another_structure_for_repeated_post():
+    """Wiederholt der Entwurf einen früheren Post, wird vor dem Posten eine andere Struktur entworfen"""
+    class Content:
+        def select_candidate_structures(self, research_data, count, recent_structures=None):
+            return [{"name": "Hero's Journey"}, {"name": "Future Vision"}][:count]
+
+        def create_storytelling_post(self, research_data, structure):
+            text = STORY if structure["name"] == "Hero's Journey" else "2030: Die große XRechnung-Revolution ist da!"
+            return {"post_content": text, "storytelling_structure": structure}
+
+    class Review:
+        def review_post(self, post, research_data, image_data=None):
+            return {"approved": True, "score": 90 if post == STORY else 70, "issues": [], "suggestions": []}
+
+    workdir = tempfile.mkdtemp()
+    tracker = PostHistoryTracker(os.path.join(workdir, "history.json"))
+    add(tracker, STORY)
+    system = LinkedInPostMultiAgentSystem(history_tracker=tracker)
+    system.content_agent, system.review_agent = Content(), Review()
+    results = {"research": {"topic": "Test"}, "image": None,
+               "content": {"drafts": [Content().create_storytelling_post({}, {"name": "Hero's Journey"})]}}
+
+    original_inventory = multi_agent_system.draft_inventory
+    multi_agent_system.draft_inventory = DraftInventory(os.path.join(workdir, "drafts.json"))
+    try:
+        review = asyncio.run(system._stage_review(results, auto_post=True))
+        # Preview: keine Prüfung, der beste Score gewinnt
+        preview = asyncio.run(system._stage_review(results))
+    finally:
+        multi_agent_system.draft_inventory = original_inventory
+
+    assert review["post_data"]["storytelling_structure"]["name"] == "Future Vision"
+    assert review["candidates"][0]["near_duplicate"]["post_id"] == 1
+    assert preview["post_text"] == STORY
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte Near-Duplicate-Tests\n")
+    test_similar_posts_are_found_and_signatures_persist()
+    test_unpublished_posts_are_no_duplicate_reference()
+    test_review_drafts_another_structure_for_repeated_post()
+    print("✅ Alle Near-Duplicate-Tests bestanden!")
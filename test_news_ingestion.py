@@ -0,0 +1,108 @@
+"""
+Tests für die RSS/Atom-News-Ingestion (offline, lokaler aiohttp-Server mit Feed-Fixtures)
+"""
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from aiohttp import web
+
+from agents import research_agent
+from agents.research_agent import ResearchAgent
+from services.http_cache import PageCache
+from services.http_session import close_async_session, get_async_session
+from services.news_ingestion import NewsIngestor, NewsStore
+
+YESTERDAY = datetime.now(timezone.utc) - timedelta(days=1)
+
+RSS = f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Quelle A</title><link>{{base}}/a/</link>
+  <item><title>XRechnung wird Pflicht für alle</title><link>{{base}}/news/1?utm_campaign=rss</link>
+        <description>Fristen im Überblick</description><pubDate>{format_datetime(YESTERDAY)}</pubDate></item>
+  <item><title>Fußball am Wochenende</title><link>{{base}}/sport</link><pubDate>{format_datetime(YESTERDAY)}</pubDate></item>
+  <item><title>PEPPOL und ZUGFeRD im Vergleich</title><link>{{base}}/news/2</link>
+        <pubDate>{format_datetime(YESTERDAY - timedelta(hours=5))}</pubDate></item>
+</channel></rss>"""
+
+ATOM = f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Quelle B</title>
+  <entry><title>XRechnung wird  Pflicht für alle</title><link href="{{base}}/b/kopie"/>
+         <updated>{YESTERDAY.isoformat()}</updated></entry>
+  <entry><title>Andere Überschrift zu XRechnung</title><link rel="alternate" href="{{base}}/news/1#oben"/>
+         <updated>{YESTERDAY.isoformat()}</updated></entry>
+  <entry><title>Neue Verordnung</title><link href="/b/3"/>
+         <summary type="html">&lt;p&gt;Die E-Invoicing Pflicht &amp;amp; mehr&lt;/p&gt;</summary>
+         <updated>{YESTERDAY.isoformat()}</updated></entry>
+  <entry><title>XRechnung 2020</title><link href="{{base}}/b/alt"/><updated>2020-01-01T00:00:00Z</updated></entry>
+</feed>"""
+
+PAGES = {
+    "/a/": ('<html><head><link rel="alternate" type="application/rss+xml" href="feed.xml"></head></html>', "text/html"),
+    "/b/": ('<html><head><link rel="alternate" type="application/atom+xml" href="/b/atom.xml"></head></html>', "text/html"),
+    "/a/feed.xml": (RSS, "application/rss+xml"),
+    "/b/atom.xml": (ATOM, "application/atom+xml"),
+}
+
+
+def test_ingestion_deduplicates_scores_and_revalidates():
+    """Autodiscovery, Dedup über Link und Titel, Relevanz, Conditional GET beim zweiten Lauf"""
+    requests = []
+
+    async def handler(request):
+        requests.append((request.path, request.headers.get("If-None-Match")))
+        body, content_type = PAGES[request.path]
+        if content_type == "text/html":
+            return web.Response(text=body, content_type=content_type)
+        etag = f'"{request.path}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body.format(base=f"http://{request.host}"), content_type=content_type,
+                            headers={"ETag": etag})
+
+    async def run(workdir):
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        ingestor = NewsIngestor(store=NewsStore(os.path.join(workdir, "news.db")),
+                                sources=[f"{base}/a/", f"{base}/b/"], feed_urls=[],
+                                cache=PageCache(os.path.join(workdir, "cache")))
+        try:
+            first = await ingestor.aingest(get_async_session())
+            first_requests = len(requests)
+            second = await ingestor.aingest(get_async_session())
+            return ingestor, first, second, first_requests
+        finally:
+            await close_async_session()
+            await runner.cleanup()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        ingestor, first, second, first_requests = asyncio.run(run(workdir))
+        news = ingestor.store.latest(limit=10)
+
+        original_store, research_agent.news_store = research_agent.news_store, ingestor.store
+        try:
+            research_news = ResearchAgent().research_xrechnung_news()["news"]
+        finally:
+            research_agent.news_store = original_store
+
+    assert first == 3 and second == 0
+    assert [item["title"] for item in news] == [
+        "PEPPOL und ZUGFeRD im Vergleich", "XRechnung wird Pflicht für alle", "Neue Verordnung"]
+    assert [item["relevance"] for item in news] == ["high", "high", "medium"]
+    assert news[1]["link"].endswith("/news/1") and news[2]["link"].endswith("/b/3")
+    assert news[2]["summary"] == "Die E-Invoicing Pflicht & mehr"
+
+    # Zweiter Lauf: Feeds aus dem Store gemerkt, nur Conditional GETs auf die Feeds
+    assert sorted(requests[first_requests:]) == [("/a/feed.xml", '"/a/feed.xml"'), ("/b/atom.xml", '"/b/atom.xml"')]
+    assert research_news == news[:len(research_news)]
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte News-Ingestion-Tests\n")
+    test_ingestion_deduplicates_scores_and_revalidates()
+    print("✅ Alle News-Ingestion-Tests bestanden!")
@@ -0,0 +1,434 @@
+"""
+Tests für Stage-Pipeline und Pipeline-Checkpoints (offline, ohne API-Calls)
+"""
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+from pipeline import StagePipeline, span
+from checkpoints import RunCheckpointStore
+from draft_inventory import DraftInventory
+from post_history import PostHistoryTracker
+from services.http_session import close_async_session
+import multi_agent_system
+from multi_agent_system import LinkedInPostMultiAgentSystem, _LazyComponent
+
+
+class StubResearch:
+    """Recherche ohne Netzwerk - zählt die Quellen-Abrufe"""
+    def __init__(self):
+        self.gathered = 0
+
+    async def agather_sources(self, time_budget=None):
+        self.gathered += 1
+        return {"news_data": {"news": []}}
+
+    async def aresearch_xrechnung_topic(self, topic=None, sources=None):
+        return {"topic": topic, "shared_sources": sources is not None}
+
+
+class StubContent:
+    """Ein Entwurf pro Thema, optional mit Rechenzeit"""
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    def select_candidate_structures(self, research_data, count, recent_structures=None):
+        return [{"name": "Hero's Journey"}]
+
+    def create_storytelling_post(self, research_data, structure):
+        time.sleep(self.delay)
+        return {"post_content": f"Post zu {research_data['topic']}", "storytelling_structure": structure}
+
+
+class StubReview:
+    def review_post(self, post, research_data, image_data=None):
+        return {"approved": True, "score": 8, "issues": [], "suggestions": []}
+
+
+class StubLinkedIn:
+    """Liefert die vorgegebenen Antworten nacheinander (None = Posting fehlgeschlagen)"""
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    async def acreate_post(self, text, image_url=None):
+        return self.responses.pop(0)
+
+
+def stub_system(workdir: str, **components) -> LinkedInPostMultiAgentSystem:
+    """System mit Stub-Agents, eigener Historie und eigenen Checkpoints in workdir (ohne Bilder)"""
+    system = LinkedInPostMultiAgentSystem(history_tracker=PostHistoryTracker(os.path.join(workdir, "history.json")))
+    system.checkpoints = RunCheckpointStore(workdir)
+    system.include_images = False
+    system.research_agent, system.content_agent = StubResearch(), StubContent()
+    system.review_agent, system.linkedin_client = StubReview(), StubLinkedIn({"id": "urn:li:share:1"})
+    for name, component in components.items():
+        setattr(system, name, component)
+    return system
+
+
+def test_independent_stages_run_concurrently():
+    """Unabhängige Stufen laufen parallel - Laufzeit ≈ längster Zweig statt Summe"""
+    pipeline = StagePipeline("test")
+    pipeline.add_stage("research", lambda results: "daten")
+    pipeline.add_stage("image", lambda results: time.sleep(0.3) or "bild", depends_on=["research"])
+    pipeline.add_stage("content", lambda results: time.sleep(0.3) or "text", depends_on=["research"])
+    pipeline.add_stage("review", lambda results: results["image"] + results["content"],
+                       depends_on=["image", "content"])
+
+    start = time.perf_counter()
+    results = pipeline.run()
+    elapsed = time.perf_counter() - start
+
+    assert results["review"] == "bildtext"
+    assert elapsed < 0.55, f"Stufen liefen nicht parallel ({elapsed:.2f}s)"
+    assert pipeline.critical_path()[0] == "research"
+    assert pipeline.critical_path()[-1] == "review"
+
+
+def test_post_pipeline_overlaps_image_and_content():
+    """Im System-Graphen laufen Bild und Content parallel (research → image ∥ content → review → post → history)"""
+    class SlowImage:
+        async def agenerate_image_for_post(self, content_data, use_cache=True):
+            await asyncio.sleep(0.3)
+            return {"image_url": "https://images.example/1.png", "theme": "Countdown"}
+
+    system = stub_system(tempfile.mkdtemp(), content_agent=StubContent(delay=0.3), image_agent=SlowImage())
+    system.include_images = True
+    pipeline = system._build_pipeline("Test", auto_post=False)
+    assert {name: set(stage.depends_on) for name, stage in pipeline.stages.items()} == {
+        "research": set(), "image": {"research"}, "content": {"research"}, "review": {"image", "content"},
+        "post": {"review"}, "history": {"post"}}
+
+    start = time.perf_counter()
+    result = system.create_post_preview("Test")
+    elapsed = time.perf_counter() - start
+
+    assert result["success"] and result["includes_image"] and result["post_text"] == "Post zu Test"
+    assert elapsed < 0.55, f"Bild und Content liefen nicht parallel ({elapsed:.2f}s)"
+
+
+def test_batch_shares_sources_and_keeps_topic_order():
+    """create_batch ruft die Quellen einmal für alle Themen ab und liefert in Themen-Reihenfolge"""
+    class ReverseContent(StubContent):
+        """Frühe Themen brauchen am längsten - Ergebnisse werden in umgekehrter Reihenfolge fertig"""
+        def create_storytelling_post(self, research_data, structure):
+            time.sleep(0.05 * (6 - int(research_data["topic"].split()[-1])))
+            return super().create_storytelling_post(research_data, structure)
+
+    system = stub_system(tempfile.mkdtemp(), content_agent=ReverseContent())
+    topics = [f"Thema {index}" for index in range(6)]
+
+    results = system.create_batch(topics, workers=3)
+
+    assert system.research_agent.gathered == 1
+    assert [result["post_text"] for result in results] == [f"Post zu {topic}" for topic in topics]
+    assert all(result["research_data"]["shared_sources"] for result in results)
+    assert len(system.history_tracker.history) == len(topics)
+
+
+def test_async_entry_point_runs_inside_running_loop():
+    """acreate_and_post läuft im Event Loop des Aufrufers (kein verschachteltes asyncio.run) und liefert dasselbe wie der Wrapper"""
+    from benchmarks.stub_servers import StubServers
+    from services import linkedin_client
+
+    servers = StubServers().start()
+    originals = linkedin_client.LINKEDIN_ACCESS_TOKEN, linkedin_client.LINKEDIN_API_BASE_URL
+    linkedin_client.LINKEDIN_ACCESS_TOKEN = "test-token"
+    linkedin_client.LINKEDIN_API_BASE_URL = f"{servers.base_url}/linkedin/v2"
+    try:
+        # Eigene Systeme (und Historien), damit der zweite Post nicht als Wiederholung des ersten gilt
+        sync_system = stub_system(tempfile.mkdtemp(), linkedin_client=linkedin_client.LinkedInClient())
+        sync_result = sync_system.create_and_post("Test", auto_post=True)
+
+        async_system = stub_system(tempfile.mkdtemp(), linkedin_client=linkedin_client.LinkedInClient())
+
+        async def caller():
+            # Wie ein async Web-Handler: der Loop läuft bereits
+            try:
+                return await async_system.acreate_and_post("Test", auto_post=True)
+            finally:
+                await close_async_session()
+
+        async_result = asyncio.run(caller())
+    finally:
+        linkedin_client.LINKEDIN_ACCESS_TOKEN, linkedin_client.LINKEDIN_API_BASE_URL = originals
+        servers.stop()
+
+    keys = ["success", "post_text", "storytelling_structure", "review_score", "review_approved",
+            "linkedin_posted", "includes_image", "degradations"]
+    assert async_result["linkedin_posted"], async_result.get("error")
+    assert {key: async_result[key] for key in keys} == {key: sync_result[key] for key in keys}
+    assert async_result["post_status"]["id"].startswith("urn:li:share:")
+    assert len(async_system.history_tracker.history) == 1
+
+
+def test_spans_are_recorded_from_worker_threads():
+    """span() in Stufen landet in den Dauern des Pipeline-Laufs"""
+    def stage(results):
+        with span("linkedin.post"):
+            time.sleep(0.01)
+        return True
+
+    pipeline = StagePipeline("test")
+    pipeline.add_stage("post", stage)
+    pipeline.run()
+
+    durations = pipeline.durations()
+    assert "post" in durations
+    assert durations["linkedin.post"] >= 0.01
+
+
+def test_resume_skips_checkpointed_stages():
+    """Gespeicherte Stufen werden übernommen, nur die fehlenden laufen erneut"""
+    store = RunCheckpointStore(tempfile.mkdtemp())
+    run_id = store.create_run({"topic": "Test", "auto_post": True})
+    calls = []
+
+    def build():
+        pipeline = StagePipeline("test")
+        pipeline.add_stage("research", lambda results: calls.append("research") or {"topic": "Test"})
+        pipeline.add_stage("post", lambda results: calls.append("post") or "ok", depends_on=["research"])
+        pipeline.add_stage("history", lambda results: calls.append("history") or 1, depends_on=["post"])
+        return pipeline
+
+    # Erster Lauf: "post" wird (wie bei einem fehlgeschlagenen Posting) nicht gecheckpointet
+    build().run(on_stage_complete=lambda stage, output: stage != "post" and store.save_stage(run_id, stage, output))
+    assert calls == ["research", "post", "history"]
+
+    calls.clear()
+    pipeline = build()
+    completed = pipeline.resumable(store.load_stages(run_id, list(pipeline.stages)))
+    assert list(completed) == ["research"], "history hängt von post ab und darf nicht übernommen werden"
+
+    results = pipeline.run(completed)
+    assert calls == ["post", "history"]
+    assert results["research"] == {"topic": "Test"}
+
+
+def test_failed_post_is_recorded_once_after_resume():
+    """Fehlgeschlagenes Posting schreibt keine Historie - erst der erfolgreiche resume() trägt den Lauf ein"""
+    system = stub_system(tempfile.mkdtemp(), linkedin_client=StubLinkedIn(None, {"id": "urn:li:share:1"}))
+    tracker = system.history_tracker
+
+    failed = system.create_and_post("Test", auto_post=True)
+    assert failed["success"] and not failed["linkedin_posted"]
+    assert tracker.history == []
+
+    resumed = system.resume(failed["run_id"])
+    assert resumed["linkedin_posted"]
+    assert len(tracker.history) == 1
+    assert tracker.history[0]["linkedin"] == {"post_id": "urn:li:share:1", "posted": True}
+
+
+def test_rejected_drafts_without_history_do_not_trigger_rewrites():
+    """auto_post mit Duplikat-Prüfung: abgelehnte Entwürfe ohne frühere Posts → kein Fehler, keine Extra-Entwürfe"""
+    class ManyStructures(StubContent):
+        def __init__(self):
+            super().__init__()
+            self.created = []
+
+        def select_candidate_structures(self, research_data, count, recent_structures=None):
+            return [{"name": name} for name in ("Hero's Journey", "Future Vision", "Problem-Solution")][:count]
+
+        def create_storytelling_post(self, research_data, structure):
+            self.created.append(structure["name"])
+            return super().create_storytelling_post(research_data, structure)
+
+    class Rejecting:
+        def review_post(self, post, research_data, image_data=None):
+            return {"approved": False, "score": 3, "issues": ["zu allgemein"], "suggestions": []}
+
+        def improve_post(self, post, review_result):
+            return post
+
+    content = ManyStructures()
+    system = stub_system(tempfile.mkdtemp(), content_agent=content, review_agent=Rejecting())
+    original_draft_candidates, multi_agent_system.DRAFT_CANDIDATES = multi_agent_system.DRAFT_CANDIDATES, 1
+    try:
+        result = system.create_and_post("Test", auto_post=True)
+    finally:
+        multi_agent_system.DRAFT_CANDIDATES = original_draft_candidates
+
+    assert multi_agent_system.DUPLICATE_CHECK_ENABLED
+    assert result["success"] is True and result["review_approved"] is False
+    assert not result["linkedin_posted"] and system.linkedin_client.responses == [{"id": "urn:li:share:1"}]
+    assert content.created == ["Hero's Journey"]
+
+
+def test_checkpoint_store_lists_incomplete_runs():
+    """Abgeschlossene Läufe erscheinen nicht mehr in der Liste offener Läufe"""
+    store = RunCheckpointStore(tempfile.mkdtemp())
+    open_run = store.create_run({"topic": "Offen"})
+    done_run = store.create_run({"topic": "Fertig"})
+    store.mark_completed(done_run)
+
+    assert [run["run_id"] for run in store.list_runs()] == [open_run]
+    assert len(store.list_runs(include_completed=True)) == 2
+
+
+def test_stage_budget_falls_back_instead_of_hanging():
+    """Überschreitet eine Stufe ihr Budget, liefert der Fallback - die Herabstufung wird vermerkt"""
+    async def slow_image(results):
+        await asyncio.sleep(2)
+        return "dalle"
+
+    pipeline = StagePipeline("test")
+    pipeline.add_stage("research", lambda results: "daten")
+    pipeline.add_stage("image", slow_image, depends_on=["research"],
+                       timeout=0.1, fallback=lambda results: "mock", fallback_note="Mock-Bild")
+    pipeline.add_stage("review", lambda results: results["image"], depends_on=["image"])
+
+    start = time.perf_counter()
+    results = pipeline.run(deadline=time.time() + 10)
+
+    assert time.perf_counter() - start < 1
+    assert results["review"] == "mock"
+    assert pipeline.degradations == [{"stage": "image", "reason": "Zeitbudget von 0.1s überschritten",
+                                      "fallback": "Mock-Bild"}]
+
+
+def test_lazy_components_are_built_once():
+    """Parallele Zugriffe bauen eine Komponente nur einmal; Instanzen teilen sie nicht"""
+    built = []
+
+    class System(LinkedInPostMultiAgentSystem):
+        research_agent = _LazyComponent(lambda: time.sleep(0.05) or built.append(1) or object())
+
+    system = System()
+    assert built == [], "Agents dürfen erst beim ersten Zugriff erstellt werden"
+
+    threads = [threading.Thread(target=lambda: system.research_agent) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert built == [1]
+    assert system.research_agent is system.research_agent
+    assert System().research_agent is not system.research_agent
+
+
+def test_review_picks_best_draft_and_keeps_losers():
+    """Best-of-K: der Entwurf mit dem höchsten Score gewinnt, die übrigen landen im Inventar"""
+    class ScoreByLength:
+        def review_post(self, post, research_data, image_data=None):
+            return {"approved": True, "score": len(post), "issues": [], "suggestions": []}
+
+    system = LinkedInPostMultiAgentSystem()
+    system.review_agent = ScoreByLength()
+    inventory = DraftInventory(os.path.join(tempfile.mkdtemp(), "drafts.json"))
+    original_inventory, multi_agent_system.draft_inventory = multi_agent_system.draft_inventory, inventory
+    drafts = [{"post_content": text, "storytelling_structure": {"name": name}}
+              for name, text in [("Hero's Journey", "kurz"), ("Future Vision", "am längsten"), ("Problem-Solution", "mittel")]]
+    try:
+        review = asyncio.run(system._stage_review({"research": {"topic": "Test"}, "image": None,
+                                                   "content": {"drafts": drafts}}))
+    finally:
+        multi_agent_system.draft_inventory = original_inventory
+
+    assert review["post_text"] == "am längsten"
+    assert [c["review_score"] for c in review["candidates"]] == [4, 11, 6]
+    assert [d["storytelling_structure"] for d in inventory.get_drafts(topic="Test")] == ["Problem-Solution", "Hero's Journey"]
+
+
+def staged_sources(fetched_at: str, features: list) -> dict:
+    """Quellen im Format von gather_sources - Abrufzeiten zählen nicht als Änderung"""
+    return {"news_data": {"news": [{"title": "XRechnung Pflicht"}], "timestamp": fetched_at},
+            "invory_data": {"invory_features": features, "timestamp": fetched_at}}
+
+
+def test_staged_post_is_published_or_invalidated():
+    """Prefetch bis zum Review; zur Post-Zeit nur noch Posting - außer die Quellen haben sich geändert"""
+    calls = []
+    current = {"sources": staged_sources("2025-01-01T08:00:00", ["Versand"])}
+
+    class Research:
+        async def agather_sources(self, time_budget=None):
+            calls.append("sources")
+            return current["sources"]
+
+        async def aresearch_xrechnung_topic(self, topic=None, sources=None):
+            calls.append("research")
+            return {"topic": topic, "invory_features": sources["invory_data"]["invory_features"]}
+
+    class Content(StubContent):
+        def create_storytelling_post(self, research_data, structure):
+            calls.append("content")
+            return {"post_content": " ".join(research_data["invory_features"]), "storytelling_structure": structure}
+
+    class LinkedIn:
+        async def acreate_post(self, text, image_url=None):
+            calls.append(f"post:{text}")
+            return {"id": "urn:li:share:1"}
+
+    system = stub_system(tempfile.mkdtemp(), research_agent=Research(), content_agent=Content(),
+                         linkedin_client=LinkedIn())
+
+    staged = system.prefetch("Test")
+    assert staged["success"] and staged["post_text"] == "Versand"
+    assert calls == ["sources", "research", "content"], "Prefetch darf nicht posten"
+
+    # Unveränderte Quellen (nur Abrufzeit neu): nur noch Quellen-Prüfung und Posting
+    calls.clear()
+    current["sources"] = staged_sources("2025-01-01T09:00:00", ["Versand"])
+    result = system.publish_staged(staged["run_id"])
+    assert result["linkedin_posted"] and calls == ["sources", "post:Versand"]
+
+    # Geänderte Quelle: vorbereiteter Entwurf wird verworfen, Post entsteht aus den neuen Quellen
+    staged = system.prefetch("Test")
+    calls.clear()
+    current["sources"] = staged_sources("2025-01-01T09:00:00", ["Versand", "Archiv"])
+    result = system.publish_staged(staged["run_id"])
+    assert calls == ["sources", "research", "content", "post:Versand Archiv"]
+    assert system.checkpoints.load_run(staged["run_id"])["invalidated"] == ["invory_data"]
+
+
+def test_scheduler_publishes_staged_post_after_restart():
+    """Der Post-Job findet den vorbereiteten Lauf in den Checkpoints - auch nach einem Neustart des Prozesses"""
+    import scheduler
+
+    workdir = tempfile.mkdtemp()
+    linkedin = StubLinkedIn({"id": "urn:li:share:1"})
+    systems = [stub_system(workdir, linkedin_client=linkedin) for _ in range(2)]
+    original = scheduler.get_shared_system
+    try:
+        # Veralteter vorbereiteter Lauf von einem früheren Tag wird nicht veröffentlicht
+        old_run = systems[0].checkpoints.create_run({"topic": "Alt", "auto_post": True, "staged": True})
+        systems[0].checkpoints.update_run(old_run, created="2025-01-01T08:00:00")
+
+        scheduler.get_shared_system = lambda: systems[0]
+        scheduler.PostScheduler().prefetch_job()
+        # Neustart: neuer Prozess mit neuer System-Instanz, gleiche Checkpoints
+        scheduler.get_shared_system = lambda: systems[1]
+        restarted = scheduler.PostScheduler()
+        restarted.multi_agent_system.content_agent = None  # Neugenerierung würde fehlschlagen
+        restarted.create_and_post_job()
+    finally:
+        scheduler.get_shared_system = original
+
+    runs = systems[1].checkpoints.list_runs(include_completed=True)
+    assert all(run["completed"] for run in runs)
+    assert [run["topic"] for run in runs if run.get("discarded")] == ["Alt"]
+    assert linkedin.responses == [], "Vorbereiteter Post muss veröffentlicht worden sein"
+    assert len(systems[1].history_tracker.history) == 1
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte Pipeline-Tests\n")
+    test_independent_stages_run_concurrently()
+    test_post_pipeline_overlaps_image_and_content()
+    test_batch_shares_sources_and_keeps_topic_order()
+    test_async_entry_point_runs_inside_running_loop()
+    test_spans_are_recorded_from_worker_threads()
+    test_resume_skips_checkpointed_stages()
+    test_failed_post_is_recorded_once_after_resume()
+    test_rejected_drafts_without_history_do_not_trigger_rewrites()
+    test_checkpoint_store_lists_incomplete_runs()
+    test_stage_budget_falls_back_instead_of_hanging()
+    test_lazy_components_are_built_once()
+    test_review_picks_best_draft_and_keeps_losers()
+    test_staged_post_is_published_or_invalidated()
+    test_scheduler_publishes_staged_post_after_restart()
+    print("✅ Alle Pipeline-Tests bestanden!")
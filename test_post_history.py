@@ -0,0 +1,86 @@
+"""
+Tests für die Post-Historie (parallele Einträge, Latenz-Auswertung, History-Modus)
+"""
+import io
+import os
+import sys
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+import post_history
+from post_history import PostHistoryTracker
+
+
+def add(tracker: PostHistoryTracker, stage_timings: dict, mode: str = "post"):
+    return tracker.add_post(topic="XRechnung", post_text="XRechnung-Post", storytelling_structure="Hero's Journey",
+                            research_model="test", review_model="test", review_score=80, mode=mode,
+                            stage_timings=stage_timings)
+
+
+def test_concurrent_posts_get_unique_ids():
+    """Parallele Batch-Läufe: jeder Eintrag landet genau einmal mit eigener ID in Speicher und Datei"""
+    tracker = PostHistoryTracker(os.path.join(tempfile.mkdtemp(), "history.json"))
+
+    def write():
+        for _ in range(25):
+            add(tracker, {"post": 0.1}, mode="preview")
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(post["id"] for post in tracker.history) == list(range(1, 201))
+    assert len(PostHistoryTracker(tracker.history_file).history) == 200
+
+
+def test_stage_latency_uses_nearest_rank_percentiles():
+    """p50/p95 nach Nearest-Rank (immer ein gemessener Wert), nur Posts im Zeitfenster"""
+    tracker = PostHistoryTracker(os.path.join(tempfile.mkdtemp(), "history.json"))
+    for seconds in range(20, 0, -1):
+        add(tracker, {"post": float(seconds)})
+    add(tracker, {"research": 0.5})
+    add(tracker, {"research": 3.0, "linkedin.upload": 1.25})
+    old = add(tracker, {"post": 999.0})
+    old["timestamp"] = (datetime.now() - timedelta(days=60)).isoformat()
+
+    stats = tracker.get_stage_latency_stats(30)
+    assert list(stats) == ["linkedin.upload", "post", "research"]
+    assert stats["post"] == {"count": 20, "p50": 10.0, "p95": 19.0}
+    assert stats["research"] == {"count": 2, "p50": 0.5, "p95": 3.0}
+    assert stats["linkedin.upload"] == {"count": 1, "p50": 1.25, "p95": 1.25}
+
+
+def test_history_mode_prints_latency_table():
+    """main.py --mode history zeigt die Latenz-Tabelle pro Stufe"""
+    import main
+
+    tracker = PostHistoryTracker(os.path.join(tempfile.mkdtemp(), "history.json"))
+    add(tracker, {"research": 1.5, "post": 0.25})
+    add(tracker, {"research": 2.5, "post": 0.75}, mode="preview")
+
+    originals = post_history.post_tracker, main.check_linkedin_setup, sys.argv
+    post_history.post_tracker, main.check_linkedin_setup = tracker, lambda: True
+    sys.argv = ["main.py", "--mode", "history"]
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            main.main()
+    finally:
+        post_history.post_tracker, main.check_linkedin_setup, sys.argv = originals
+
+    lines = output.getvalue().splitlines()
+    table = lines[lines.index("⏱️ LATENZ PRO STUFE (30 Tage):") + 1:][:2]
+    assert table == [f"  {'post':<28} p50    0.25s | p95    0.75s | n=2",
+                     f"  {'research':<28} p50    1.50s | p95    2.50s | n=2"]
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte Post-Historie-Tests\n")
+    test_concurrent_posts_get_unique_ids()
+    test_stage_latency_uses_nearest_rank_percentiles()
+    test_history_mode_prints_latency_table()
+    print("✅ Alle Post-Historie-Tests bestanden!")
@@ -0,0 +1,108 @@
+"""
+Tests für den Research Agent: paralleler Quellen-Abruf unter gemeinsamem Zeitbudget (offline)
+"""
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+from agents import research_agent
+from agents.research_agent import ResearchAgent
+from research_cache import ResearchCache
+from services.http_session import close_async_session
+from source_fingerprints import SourceFingerprintStore
+
+
+def test_slow_source_gets_fallback_within_budget():
+    """Eine hängende Quelle kostet höchstens das Budget - nur sie bekommt Fallback-Daten, die übrigen bleiben echt"""
+    release = threading.Event()
+    agent = ResearchAgent()
+    agent._research_sources = lambda: {
+        "news_data": (lambda: {"news": ["live"]}, lambda: {"news": []}),
+        "invory_data": (lambda: {"invory_features": ["Versand"]}, lambda: {"invory_features": ["Mock"]}),
+        "einvoicehub_data": (lambda: release.wait(5) and {"einvoicehub_features": ["live"]},
+                             lambda: {"einvoicehub_features": ["Mock"]}),
+    }
+
+    async def slow():
+        await asyncio.sleep(5)
+        return {"einvoicehub_features": ["live"]}
+
+    async def live(data):
+        return data
+
+    agent._async_research_sources = lambda session: {
+        "news_data": lambda: live({"news": ["live"]}),
+        "invory_data": lambda: live({"invory_features": ["Versand"]}),
+        "einvoicehub_data": slow,
+    }
+    expected = {"news_data": {"news": ["live"]}, "invory_data": {"invory_features": ["Versand"]},
+                "einvoicehub_data": {"einvoicehub_features": ["Mock"], "fallback": True}}
+
+    try:
+        start = time.perf_counter()
+        sources = agent.gather_sources(time_budget=0.3)
+        assert time.perf_counter() - start < 0.8
+        assert sources == expected
+    finally:
+        release.set()
+
+    async def agather():
+        try:
+            return await agent.agather_sources(time_budget=0.3)
+        finally:
+            await close_async_session()
+
+    start = time.perf_counter()
+    sources = asyncio.run(agather())
+    assert time.perf_counter() - start < 0.8
+    assert sources == expected
+
+
+def test_async_research_keeps_file_io_off_the_event_loop():
+    """News-Store, Cache-Schlüssel, Recherche-Cache und Fingerprints laufen in Threads, nicht im Event Loop"""
+    workdir = tempfile.mkdtemp()
+    originals = research_agent.research_cache, research_agent.source_fingerprints
+    research_agent.research_cache = ResearchCache(os.path.join(workdir, "research_cache.json"), ttl_minutes=60)
+    research_agent.source_fingerprints = SourceFingerprintStore(os.path.join(workdir, "fingerprints.json"))
+
+    agent = ResearchAgent()
+    threads = {}
+
+    def record(name, method):
+        def wrapper(*args, **kwargs):
+            threads.setdefault(name, set()).add(threading.get_ident())
+            return method(*args, **kwargs)
+        setattr(agent, name, wrapper)
+
+    for name in ("_research_cache_key", "_cached_research", "_research_and_cache", "research_xrechnung_news"):
+        record(name, getattr(agent, name))
+    agent._async_research_sources = lambda session: {
+        "news_data": ResearchAgent._async_research_sources(agent, session)["news_data"],
+        "countdown_data": ResearchAgent._async_research_sources(agent, session)["countdown_data"],
+    }
+
+    async def research():
+        try:
+            loop_thread = threading.get_ident()
+            result = await agent.aresearch_xrechnung_topic("XRechnung Pflicht")
+            return loop_thread, result
+        finally:
+            await close_async_session()
+
+    try:
+        loop_thread, result = asyncio.run(research())
+    finally:
+        research_agent.research_cache, research_agent.source_fingerprints = originals
+
+    assert result["topic"] == "XRechnung Pflicht"
+    assert set(threads) == {"_research_cache_key", "_cached_research", "_research_and_cache", "research_xrechnung_news"}
+    assert all(loop_thread not in idents for idents in threads.values())
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte Research-Agent-Tests\n")
+    test_slow_source_gets_fallback_within_budget()
+    test_async_research_keeps_file_io_off_the_event_loop()
+    print("✅ Alle Research-Agent-Tests bestanden!")
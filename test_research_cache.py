@@ -0,0 +1,103 @@
+"""
+Tests für den Recherche-Cache (TTL, stale-while-revalidate, Persistenz über Neustarts)
+"""
+import os
+import tempfile
+import time
+
+from agents import research_agent
+from agents.research_agent import ResearchAgent
+from research_cache import ResearchCache
+from services import site_scraper
+from services.http_cache import PageCache
+from source_fingerprints import SourceFingerprintStore
+from test_source_fingerprints import make_sources
+
+
+def test_cached_research_is_served_and_refreshed_in_background():
+    """Treffer ohne Scraping, abgelaufene Einträge sofort plus Hintergrund-Aktualisierung, keine Fallback-Daten im Cache"""
+    workdir = tempfile.mkdtemp()
+    cache = ResearchCache(os.path.join(workdir, "research_cache.json"), ttl_minutes=60)
+    originals = research_agent.research_cache, research_agent.source_fingerprints
+    research_agent.research_cache = cache
+    research_agent.source_fingerprints = SourceFingerprintStore(os.path.join(workdir, "fingerprints.json"))
+
+    agent = ResearchAgent()
+    gathered = []
+
+    def gather_sources(time_budget=None):
+        gathered.append(time.time())
+        sources = make_sources("2025-01-01T08:00:00", [f"Feature {len(gathered)}"])
+        sources["einvoicehub_data"].pop("fallback")
+        return sources
+
+    agent.gather_sources = gather_sources
+    try:
+        first = agent.research_xrechnung_topic("XRechnung Pflicht")
+        second = agent.research_xrechnung_topic("XRechnung Pflicht")
+        assert len(gathered) == 1 and second == first
+
+        # TTL abgelaufen: Eintrag kommt sofort, Scraping läuft im Hintergrund
+        cache.ttl_seconds = 0
+        stale = agent.research_xrechnung_topic("XRechnung Pflicht")
+        assert stale["source_features"] == ["Feature 1", "Validierung"]
+        deadline = time.time() + 5
+        while cache._refreshing and time.time() < deadline:
+            time.sleep(0.01)
+        assert len(gathered) == 2
+
+        # Neustart: neuer Prozess liest das aktualisierte Ergebnis von der Platte
+        cache.ttl_seconds = 3600
+        research_agent.research_cache = ResearchCache(cache.cache_file, ttl_minutes=60)
+        restarted = agent.research_xrechnung_topic("XRechnung Pflicht")
+        assert restarted["source_features"] == ["Feature 2", "Validierung"] and len(gathered) == 2
+
+        # Quellen mit Fallback-Daten werden nicht gecacht
+        agent.gather_sources = lambda time_budget=None: make_sources("2025-01-01T08:00:00", ["Mock"])
+        agent.research_xrechnung_topic("Anderes Thema")
+        assert [entry["topic"] for entry in research_agent.research_cache.entries.values()] == ["XRechnung Pflicht"]
+    finally:
+        research_agent.research_cache, research_agent.source_fingerprints = originals
+
+
+def test_changed_page_version_misses_cache():
+    """Neue Seiten-Version im Seiten-Cache (anderer content_hash) → neuer Schlüssel, Recherche läuft neu"""
+    workdir = tempfile.mkdtemp()
+    pages = PageCache(os.path.join(workdir, "pages"), max_age=3600)
+    originals = research_agent.research_cache, research_agent.source_fingerprints, site_scraper.page_cache
+    research_agent.research_cache = ResearchCache(os.path.join(workdir, "research_cache.json"), ttl_minutes=60)
+    research_agent.source_fingerprints = SourceFingerprintStore(os.path.join(workdir, "fingerprints.json"))
+    site_scraper.page_cache = pages
+
+    agent = ResearchAgent()
+    for scraper in agent.scrapers.values():
+        scraper.crawl = False
+    url = agent.scrapers["invory"].urls[0]
+    gathered = []
+
+    def gather_sources(time_budget=None):
+        gathered.append(1)
+        sources = make_sources("2025-01-01T08:00:00", ["Versand"])
+        sources["einvoicehub_data"].pop("fallback")
+        return sources
+
+    agent.gather_sources = gather_sources
+    try:
+        pages._store(url, {}, b"<html>alt</html>", {"title": "Invory", "content_hash": "alt"})
+        agent.research_xrechnung_topic("XRechnung Pflicht")
+        agent.research_xrechnung_topic("XRechnung Pflicht")
+        assert len(gathered) == 1
+
+        pages._store(url, {}, b"<html>neu</html>", {"title": "Invory", "content_hash": "neu"})
+        assert pages.version(url) == "neu"
+        agent.research_xrechnung_topic("XRechnung Pflicht")
+        assert len(gathered) == 2, "Geänderte Seite darf keinen Cache-Treffer liefern"
+    finally:
+        research_agent.research_cache, research_agent.source_fingerprints, site_scraper.page_cache = originals
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte Recherche-Cache-Tests\n")
+    test_cached_research_is_served_and_refreshed_in_background()
+    test_changed_page_version_misses_cache()
+    print("✅ Alle Recherche-Cache-Tests bestanden!")
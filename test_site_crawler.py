@@ -0,0 +1,94 @@
+"""
+Tests für den Multi-Page-Crawler (offline, lokaler aiohttp-Server)
+"""
+import asyncio
+import json
+import os
+import tempfile
+
+from aiohttp import web
+
+from services.http_cache import PageCache
+from services.http_session import close_async_session, get_async_session
+from services.site_crawler import SiteCrawler
+from services.site_scraper import SiteScraper
+
+SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>{base}/site/produkte</loc><lastmod>2025-01-01</lastmod></url>
+  <url><loc>{base}/site/blog/xrechnung-pflicht</loc><lastmod>2025-06-01</lastmod></url>
+  <url><loc>https://extern.example/seite</loc></url>
+</urlset>"""
+
+PAGES = {
+    "/site/": '<title>Start</title><a href="kontakt#form">Kontakt</a> <a href="/site/intern/preise">Intern</a>'
+              ' <a href="/anderer-bereich">Andere</a> <a href="/site/broschuere.pdf">PDF</a>',
+    "/site/produkte": "<li>Service: Validierung</li>",
+    "/site/blog/xrechnung-pflicht": "<li>Feature: XRechnung-Versand</li>",
+    "/site/kontakt": "<p>Kontakt</p>",
+    "/site/intern/preise": "<p>Intern</p>",
+}
+
+
+def test_crawler_discovers_pages_and_reuses_index():
+    """Sitemap + Links, robots.txt und Politeness; zweiter Lauf kommt ohne Requests aus dem Crawl-Index"""
+    requests = []
+
+    async def handler(request):
+        requests.append((request.path, asyncio.get_running_loop().time()))
+        base = f"http://{request.host}"
+        if request.path == "/robots.txt":
+            return web.Response(text="User-agent: *\nDisallow: /site/intern/\n")
+        if request.path == "/site/sitemap.xml":
+            return web.Response(text=SITEMAP.format(base=base), content_type="application/xml")
+        if request.path in PAGES:
+            return web.Response(text=PAGES[request.path], content_type="text/html")
+        return web.Response(status=404)
+
+    async def run(workdir):
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        scraper = SiteScraper({"name": "beispiel", "urls": [f"http://127.0.0.1:{runner.addresses[0][1]}/site/"]})
+        crawler = SiteCrawler(index_file=os.path.join(workdir, "crawl_index.json"), max_pages=10, max_depth=2,
+                              concurrency_per_host=2, delay=0.05, refresh_hours=1,
+                              cache=PageCache(workdir, enabled=False))
+        try:
+            first = await crawler.acrawl(get_async_session(), scraper)
+            page_requests = len(requests)
+            second = await crawler.acrawl(get_async_session(), scraper)
+            return first, second, page_requests, scraper
+        finally:
+            await close_async_session()
+            await runner.cleanup()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        first, second, first_requests, scraper = asyncio.run(run(workdir))
+        with open(os.path.join(workdir, "crawl_index.json"), encoding="utf-8") as f:
+            index = json.load(f)
+
+    paths = [path for path, _ in requests[:first_requests]]
+    # Startseite, Sitemap-Seiten (neueste zuerst), dann Links; robots.txt-Verbot und fremde Bereiche ausgelassen
+    assert [page["title"] for page in first][0] == "Start"
+    assert len(first) == 4
+    assert "/site/intern/preise" not in paths and "/anderer-bereich" not in paths and "/site/broschuere.pdf" not in paths
+    assert paths.index("/site/blog/xrechnung-pflicht") < paths.index("/site/produkte")
+    assert scraper._build_info(first)["features"] == ["Feature: XRechnung-Versand", "Service: Validierung"]
+
+    # Politeness: Mindestabstand zwischen den Requests an den Host
+    times = sorted(t for _, t in requests[:first_requests])
+    assert all(b - a >= 0.04 for a, b in zip(times, times[1:]))
+
+    # Zweiter Lauf: Seiten, robots.txt und Sitemap aus dem Index
+    assert len(requests) == first_requests
+    assert second == first
+    assert len(index["pages"]) == 4 and all(entry["content_hash"] for entry in index["pages"].values())
+    assert len(index["resources"]) == 2
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte Crawler-Tests\n")
+    test_crawler_discovers_pages_and_reuses_index()
+    print("✅ Alle Crawler-Tests bestanden!")
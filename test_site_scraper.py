@@ -0,0 +1,133 @@
+"""
+Tests für die profilgesteuerte Scraper Engine (offline, lokaler aiohttp-Server)
+"""
+import asyncio
+import os
+import tempfile
+
+from aiohttp import web
+
+from benchmarks.extraction_benchmark import FIXTURES_DIR, scale_body
+from services.http_cache import PageCache
+from services.http_session import close_async_session, get_async_session
+from services import site_scraper
+from services.site_scraper import SiteScraper, create_scrapers
+
+PAGES = {
+    "/": "<html><head><title>Beispiel</title></head><body><li>Service: Validierung</li>"
+         "<p>XRechnung und PEPPOL</p></body></html>",
+    "/produkte": "<html><body><li>Feature: Versand</li><li>Service: Validierung</li><p>ZUGFeRD</p></body></html>",
+}
+
+
+def test_profile_crawls_all_urls_and_merges():
+    """Alle URLs eines Profils werden parallel abgerufen und zu Insights mit Profil-Präfix zusammengeführt"""
+    async def handler(request):
+        await asyncio.sleep(0.2)
+        return web.Response(text=PAGES[request.path], content_type="text/html")
+
+    async def run():
+        app = web.Application()
+        for path in PAGES:
+            app.router.add_get(path, handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        scraper = SiteScraper({
+            "name": "beispiel",
+            "urls": [f"{base}/", f"{base}/produkte"],
+            "keywords": ["XRechnung", "PEPPOL", "ZUGFeRD"]
+        })
+        try:
+            start = asyncio.get_running_loop().time()
+            insights = await scraper.aget_xrechnung_insights(get_async_session())
+            return insights, asyncio.get_running_loop().time() - start, base
+        finally:
+            await close_async_session()
+            await runner.cleanup()
+
+    original_cache = site_scraper.page_cache
+    site_scraper.page_cache = PageCache(tempfile.mkdtemp(), enabled=False)
+    try:
+        insights, elapsed, base = asyncio.run(run())
+    finally:
+        site_scraper.page_cache = original_cache
+
+    assert insights["beispiel_title"] == "Beispiel"
+    assert insights["beispiel_url"] == f"{base}/"
+    assert insights["beispiel_features"] == ["Service: Validierung", "Feature: Versand"]
+    assert insights["beispiel_keywords"] == ["XRechnung", "PEPPOL", "ZUGFeRD"]
+    assert elapsed < 0.4  # parallel statt 2 x 0.2s
+
+
+def test_streamed_pages_stop_early_and_respect_byte_limit():
+    """Große Seiten enden nach den Extraktionszielen, endlose Seiten am Byte-Limit"""
+    with open(os.path.join(FIXTURES_DIR, "invory.html"), "rb") as f:
+        large = scale_body(f.read(), 200)
+    endless = b"<html><head><title>Endlos</title></head><body>" + b"<p>Service: XRechnung</p>" * 200000
+
+    async def handler(request):
+        body = large if request.path == "/gross" else endless
+        response = web.StreamResponse(headers={"Content-Type": "text/html", "ETag": '"v1"'})
+        await response.prepare(request)
+        try:
+            for start in range(0, len(body), 8192):
+                await response.write(body[start:start + 8192])
+        except (ConnectionResetError, RuntimeError):
+            pass  # Client hat den Download beendet
+        return response
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        scraper = SiteScraper({"name": "gross", "urls": [f"{base}/gross", f"{base}/endlos"], "max_bytes": 100000})
+        try:
+            return scraper, await scraper.aget_xrechnung_info(get_async_session()), base
+        finally:
+            await close_async_session()
+            await runner.cleanup()
+
+    original_cache = site_scraper.page_cache
+    cache = site_scraper.page_cache = PageCache(tempfile.mkdtemp())
+    try:
+        scraper, info, base = asyncio.run(run())
+    finally:
+        site_scraper.page_cache = original_cache
+
+    # Bis zum Abbruch gelesene Bytes (der Seiten-Cache speichert den gelesenen Body)
+    read = {path: os.path.getsize(cache._path(f"{base}{path}", "body")) for path in ("/gross", "/endlos")}
+    assert read["/gross"] < 64 * 1024 < len(large)
+    assert read["/endlos"] == 100000
+
+    full = scraper._parse_page(large)
+    assert info["title"] == full["title"] and info["content_preview"] == full["content_preview"]
+    assert info["features"] == full["features"][:5]
+    assert info["relevant_sections"] == full["relevant_sections"][:3]
+
+
+def test_minimal_profile_defaults_and_registry():
+    """Profile ohne optionale Angaben liefern leere Mock-Daten; Standard-Profile enthalten invory/einvoicehub"""
+    mock = SiteScraper({"name": "xrechnung", "label": "xrechnung.org", "urls": ["https://www.xrechnung.org"]}).get_mock_data()
+    assert mock == {
+        "xrechnung_features": [],
+        "xrechnung_url": "https://www.xrechnung.org",
+        "xrechnung_title": "xrechnung.org",
+        "xrechnung_keywords": [],
+        "xrechnung_content": ""
+    }
+    scrapers = create_scrapers()
+    assert list(scrapers)[:2] == ["invory", "einvoicehub"]
+    assert scrapers["invory"].get_mock_data()["invory_features"][0] == "Automatische XRechnung-Erstellung"
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte Scraper-Engine-Tests\n")
+    test_profile_crawls_all_urls_and_merges()
+    test_streamed_pages_stop_early_and_respect_byte_limit()
+    test_minimal_profile_defaults_and_registry()
+    print("✅ Alle Scraper-Engine-Tests bestanden!")
@@ -0,0 +1,94 @@
+"""
+Tests für Quellen-Fingerprints (unveränderte Quellen → Material wiederverwenden, Abwechslung bevorzugen)
+"""
+import os
+import tempfile
+
+from agents import research_agent
+from agents.content_agent import ContentAgent
+from agents.research_agent import ResearchAgent
+from source_fingerprints import SourceFingerprintStore, fingerprint_sources
+
+
+def make_sources(timestamp: str, features: list) -> dict:
+    """Minimales Quellen-Bündel im Format von ResearchAgent.gather_sources"""
+    return {
+        "news_data": {"news": [{"title": "XRechnung Pflicht", "relevance": "high"}], "trends": [],
+                      "timestamp": timestamp},
+        "countdown_data": {"next_milestone": None, "upcoming_milestones": [], "current_date": timestamp[:10]},
+        "invory_data": {"invory_features": features, "invory_keywords": ["XRechnung"], "invory_content": "Text"},
+        "einvoicehub_data": {"einvoicehub_features": ["Validierung"], "einvoicehub_keywords": ["PEPPOL"],
+                             "fallback": True},
+    }
+
+
+def test_fingerprint_ignores_volatile_fields():
+    """Abrufzeit, Countdown und Whitespace ändern den Fingerprint nicht, geänderter Inhalt schon"""
+    first = make_sources("2025-01-01T08:00:00", ["Versand", "Archiv"])
+    later = make_sources("2025-01-02T08:00:00", ["Versand ", "Archiv"])
+    later["countdown_data"]["next_milestone"] = {"days_until": 3}
+    changed = make_sources("2025-01-02T08:00:00", ["Versand", "Empfang"])
+
+    assert fingerprint_sources(first) == fingerprint_sources(later)
+    assert fingerprint_sources(first) != fingerprint_sources(changed)
+
+    store = SourceFingerprintStore(os.path.join(tempfile.mkdtemp(), "fingerprints.json"), max_entries=2)
+    for fingerprint in ("a", "b", "a", "c"):
+        store.record(fingerprint, {"features": [fingerprint]})
+    assert list(store.entries) == ["a", "c"]
+    assert store.entries["a"]["runs"] == 2
+    assert SourceFingerprintStore(store.store_file).lookup("c") == {"features": ["c"]}
+    assert store.lookup("b") is None
+
+
+def test_unchanged_sources_reuse_material_and_prefer_variety():
+    """Zweite Recherche mit gleichen Quellen nutzt das gespeicherte Material und wählt eine ungenutzte Struktur"""
+    store = SourceFingerprintStore(os.path.join(tempfile.mkdtemp(), "fingerprints.json"))
+    original_store, research_agent.source_fingerprints = research_agent.source_fingerprints, store
+    agent = ResearchAgent()
+    try:
+        first = agent.research_xrechnung_topic("XRechnung Pflicht", make_sources("2025-01-01T08:00:00", ["Versand"]))
+        second = agent.research_xrechnung_topic("XRechnung Pflicht", make_sources("2025-01-02T08:00:00", ["Versand"]))
+    finally:
+        research_agent.source_fingerprints = original_store
+
+    assert first["no_new_source_material"] is False
+    assert second["no_new_source_material"] is True
+    assert second["source_fingerprint"] == first["source_fingerprint"]
+    assert second["source_features"] == ["Versand", "Validierung"]
+    assert second["source_keywords"] == ["XRechnung", "PEPPOL"]
+    assert "📰 Aktuell: XRechnung Pflicht" in second["key_points"]
+
+    content_agent = ContentAgent()
+    default = content_agent.select_candidate_structures(second, 1)[0]["name"]
+    # Die automatisch gewählte Struktur wurde zuletzt genutzt - ohne neue Quellen kommt eine andere zum Zug
+    varied = content_agent.select_candidate_structures(second, 3, recent_structures=[default])
+    assert default not in [structure["name"] for structure in varied]
+    assert content_agent.select_candidate_structures(first, 1, recent_structures=[default])[0]["name"] == default
+
+
+def test_batch_topics_sharing_sources_keep_their_material():
+    """Ein Quellen-Bündel für mehrere Themen (Batch): nur die Wiederholung eines Themas gilt als unverändert"""
+    store = SourceFingerprintStore(os.path.join(tempfile.mkdtemp(), "fingerprints.json"))
+    original_store, research_agent.source_fingerprints = research_agent.source_fingerprints, store
+    agent = ResearchAgent()
+    shared = make_sources("2025-01-01T08:00:00", ["Versand"])
+    try:
+        batch = [agent.research_xrechnung_topic(topic, shared) for topic in ("XRechnung Pflicht", "PEPPOL", "API")]
+        repeated = agent.research_xrechnung_topic("PEPPOL", make_sources("2025-01-02T08:00:00", ["Versand"]))
+    finally:
+        research_agent.source_fingerprints = original_store
+
+    assert [research["no_new_source_material"] for research in batch] == [False, False, False]
+    assert all(research["source_features"] == ["Versand", "Validierung"] for research in batch)
+    assert repeated["no_new_source_material"] is True
+    entry = SourceFingerprintStore(store.store_file).entries[batch[0]["source_fingerprint"]]
+    assert entry["runs"] == 4 and entry["topics"] == ["XRechnung Pflicht", "PEPPOL", "API"]
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte Fingerprint-Tests\n")
+    test_fingerprint_ignores_volatile_fields()
+    test_unchanged_sources_reuse_material_and_prefer_variety()
+    test_batch_topics_sharing_sources_keep_their_material()
+    print("✅ Alle Fingerprint-Tests bestanden!")
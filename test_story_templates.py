@@ -0,0 +1,51 @@
+"""
+Tests für die Story-Vorlagen des Content Agents (Registry, längenbewusste Zusammenstellung)
+"""
+from agents.content_agent import ContentAgent
+from agents.story_templates import Segment, StoryTemplateRegistry, story_templates
+from config import MAX_POST_LENGTH, STORYTELLING_STRUCTURES
+
+
+def test_optional_segments_are_dropped_to_fit_budget():
+    """Listen verlieren zuerst Einträge, dann fallen Segmente nach drop_order weg - Pflichtsegmente bleiben vollständig"""
+    registry = StoryTemplateRegistry({"Test": [
+        Segment("intro", "Hallo {topic}"),
+        Segment("countdown", "Noch {countdown}", drop_order=2),
+        Segment("highlights", "Features:", drop_order=1, items="highlights", max_items=3),
+    ]}, footer=[Segment("hashtags", "#XRechnung")], default="Test")
+    values = {"topic": "Welt", "countdown": "3 Tage", "highlights": ["Versand", "Archiv", "Validierung"]}
+
+    full = registry.render("Test", values)
+    assert full == ("Hallo Welt\n\nNoch 3 Tage\n\nFeatures:\n• Versand\n• Archiv\n• Validierung\n\n#XRechnung", [])
+
+    assert registry.render("Test", values, budget=len(full.text) - 1).text == (
+        "Hallo Welt\n\nNoch 3 Tage\n\nFeatures:\n• Versand\n• Archiv\n\n#XRechnung")
+    assert registry.render("Test", values, budget=40).text == "Hallo Welt\n\nNoch 3 Tage\n\n#XRechnung"
+    assert registry.render("Test", values, budget=10) == ("Hallo Welt\n\n#XRechnung", ["highlights", "countdown"])
+
+    # Leere Felder lassen optionale Segmente entfallen; Vorlagen werden einmal kompiliert, Unbekanntes nutzt den Default
+    assert registry.render("Unbekannt", {"topic": "Welt"}).text == "Hallo Welt\n\n#XRechnung"
+    assert registry.get("Test") is registry.get("Unbekannt")
+
+
+def test_content_agent_posts_fit_max_length():
+    """Überlange Highlights werden weggelassen statt abgeschnitten, Links und Hashtags bleiben erhalten"""
+    agent = ContentAgent()
+    research = {"topic": "XRechnung Pflicht", "einvoicehub_highlights": ["🚀 " + "Sehr langes Feature " * 200] * 2,
+                "countdown_data": {"next_milestone": {"countdown_text": "Noch 42 Tage", "description": "E-Rechnungspflicht"}}}
+
+    for structure in STORYTELLING_STRUCTURES:
+        post = agent.create_storytelling_post(research, structure=structure)["post_content"]
+        assert len(post) <= MAX_POST_LENGTH
+        assert "Sehr langes Feature" not in post
+        assert "Noch 42 Tage" in post or structure["name"] == "Behind the Scenes", "Countdown fällt erst nach den Highlights weg"
+        assert post.endswith("#XRechnung #Storytelling #DigitaleTransformation #EInvoicing #ZukunftGestalten")
+        assert "• https://invory.de - Deine XRechnung-Lösung" in post
+    assert set(story_templates._compiled) >= {s["name"] for s in STORYTELLING_STRUCTURES}
+
+
+if __name__ == "__main__":
+    print("\n🧪 Starte Story-Vorlagen-Tests\n")
+    test_optional_segments_are_dropped_to_fit_budget()
+    test_content_agent_posts_fit_max_length()
+    print("✅ Alle Story-Vorlagen-Tests bestanden!")